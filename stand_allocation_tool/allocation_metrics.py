@@ -0,0 +1,196 @@
+"""
+Metrics for Stand Allocation Runs
+Counters, gauges and distributions recorded by the allocation engine and the CP solver during
+a run, exported as a dict or in the OpenMetrics text format for monitoring systems
+"""
+
+from array import array
+import math
+import re
+
+# Quantiles exported for each distribution
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Descriptions of the metrics recorded by the engine and the CP solver (OpenMetrics HELP lines)
+METRIC_DESCRIPTIONS = {
+    "units_processed": "Flight units decided by the greedy algorithm",
+    "units_allocated": "Flight units the greedy algorithm allocated a stand to",
+    "units_unallocated": "Flight units the greedy algorithm could not allocate",
+    "units_partitioned": "Flight units decided by interval partitioning",
+    "units_placed_by_local_search": "Unallocated flight units placed by local search",
+    "availability_queries": "Stand availability queries on the interval trees",
+    "candidates_per_unit": "Candidate stands examined per flight unit",
+    "unit_decision_seconds": "Time to choose a stand for a flight unit",
+    "cp_solves": "CP-SAT solves",
+    "cp_solve_seconds": "Time spent in CP-SAT solves",
+    "cp_conflicts": "Conflicts of the CP-SAT solves",
+    "cp_branches": "Branches of the CP-SAT solves",
+    "cp_solutions": "Improving solutions found by the CP-SAT solves",
+    "cp_model_flights": "Flights in the last CP model",
+    "cp_model_variables": "Variables of the last CP model",
+    "cp_model_constraints": "Constraints of the last CP model, intervals included",
+    "cp_model_intervals": "Interval constraints of the last CP model",
+    "cp_objective": "Objective of the last CP solve",
+    "cp_best_bound": "Objective bound of the last CP solve",
+    "cp_status": "Status of the last CP solve",
+    "allocated_flights": "Flights allocated a stand",
+    "unallocated_flights": "Flights left without a stand",
+    "engine": "Allocation engine of the run",
+}
+
+
+class AllocationMetrics:
+    """
+    Metrics of an allocation run
+    
+    - Counters only increase (e.g. availability queries)
+    - Gauges hold the last value set (e.g. the size of the last CP model)
+    - Distributions keep every observation (e.g. the decision time per flight unit) and are
+      reported by quantiles; observations are stored in a compact array of doubles
+    - Info metrics hold a string value (e.g. the CP solver status)
+    
+    Recording a value is a dict update, so the engine records into it unconditionally.
+    """
+    
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self.distributions = {}
+        self.info = {}
+    
+    def increment(self, name, value=1):
+        """Add to a counter"""
+        self.counters[name] = self.counters.get(name, 0) + value
+    
+    def set(self, name, value):
+        """Set a gauge"""
+        self.gauges[name] = value
+    
+    def observe(self, name, value):
+        """Add an observation to a distribution"""
+        distribution = self.distributions.get(name)
+        if distribution is None:
+            distribution = self.distributions[name] = array('d')
+        distribution.append(value)
+    
+    def set_info(self, name, value):
+        """Set an info metric to a string value"""
+        self.info[name] = str(value)
+    
+    def merge(self, other):
+        """
+        Add the metrics of another run (e.g. recorded in a worker process) to these
+        
+        Counters are added up and observations combined; the other run's gauges and info
+        metrics replace these.
+        
+        Parameters:
+        - other: AllocationMetrics object
+        """
+        for name, value in other.counters.items():
+            self.increment(name, value)
+        for name, values in other.distributions.items():
+            self.distributions.setdefault(name, array('d')).extend(values)
+        self.gauges.update(other.gauges)
+        self.info.update(other.info)
+    
+    def summary(self, name):
+        """
+        Summarize a distribution
+        
+        Parameters:
+        - name: Name of the distribution
+        
+        Returns:
+        - Dict with "count", "sum", "max" and "p50", "p95", "p99" (nearest rank),
+          or None if nothing was observed
+        """
+        values = self.distributions.get(name)
+        if not values:
+            return None
+        ordered = sorted(values)
+        summary = {"count": len(ordered), "sum": math.fsum(ordered), "max": ordered[-1]}
+        for quantile in QUANTILES:
+            rank = max(1, math.ceil(quantile * len(ordered)))
+            summary[f"p{round(quantile * 100)}"] = ordered[rank - 1]
+        return summary
+    
+    def as_dict(self):
+        """
+        Get all metrics as a JSON-serializable dict
+        
+        Returns:
+        - Dict with "counters", "gauges", "distributions" (summaries) and "info"
+        """
+        return {
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "distributions": {name: self.summary(name) for name in self.distributions},
+            "info": dict(self.info)
+        }
+    
+    def to_openmetrics(self, prefix="stand_allocation", labels=None):
+        """
+        Format the metrics in the OpenMetrics text format
+        
+        Counters get the "_total" suffix, distributions are exported as summaries with
+        quantile labels, and info metrics as "_info" samples with the value as a label.
+        
+        Parameters:
+        - prefix: Prefix of the metric names
+        - labels: Optional dict of labels added to every sample (e.g. {"scenario": "large_test_5k"})
+        
+        Returns:
+        - String ending with "# EOF"
+        """
+        def metric_name(name):
+            return re.sub(r"[^a-zA-Z0-9_]", "_", f"{prefix}_{name}" if prefix else name)
+        
+        def label_set(extra=None):
+            pairs = dict(labels or {}, **(extra or {}))
+            if not pairs:
+                return ""
+            escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+                       for value in pairs.values())
+            return "{" + ",".join(f'{key}="{value}"' for key, value in zip(pairs, escaped)) + "}"
+        
+        def header(name, metric_type):
+            lines = [f"# TYPE {metric_name(name)} {metric_type}"]
+            if name in METRIC_DESCRIPTIONS:
+                lines.append(f"# HELP {metric_name(name)} {METRIC_DESCRIPTIONS[name]}")
+            return lines
+        
+        lines = []
+        for name, value in sorted(self.counters.items()):
+            lines += header(name, "counter")
+            lines.append(f"{metric_name(name)}_total{label_set()} {value}")
+        for name, value in sorted(self.gauges.items()):
+            if value is None:
+                continue
+            lines += header(name, "gauge")
+            lines.append(f"{metric_name(name)}{label_set()} {value}")
+        for name in sorted(self.distributions):
+            summary = self.summary(name)
+            lines += header(name, "summary")
+            for quantile in QUANTILES:
+                lines.append(f"{metric_name(name)}{label_set({'quantile': quantile})} "
+                             f"{summary[f'p{round(quantile * 100)}']}")
+            lines.append(f"{metric_name(name)}_count{label_set()} {summary['count']}")
+            lines.append(f"{metric_name(name)}_sum{label_set()} {summary['sum']}")
+        for name, value in sorted(self.info.items()):
+            lines += header(name, "info")
+            lines.append(f"{metric_name(name)}_info{label_set({name: value})} 1")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+    
+    def write_openmetrics(self, file_path, prefix="stand_allocation", labels=None):
+        """
+        Write the metrics to a file in the OpenMetrics text format (see to_openmetrics)
+        
+        Parameters:
+        - file_path: Output file, e.g. for the textfile collector of the Prometheus node exporter
+        - prefix: Prefix of the metric names
+        - labels: Optional dict of labels added to every sample
+        """
+        with open(file_path, "w") as f:
+            f.write(self.to_openmetrics(prefix, labels))
@@ -1,163 +1,824 @@
 #!/usr/bin/env python3
 """
 Benchmark script for the stand allocation algorithm.
-Tests the algorithm with different dataset sizes and reports performance metrics.
+Runs scenarios through run_scenario and reports wall-clock and CPU time per phase,
+peak memory and allocation results.
 """
 
 import os
+import sys
 import time
 import json
 import argparse
+import functools
 import subprocess
-import psutil
-from datetime import datetime
+import tracemalloc
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
 
-from data_loader import DataLoader
-from stand_allocation_engine import StandAllocationEngine
-from ai_support import MockAISupport
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak RSS is then not recorded
+    resource = None
+
+from main import run_scenario
+from data_loader import load_airlines, load_settings
+from data_structures import FlightOperationUnit
 from maintenance_tracker import MockMaintenanceTracker
+from ai_support import MockAISupport
+from stand_allocation_engine import StandAllocationEngine
+from phase_timer import PhaseTimer
+from profiler import profile_call, PROFILE_MODES
+from allocation_metrics import AllocationMetrics
+from allocation_bounds import allocation_weight
+from micro_benchmark import fit_exponent
+from generate_large_flight_data import DEFAULT_SEED
 
-def run_benchmark(scenario_dir, use_solver=True):
+# Flight counts of the scaling benchmark
+SCALING_FLIGHT_COUNTS = [1000, 2000, 5000, 10000, 20000, 50000, 100000, 200000, 500000]
+# Flights per day of the generated scaling schedules (about large_test_5k's 5,000 flights a year on
+# 100 stands), so that a larger schedule covers more days instead of being more congested
+SCALING_FLIGHTS_PER_DAY = 14
+# A phase whose time grows faster than flights^SUPERLINEAR_EXPONENT is flagged as a hot spot
+SUPERLINEAR_EXPONENT = 1.15
+# ... if it takes at least this share of the run time of the largest schedule
+HOT_SPOT_MIN_SHARE = 0.05
+
+# Engine configurations of the Pareto benchmark, as name -> (solver parameters, other settings)
+PARETO_CONFIGURATIONS = {
+    "greedy": ({"engine": "greedy"}, {}),
+    "greedy_best_fit": ({"engine": "greedy"}, {"stand_selection_policy": "best_fit"}),
+    "greedy_contact_first": ({"engine": "greedy"}, {"stand_selection_policy": "contact_first"}),
+    "greedy_local_search": ({"engine": "greedy", "local_search": True}, {}),
+    "flow": ({"engine": "flow"}, {}),
+    "adaptive": ({"engine": "adaptive"}, {}),
+    "rolling_horizon": ({"engine": "rolling_horizon"}, {}),
+    "hybrid": ({"engine": "hybrid"}, {}),
+    "cp_fast": ({"engine": "cp", "solver_profile": "fast"}, {}),
+    "cp": ({"engine": "cp"}, {}),
+}
+# Default CP time limit of the Pareto benchmark in seconds
+PARETO_TIME_LIMIT = 30
+
+# Regression tolerances of the compare mode, as metric -> (tolerance, kind, better):
+# "relative" tolerances are a fraction of the baseline value, "absolute" ones are in the metric's unit
+DEFAULT_TOLERANCES = {
+    "wall_time": (0.25, "relative", "lower"),
+    "peak_rss_mb": (0.15, "relative", "lower"),
+    "allocation_rate": (0.5, "absolute", "higher"),  # percentage points
+    "objective": (0.01, "relative", "higher"),
+}
+# Time differences below this many seconds are noise and never count as a regression
+MIN_TIME_DIFFERENCE = 0.05
+
+def _peak_rss_mb():
     """
-    Run the stand allocation algorithm on a scenario and measure performance metrics.
+    Peak resident set size of this process in MB (None if unknown)
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+def allocation_quality(scenario_dir, allocated):
+    """
+    Quality measures of an allocation besides the number of allocated flights
     
     Parameters:
-    - scenario_dir: Path to the scenario directory
-    - use_solver: Whether to use the CP solver or greedy algorithm
+    - scenario_dir: Path to the scenario directory (for its connections.json)
+    - allocated: List of allocated flight reports
     
     Returns:
-    - Dict containing performance metrics
+    - Dict with "objective" (criticality weight of the allocated flights),
+      "contact_stand_share" (share of allocated flights on contact stands),
+      "connections" (connections with both flights allocated) and "connection_terminal_matches"
+      (of those, connections whose flights are allocated to the same terminal)
     """
-    print(f"\n=== Benchmarking {scenario_dir} ===")
-    print(f"Using CP solver: {use_solver}")
+    # The CP engine does not score flights, so score them as the greedy algorithm does (the
+    # arrival of a linked pair carries the score) to make the objective comparable between engines
+    flights = [allocation['flight'] for allocation in allocated]
+    if not any(flight.criticality_score for flight in flights):
+        scorer = StandAllocationEngine(
+            [], [], load_airlines(os.path.join(scenario_dir, "airlines.json")),
+            load_settings(os.path.join(scenario_dir, "settings.json")),
+            MockMaintenanceTracker([]), MockAISupport(), verbose=False
+        )
+        linked_arrivals = {flight.LinkID for flight in flights if flight.LinkID and flight.IsArrival}
+        for flight in flights:
+            if flight.IsArrival or flight.LinkID not in linked_arrivals:
+                scorer._calculate_criticality_score(FlightOperationUnit(departure=flight))
     
-    # Load data
-    data_loader = DataLoader()
+    terminals = {allocation['flight'].FlightID: allocation['stand'].Terminal for allocation in allocated}
+    contact = sum(1 for allocation in allocated if allocation['stand'].IsContactStand)
     
-    print("Loading data...")
-    start_load = time.time()
-    flights = data_loader.load_flights(os.path.join(scenario_dir, "flights.json"))
-    stands = data_loader.load_stands(os.path.join(scenario_dir, "stands.json"))
-    airlines = data_loader.load_airlines(os.path.join(scenario_dir, "airlines.json"))
-    settings = data_loader.load_settings(os.path.join(scenario_dir, "settings.json"))
-    maintenance_schedules = data_loader.load_maintenance_schedules(os.path.join(scenario_dir, "maintenance_schedule.json"))
-    load_time = time.time() - start_load
+    connections = 0
+    matches = 0
+    connections_path = os.path.join(scenario_dir, "connections.json")
+    if os.path.exists(connections_path):
+        with open(connections_path, "r") as f:
+            for connection in json.load(f):
+                arrival_terminal = terminals.get(connection.get("arrival_flight_id"))
+                departure_terminal = terminals.get(connection.get("departure_flight_id"))
+                if arrival_terminal and departure_terminal:
+                    connections += 1
+                    matches += arrival_terminal == departure_terminal
     
-    # Update solver settings
-    settings.solver_parameters["use_solver"] = use_solver
+    return {
+        "objective": allocation_weight(allocated),
+        "contact_stand_share": contact / len(allocated) if allocated else 0.0,
+        "connections": connections,
+        "connection_terminal_matches": matches
+    }
+
+def run_benchmark(scenario_dir, engine="greedy", solver_parameters=None, trace_memory=False,
+                  settings_overrides=None, configuration=None, profile=None, profile_dir="profiles",
+                  cp_report_dir=None):
+    """
+    Run the stand allocation algorithm on a scenario and measure performance metrics.
     
-    # Create trackers
-    maintenance_tracker = MockMaintenanceTracker(maintenance_schedules)
-    ai_support = MockAISupport()
+    Phases are timed with PhaseTimer (see phase_timer.ALLOCATION_PHASES); the time not spent
+    in any phase is reported as "other". Peak RSS covers the whole process, so run each
+    benchmark in its own process (see run_isolated) to get the peak of a single run.
     
-    print(f"Loaded {len(flights)} flights, {len(stands)} stands, {len(airlines)} airlines")
+    Parameters:
+    - scenario_dir: Path to the scenario directory
+    - engine: Allocation engine ("engine" solver parameter)
+    - solver_parameters: Optional dict of further solver parameters to override
+    - trace_memory: Whether to also record the peak of Python allocations with tracemalloc
+      (slows Python code down about twofold, so the times are not comparable)
+    - settings_overrides: Optional dict of other Settings attributes to override
+    - configuration: Name of the engine configuration (defaults to the engine)
+    - profile: Optional profiler mode ("sampling" or "deterministic"); the collapsed stacks are
+      written to profile_dir and the hot-function summary added to the result (the
+      deterministic profiler slows Python code down, so the times are not comparable)
+    - profile_dir: Directory for the collapsed-stack files of profiled runs
+    - cp_report_dir: Optional directory for the reports of the CP solves (model, search log and
+      statistics, see cp_solve_report.py), in a subdirectory per scenario and configuration
     
-    # Record process memory before allocation
-    process = psutil.Process(os.getpid())
-    memory_before = process.memory_info().rss / (1024 * 1024)  # MB
+    Returns:
+    - Dict containing performance metrics
+    """
+    configuration = configuration or engine
+    print(f"\n=== Benchmarking {scenario_dir} ({configuration}) ===")
     
-    # Run allocation
-    print("Running allocation...")
-    start_allocation = time.time()
+    overrides = dict(solver_parameters or {}, engine=engine)
+    if cp_report_dir:
+        overrides["cp_report_dir"] = os.path.join(
+            cp_report_dir, f"{os.path.basename(os.path.normpath(scenario_dir))}_{configuration}"
+        )
+    timer = PhaseTimer()
+    metrics = AllocationMetrics()
     
-    engine = StandAllocationEngine(
-        flights, stands, airlines, settings, maintenance_tracker, ai_support
-    )
+    # Import the instrumented modules (including OR-Tools) before the clock starts
+    instrumentation = timer.instrument_allocation()
+    rss_before = _peak_rss_mb()
     
-    allocated, unallocated = engine.run_allocation()
+    if trace_memory:
+        tracemalloc.start()
     
-    allocation_time = time.time() - start_allocation
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    try:
+        with instrumentation:
+            if profile:
+                (allocated, unallocated), profile_report = profile_call(
+                    run_scenario, scenario_dir, verbose=False, solver_parameters=overrides, phase_timer=timer,
+                    settings_overrides=settings_overrides, metrics=metrics, mode=profile
+                )
+            else:
+                allocated, unallocated = run_scenario(
+                    scenario_dir, verbose=False, solver_parameters=overrides, phase_timer=timer,
+                    settings_overrides=settings_overrides, metrics=metrics
+                )
+        total_wall = time.perf_counter() - start_wall
+        total_cpu = time.process_time() - start_cpu
+        peak_traced_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024) if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
     
-    # Record process memory after allocation
-    memory_after = process.memory_info().rss / (1024 * 1024)  # MB
-    memory_used = memory_after - memory_before
+    phases = timer.as_dict()
+    phases["other"] = {
+        "wall_time": max(0.0, total_wall - sum(stats["wall_time"] for stats in phases.values())),
+        "cpu_time": max(0.0, total_cpu - sum(stats["cpu_time"] for stats in phases.values())),
+        "calls": 1
+    }
+    load_time = phases.get("load", {}).get("wall_time", 0.0)
     
     # Calculate statistics
-    total_flights = len(flights)
     allocated_count = len(allocated)
     unallocated_count = len(unallocated)
+    total_flights = allocated_count + unallocated_count
     allocation_rate = allocated_count / total_flights * 100 if total_flights > 0 else 0
+    peak_rss_mb = _peak_rss_mb()
     
     # Print results
-    print(f"\nResults for {scenario_dir}:")
     print(f"Total flights: {total_flights}")
     print(f"Allocated flights: {allocated_count} ({allocation_rate:.2f}%)")
-    print(f"Unallocated flights: {unallocated_count} ({100 - allocation_rate:.2f}%)")
     print(f"Load time: {load_time:.2f} seconds")
-    print(f"Allocation time: {allocation_time:.2f} seconds")
-    print(f"Memory used: {memory_used:.2f} MB")
+    print(f"Allocation time: {total_wall - load_time:.2f} seconds (CPU {total_cpu:.2f} seconds in total)")
+    for name, stats in sorted(phases.items(), key=lambda item: item[1]["wall_time"], reverse=True):
+        print(f"  {name:<22} {stats['wall_time']:8.3f} s wall {stats['cpu_time']:8.3f} s CPU {stats['calls']:>9} calls")
+    if peak_rss_mb is not None:
+        print(f"Peak RSS: {peak_rss_mb:.1f} MB")
+    if peak_traced_mb is not None:
+        print(f"Peak traced Python memory: {peak_traced_mb:.1f} MB")
+    
+    profile_summary = None
+    if profile:
+        os.makedirs(profile_dir, exist_ok=True)
+        profile_file = os.path.join(
+            profile_dir, f"{os.path.basename(os.path.normpath(scenario_dir))}_{configuration}.collapsed"
+        )
+        profile_report.write_collapsed(profile_file)
+        profile_report.print_summary(10)
+        print(f"Collapsed stacks written to {profile_file}")
+        profile_summary = dict(profile_report.as_dict(), collapsed_file=profile_file)
     
     # Return performance metrics
     return {
-        "scenario": os.path.basename(scenario_dir),
+        "scenario": os.path.basename(os.path.normpath(scenario_dir)),
+        "engine": engine,
+        "configuration": configuration,
+        "solver_parameters": overrides,
+        "settings_overrides": settings_overrides or {},
         "total_flights": total_flights,
         "allocated_flights": allocated_count,
         "unallocated_flights": unallocated_count,
         "allocation_rate": allocation_rate,
+        **allocation_quality(scenario_dir, allocated),
         "load_time": load_time,
-        "allocation_time": allocation_time,
-        "memory_used": memory_used,
+        "allocation_time": total_wall - load_time,
+        "wall_time": total_wall,
+        "cpu_time": total_cpu,
+        "phases": phases,
+        "peak_rss_mb": peak_rss_mb,
+        "baseline_rss_mb": rss_before,
+        "peak_traced_mb": peak_traced_mb,
+        # Peak memory attributable to the run, as plotted by visualize_benchmarks.py
+        "memory_used": peak_traced_mb if peak_traced_mb is not None else
+                       (peak_rss_mb - rss_before if peak_rss_mb is not None else None),
+        "metrics": metrics.as_dict(),
+        "profile": profile_summary,
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "using_solver": use_solver
+        "using_solver": engine not in ("greedy", "flow")
+    }
+
+def run_isolated(scenario_dir, engine="greedy", solver_parameters=None, trace_memory=False,
+                 settings_overrides=None, configuration=None, profile=None, profile_dir="profiles",
+                 cp_report_dir=None):
+    """
+    Run a benchmark in a fresh process, so that its peak memory is not affected by earlier runs
+    
+    Parameters are the same as for run_benchmark.
+    
+    Returns:
+    - Dict containing performance metrics
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(run_benchmark, scenario_dir, engine, solver_parameters, trace_memory,
+                               settings_overrides, configuration, profile, profile_dir, cp_report_dir).result()
+
+def failed_result(scenario_dir, engine, error, configuration=None):
+    """
+    Record a benchmark run that raised, so a comparison with a baseline reports it
+    
+    Parameters:
+    - scenario_dir: Path to the scenario directory
+    - engine: Allocation engine
+    - error: Exception raised by the run
+    - configuration: Name of the engine configuration (defaults to the engine)
+    
+    Returns:
+    - Dict with "scenario", "engine", "configuration" and "error", but no metrics
+    """
+    print(f"Error benchmarking {scenario_dir} ({configuration or engine}): {error}")
+    return {
+        "scenario": os.path.basename(os.path.normpath(scenario_dir)),
+        "engine": engine,
+        "configuration": configuration or engine,
+        "error": f"{type(error).__name__}: {error}",
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
 
-def generate_test_data(num_flights, output_dir):
-    """Generate test data using the generate_large_flight_data.py script"""
+def successful_results(results):
+    """Leave out the failed runs (see failed_result) of a list of results"""
+    return [result for result in results if "error" not in result]
+
+def generate_test_data(num_flights, output_dir, extra_args=(), seed=None, workers=None):
+    """Generate test data using the generate_large_flight_data.py script (seeded, so reproducible)"""
     print(f"Generating test data with {num_flights} flights...")
     cmd = [
-        "python", "generate_large_flight_data.py",
+        sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "generate_large_flight_data.py"),
         "--num-flights", str(num_flights),
-        "--output", output_dir
+        "--output", output_dir,
+        *extra_args
     ]
+    if seed is not None:
+        cmd += ["--seed", str(seed)]
+    if workers is not None:
+        cmd += ["--workers", str(workers)]
     subprocess.run(cmd, check=True)
 
+def generate_scaling_data(flight_counts, seed=None, workers=None):
+    """
+    Generate the schedules of the scaling benchmark (existing ones are reused)
+    
+    The number of days grows with the number of flights (SCALING_FLIGHTS_PER_DAY), so the
+    schedules differ in length but not in how congested the stands are. The seed is part of
+    the directory name, so a schedule is only reused for the seed that generated it.
+    
+    Parameters:
+    - flight_counts: List of numbers of flights
+    - seed: Optional random seed (defaults to the generator's)
+    - workers: Optional number of worker processes of the generator
+    
+    Returns:
+    - List of scenario directories, one per flight count
+    """
+    if seed is None:
+        seed = DEFAULT_SEED
+    scenarios = []
+    for count in flight_counts:
+        output_dir = f"test_scenarios/scaling_{count}_seed{seed}"
+        if not os.path.isfile(os.path.join(output_dir, "flights.json")):
+            days = max(2, count // SCALING_FLIGHTS_PER_DAY)
+            end_date = datetime(2023, 1, 1) + timedelta(days=days)
+            generate_test_data(count, output_dir, ["--start-date", "2023-01-01",
+                                                   "--end-date", end_date.strftime("%Y-%m-%d")],
+                               seed=seed, workers=workers)
+        scenarios.append(output_dir)
+    return scenarios
+
+def run_scaling_benchmark(scenarios, engines, run, solver_parameters=None, trace_memory=False, max_run_seconds=600):
+    """
+    Run each engine on schedules of increasing size
+    
+    An engine is not run on larger schedules once a run takes longer than max_run_seconds.
+    
+    Parameters:
+    - scenarios: List of scenario directories, from the smallest to the largest schedule
+    - engines: List of allocation engines
+    - run: Function running one benchmark (run_benchmark or run_isolated)
+    - solver_parameters: Optional dict of further solver parameters to override
+    - trace_memory: Whether to record the tracemalloc peak
+    - max_run_seconds: Longest run after which larger schedules are skipped
+    
+    Returns:
+    - List of result dicts, as run_benchmark (see failed_result for runs that raised)
+    """
+    results = []
+    for engine in engines:
+        for scenario in scenarios:
+            try:
+                result = run(scenario, engine, solver_parameters, trace_memory)
+            except Exception as e:
+                results.append(failed_result(scenario, engine, e))
+                break
+            results.append(result)
+            if result["wall_time"] > max_run_seconds:
+                print(f"{engine} took {result['wall_time']:.0f} seconds, skipping larger schedules")
+                break
+    return results
+
+def fit_scaling(results):
+    """
+    Fit the empirical complexity of each engine from results on schedules of different sizes
+    
+    Time and memory are fitted as c * flights^k by least squares on a log-log scale, for the
+    whole run and for each phase. A phase is flagged as a superlinear hot spot if its exponent
+    is above SUPERLINEAR_EXPONENT and it takes at least HOT_SPOT_MIN_SHARE of the run time
+    on the largest schedule.
+    
+    Parameters:
+    - results: List of result dicts from run_benchmark
+    
+    Returns:
+    - Dict of engine -> {"flight_counts", "time_exponent", "cpu_exponent", "memory_exponent",
+      "phase_exponents", "hot_spots"}; exponents are None with fewer than two data points
+    """
+    def exponent(points):
+        points = [(flights, value) for flights, value in points if flights > 0 and value and value > 0]
+        if len({flights for flights, _ in points}) < 2:
+            return None
+        return fit_exponent([flights for flights, _ in points], [value for _, value in points])
+    
+    results = successful_results(results)
+    fits = {}
+    for engine in sorted({result["engine"] for result in results}):
+        runs = sorted((result for result in results if result["engine"] == engine),
+                      key=lambda result: result["total_flights"])
+        largest = runs[-1]
+        phase_exponents = {}
+        hot_spots = []
+        for name in sorted({name for run in runs for name in run["phases"]}):
+            phase_exponent = exponent([(run["total_flights"], run["phases"].get(name, {}).get("wall_time"))
+                                       for run in runs])
+            phase_exponents[name] = phase_exponent
+            share = largest["phases"].get(name, {}).get("wall_time", 0) / max(largest["wall_time"], 1e-9)
+            if phase_exponent is not None and phase_exponent > SUPERLINEAR_EXPONENT and share >= HOT_SPOT_MIN_SHARE:
+                hot_spots.append({"phase": name, "exponent": phase_exponent, "share": share})
+        
+        fits[engine] = {
+            "flight_counts": [run["total_flights"] for run in runs],
+            "time_exponent": exponent([(run["total_flights"], run["wall_time"]) for run in runs]),
+            "cpu_exponent": exponent([(run["total_flights"], run["cpu_time"]) for run in runs]),
+            "memory_exponent": exponent([(run["total_flights"], run["memory_used"]) for run in runs]),
+            "phase_exponents": phase_exponents,
+            "hot_spots": sorted(hot_spots, key=lambda hot_spot: hot_spot["share"], reverse=True)
+        }
+    return fits
+
+def print_scaling(fits):
+    """
+    Print the fitted complexity exponents and the superlinear hot spots
+    
+    Parameters:
+    - fits: Dict returned by fit_scaling
+    """
+    def format_exponent(value):
+        return f"{value:.2f}" if value is not None else "n/a"
+    
+    print("\n=== Empirical Complexity (time or memory ~ flights^k) ===")
+    print(f"{'Engine':>16} | {'Flights':>17} | {'Time k':>6} | {'CPU k':>6} | {'Memory k':>8}")
+    for engine, fit in fits.items():
+        flights = f"{min(fit['flight_counts'])}-{max(fit['flight_counts'])}"
+        print(f"{engine:>16} | {flights:>17} | {format_exponent(fit['time_exponent']):>6} | "
+              f"{format_exponent(fit['cpu_exponent']):>6} | {format_exponent(fit['memory_exponent']):>8}")
+    
+    for engine, fit in fits.items():
+        for hot_spot in fit["hot_spots"]:
+            print(f"Superlinear hot spot in {engine}: {hot_spot['phase']} grows as flights^{hot_spot['exponent']:.2f} "
+                  f"and takes {hot_spot['share']:.0%} of the largest run")
+
+def run_pareto_benchmark(scenarios, configurations, run, time_limit=PARETO_TIME_LIMIT, trace_memory=False):
+    """
+    Run engine configurations on each scenario to compare allocation quality against runtime
+    
+    Parameters:
+    - scenarios: List of scenario directories
+    - configurations: List of names of PARETO_CONFIGURATIONS
+    - run: Function running one benchmark (run_benchmark or run_isolated)
+    - time_limit: CP solver time limit in seconds
+    - trace_memory: Whether to record the tracemalloc peak
+    
+    Returns:
+    - List of result dicts, as run_benchmark, with "pareto_optimal" set (see mark_pareto_front);
+      runs that raised are recorded with failed_result
+    """
+    results = []
+    for scenario in scenarios:
+        for name in configurations:
+            solver_parameters, settings_overrides = PARETO_CONFIGURATIONS[name]
+            solver_parameters = dict(solver_parameters, solver_time_limit_seconds=time_limit)
+            engine = solver_parameters.pop("engine")
+            try:
+                results.append(run(scenario, engine, solver_parameters, trace_memory, settings_overrides, name))
+            except Exception as e:
+                results.append(failed_result(scenario, engine, e, name))
+    mark_pareto_front(results)
+    return results
+
+def mark_pareto_front(results):
+    """
+    Mark the results that are Pareto-optimal in runtime and criticality-weighted objective
+    
+    A result is Pareto-optimal if no other result of the same scenario has at least the same
+    objective in at most the same time, and is strictly better in one of them.
+    
+    Parameters:
+    - results: List of result dicts; "pareto_optimal" is set on each successful one
+    """
+    results = successful_results(results)
+    for result in results:
+        result["pareto_optimal"] = not any(
+            other["scenario"] == result["scenario"]
+            and other["objective"] >= result["objective"] and other["wall_time"] <= result["wall_time"]
+            and (other["objective"] > result["objective"] or other["wall_time"] < result["wall_time"])
+            for other in results
+        )
+
+def print_pareto(results):
+    """
+    Print the quality and runtime of each configuration per scenario, marking the Pareto front
+    
+    Parameters:
+    - results: List of result dicts from run_pareto_benchmark
+    """
+    results = successful_results(results)
+    for scenario in sorted({result["scenario"] for result in results}):
+        print(f"\n=== Quality vs. Speed: {scenario} (* = Pareto-optimal) ===")
+        print(f"  {'Configuration':>22} | {'Time (s)':>9} | {'Allocated':>9} | {'Objective':>10} | "
+              f"{'Contact':>7} | {'Connections':>11}")
+        runs = sorted((result for result in results if result["scenario"] == scenario),
+                      key=lambda result: result["wall_time"])
+        for result in runs:
+            marker = "*" if result["pareto_optimal"] else " "
+            connections = (f"{result['connection_terminal_matches']}/{result['connections']}"
+                           if result["connections"] else "-")
+            print(f"{marker} {result['configuration']:>22} | {result['wall_time']:9.2f} | "
+                  f"{result['allocated_flights']:>9} | {result['objective']:>10} | "
+                  f"{result['contact_stand_share']:>7.1%} | {connections:>11}")
+
+def load_results(file_path):
+    """Load benchmark results from a JSON file"""
+    with open(file_path, "r") as f:
+        return json.load(f)
+
+def compare_results(baseline, current, tolerances=None):
+    """
+    Compare benchmark results with baseline results
+    
+    Results are matched by scenario and engine configuration. A metric regresses if it is worse
+    than the baseline by more than its tolerance (see DEFAULT_TOLERANCES).
+    
+    Parameters:
+    - baseline: List of baseline result dicts
+    - current: List of current result dicts
+    - tolerances: Optional dict of metric -> tolerance overriding the default tolerances
+    
+    Returns:
+    - List of row dicts with "scenario", "engine", "metric", "baseline", "current", "change"
+      and "status" ("ok", "improved", "regressed", "missing" if there is no current result,
+      or "failed" if the current run raised, with or without a baseline result)
+    """
+    limits = dict(DEFAULT_TOLERANCES)
+    for metric, tolerance in (tolerances or {}).items():
+        _, kind, better = limits[metric]
+        limits[metric] = (tolerance, kind, better)
+    
+    def key_of(result):
+        return result["scenario"], result.get("configuration") or result.get("engine")
+    
+    current_by_key = {key_of(result): result for result in current}
+    rows = []
+    for base in baseline:
+        key = key_of(base)
+        result = current_by_key.get(key)
+        if result is None:
+            rows.append({"scenario": key[0], "engine": key[1], "metric": "-", "baseline": None,
+                         "current": None, "change": None, "status": "missing"})
+            continue
+        if "error" in result:
+            rows.append({"scenario": key[0], "engine": key[1], "metric": "-", "baseline": None,
+                         "current": None, "change": None, "status": "failed"})
+            continue
+        
+        for metric, (tolerance, kind, better) in limits.items():
+            base_value = base.get(metric)
+            value = result.get(metric)
+            if base_value is None or value is None:
+                continue
+            
+            # Positive changes are regressions
+            worse_by = value - base_value if better == "lower" else base_value - value
+            limit = tolerance * abs(base_value) if kind == "relative" else tolerance
+            if metric == "wall_time":
+                limit = max(limit, MIN_TIME_DIFFERENCE)
+            
+            if worse_by > limit:
+                status = "regressed"
+            elif -worse_by > limit:
+                status = "improved"
+            else:
+                status = "ok"
+            
+            change = (value - base_value) / abs(base_value) if base_value else None
+            rows.append({"scenario": key[0], "engine": key[1], "metric": metric, "baseline": base_value,
+                         "current": value, "change": change, "status": status})
+    
+    # Runs that failed count even without a baseline result
+    baseline_keys = {key_of(base) for base in baseline}
+    for key, result in current_by_key.items():
+        if "error" in result and key not in baseline_keys:
+            rows.append({"scenario": key[0], "engine": key[1], "metric": "-", "baseline": None,
+                         "current": None, "change": None, "status": "failed"})
+    return rows
+
+def print_comparison(rows, show_all=False):
+    """
+    Print a diff table of a comparison with baseline results
+    
+    Parameters:
+    - rows: List of row dicts from compare_results
+    - show_all: Whether to print unchanged metrics too
+    """
+    shown = [row for row in rows if show_all or row["status"] != "ok"]
+    print("\n=== Comparison with Baseline ===")
+    if not shown:
+        print(f"No changes beyond the tolerances ({len(rows)} metrics compared)")
+        return
+    
+    print(f"{'Scenario':>30} | {'Engine':>12} | {'Metric':>16} | {'Baseline':>12} | {'Current':>12} | {'Change':>8} | Status")
+    for row in shown:
+        baseline = f"{row['baseline']:.3f}" if row["baseline"] is not None else "-"
+        current = f"{row['current']:.3f}" if row["current"] is not None else "-"
+        change = f"{row['change']:+.1%}" if row["change"] is not None else "-"
+        print(f"{row['scenario']:>30} | {str(row['engine']):>12} | {row['metric']:>16} | "
+              f"{baseline:>12} | {current:>12} | {change:>8} | {row['status'].upper()}")
+
+def compare_with_baseline(baseline_path, results, tolerances=None, show_all=False, allow_missing=False):
+    """
+    Compare results with a baseline results file and print the differences
+    
+    A run that failed counts as a regression, and so does a baseline result without a current
+    result (e.g. an engine that no longer runs) unless allow_missing is set.
+    
+    Parameters:
+    - baseline_path: Path to the baseline results JSON file
+    - results: List of current result dicts
+    - tolerances: Optional dict of metric -> tolerance
+    - show_all: Whether to print unchanged metrics too
+    - allow_missing: Whether baseline results without a current result are accepted
+    
+    Returns:
+    - Exit code: 1 if any metric regressed or a run failed or is missing, 0 otherwise
+    """
+    rows = compare_results(load_results(baseline_path), results, tolerances)
+    print_comparison(rows, show_all)
+    
+    regressions = [row for row in rows if row["status"] == "regressed"]
+    failed = [row for row in rows if row["status"] == "failed"]
+    missing = [row for row in rows if row["status"] == "missing"]
+    exit_code = 0
+    if failed:
+        print(f"REGRESSION: {len(failed)} benchmark runs failed")
+        exit_code = 1
+    if missing:
+        if allow_missing:
+            print(f"{len(missing)} baseline results have no current result (allowed by --allow-missing)")
+        else:
+            print(f"REGRESSION: {len(missing)} baseline results have no current result")
+            exit_code = 1
+    if regressions:
+        print(f"REGRESSION: {len(regressions)} metrics are worse than the baseline beyond their tolerance")
+        exit_code = 1
+    if not exit_code:
+        print("No regressions")
+    return exit_code
+
+def parse_tolerances(values):
+    """
+    Parse --tolerance arguments of the form metric=value
+    
+    Returns:
+    - Dict of metric -> tolerance
+    """
+    tolerances = {}
+    for value in values or []:
+        metric, _, tolerance = value.partition("=")
+        if metric not in DEFAULT_TOLERANCES or not tolerance:
+            raise argparse.ArgumentTypeError(
+                f"Invalid tolerance '{value}', expected one of {', '.join(DEFAULT_TOLERANCES)} as metric=value"
+            )
+        tolerances[metric] = float(tolerance)
+    return tolerances
+
 def main():
     parser = argparse.ArgumentParser(description="Benchmark the stand allocation algorithm")
-    parser.add_argument("--scenarios", type=str, nargs="+", 
+    parser.add_argument("--scenarios", type=str, nargs="+",
                       help="List of scenario directories to benchmark")
     parser.add_argument("--generate", action="store_true",
                       help="Generate test datasets")
-    parser.add_argument("--flight-counts", type=int, nargs="+", default=[1000, 5000, 10000, 50000],
-                      help="Number of flights to generate for each test dataset")
+    parser.add_argument("--generate-only", action="store_true",
+                      help="Generate the test datasets of --generate without running the benchmarks")
+    parser.add_argument("--seed", type=int,
+                      help="Random seed of the generated datasets (default: the generator's)")
+    parser.add_argument("--generate-workers", type=int,
+                      help="Worker processes of the generator (default: one per CPU)")
+    parser.add_argument("--flight-counts", type=int, nargs="+",
+                      help="Number of flights to generate for each test dataset "
+                           "(default: 1000 5000 10000 50000, or SCALING_FLIGHT_COUNTS with --scaling)")
+    parser.add_argument("--scaling", action="store_true",
+                      help="Run each engine on generated schedules of increasing size and fit "
+                           "the empirical complexity of time and memory")
+    parser.add_argument("--max-run-seconds", type=float, default=600,
+                      help="With --scaling, skip larger schedules for an engine after a run this long")
+    parser.add_argument("--pareto", action="store_true",
+                      help="Run engine configurations with a time limit on each scenario and report "
+                           "the Pareto front of allocation quality against runtime")
+    parser.add_argument("--configurations", type=str, nargs="+", choices=list(PARETO_CONFIGURATIONS),
+                      default=list(PARETO_CONFIGURATIONS),
+                      help="Engine configurations of --pareto (default: all)")
+    parser.add_argument("--engines", type=str, nargs="+", default=["cp"],
+                      help="Allocation engines to benchmark (greedy, flow, cp, hybrid, ...)")
     parser.add_argument("--no-solver", action="store_true",
-                      help="Use greedy algorithm instead of CP solver")
+                      help="Only benchmark the greedy algorithm")
+    parser.add_argument("--time-limit", type=int,
+                      help="CP solver time limit in seconds (default: the scenario setting)")
+    parser.add_argument("--trace-memory", action="store_true",
+                      help="Record the peak of Python allocations with tracemalloc (slows the run down)")
+    parser.add_argument("--profile", nargs="?", const="sampling", choices=PROFILE_MODES,
+                      help="Profile each run with the sampling (default) or deterministic profiler")
+    parser.add_argument("--profile-dir", type=str, default="profiles",
+                      help="Directory for the collapsed-stack files of --profile")
+    parser.add_argument("--cp-report-dir", type=str,
+                      help="Write the model, search log and statistics of each CP solve to this directory")
+    parser.add_argument("--no-isolate", action="store_true",
+                      help="Run all benchmarks in this process (peak RSS is then cumulative)")
     parser.add_argument("--output", type=str, default="benchmark_results.json",
                       help="Output file for benchmark results")
+    parser.add_argument("--scaling-output", type=str, default="scaling_results.json",
+                      help="Output file for the fitted complexity with --scaling")
+    parser.add_argument("--compare", type=str, metavar="BASELINE",
+                      help="Compare the results with a baseline results file and exit with "
+                           "status 1 on a regression")
+    parser.add_argument("--results", type=str,
+                      help="With --compare, compare this results file instead of running the benchmarks")
+    parser.add_argument("--tolerance", type=str, action="append", metavar="METRIC=VALUE",
+                      help="Regression tolerance for --compare, e.g. wall_time=0.3 (relative) or "
+                           "allocation_rate=1 (percentage points); can be repeated")
+    parser.add_argument("--allow-missing", action="store_true",
+                      help="With --compare, accept baseline results that have no current result")
+    parser.add_argument("--show-all", action="store_true",
+                      help="With --compare, also list the metrics within their tolerance")
     
     args = parser.parse_args()
     
+    try:
+        tolerances = parse_tolerances(args.tolerance)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    
+    if args.compare and args.results:
+        sys.exit(compare_with_baseline(args.compare, load_results(args.results), tolerances, args.show_all,
+                                      args.allow_missing))
+    
+    engines = ["greedy"] if args.no_solver else args.engines
+    solver_parameters = {}
+    if args.time_limit is not None:
+        solver_parameters["solver_time_limit_seconds"] = args.time_limit
+    run = run_benchmark if args.no_isolate else run_isolated
+    if args.profile:
+        run = functools.partial(run, profile=args.profile, profile_dir=args.profile_dir)
+    if args.cp_report_dir:
+        run = functools.partial(run, cp_report_dir=args.cp_report_dir)
+    
+    if args.scaling:
+        scenarios = generate_scaling_data(args.flight_counts or SCALING_FLIGHT_COUNTS, args.seed,
+                                          args.generate_workers)
+        results = run_scaling_benchmark(scenarios, engines, run, solver_parameters, args.trace_memory,
+                                        args.max_run_seconds)
+        fits = fit_scaling(results)
+        print_scaling(fits)
+        
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        with open(args.scaling_output, "w") as f:
+            json.dump(fits, f, indent=2)
+        
+        print(f"\nBenchmark results written to {args.output}, fitted complexity to {args.scaling_output}")
+        if args.compare:
+            sys.exit(compare_with_baseline(args.compare, results, tolerances, args.show_all, args.allow_missing))
+        return
+    
     # Generate test datasets if requested
-    if args.generate:
+    if args.generate or args.generate_only:
+        args.flight_counts = args.flight_counts or [1000, 5000, 10000, 50000]
         for count in args.flight_counts:
             output_dir = f"test_scenarios/benchmark_{count}"
-            generate_test_data(count, output_dir)
-            
+            generate_test_data(count, output_dir, seed=args.seed, workers=args.generate_workers)
+        if args.generate_only:
+            return
+        
         # Update the scenarios list to include the generated datasets
         if not args.scenarios:
             args.scenarios = [f"test_scenarios/benchmark_{count}" for count in args.flight_counts]
     
-    # If no scenarios specified, use all test_scenarios directories
+    # If no scenarios specified, use all test_scenarios directories with flights
     if not args.scenarios:
-        args.scenarios = [
-            os.path.join("test_scenarios", d) 
-            for d in os.listdir("test_scenarios") 
-            if os.path.isdir(os.path.join("test_scenarios", d))
-        ]
+        args.scenarios = sorted(
+            os.path.join("test_scenarios", d)
+            for d in os.listdir("test_scenarios")
+            if os.path.isfile(os.path.join("test_scenarios", d, "flights.json"))
+        )
     
     # Run benchmarks
     results = []
-    for scenario in args.scenarios:
-        try:
-            result = run_benchmark(scenario, not args.no_solver)
-            results.append(result)
-        except Exception as e:
-            print(f"Error benchmarking {scenario}: {e}")
+    if args.pareto:
+        time_limit = args.time_limit if args.time_limit is not None else PARETO_TIME_LIMIT
+        results = run_pareto_benchmark(args.scenarios, args.configurations, run, time_limit, args.trace_memory)
+        print_pareto(results)
+    else:
+        for scenario in args.scenarios:
+            for engine in engines:
+                try:
+                    result = run(scenario, engine, solver_parameters, args.trace_memory)
+                    results.append(result)
+                except Exception as e:
+                    results.append(failed_result(scenario, engine, e))
     
     # Write results to file
     with open(args.output, "w") as f:
         json.dump(results, f, indent=2)
     
     print(f"\nBenchmark results written to {args.output}")
+    
+    if args.compare:
+        sys.exit(compare_with_baseline(args.compare, results, tolerances, args.show_all, args.allow_missing))
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+CP-SAT Solve Reports
+Captures the search log of a CP-SAT solve, parses its presolve, search and LNS statistics,
+and writes them with the response statistics (and optionally the model) as a structured
+report, so slow solves can be inspected and replayed offline
+"""
+
+import argparse
+import itertools
+import json
+import os
+import re
+from ortools.sat.python import cp_model
+
+# Numeric fields of the solver response included in the report
+RESPONSE_FIELDS = (
+    "num_booleans", "num_integers", "num_fixed_booleans", "num_conflicts", "num_branches",
+    "num_binary_propagations", "num_integer_propagations", "num_restarts", "num_lp_iterations",
+    "wall_time", "user_time", "deterministic_time", "gap_integral"
+)
+
+_solve_counter = itertools.count(1)
+
+_HEADER_PATTERN = re.compile(r"^(\S.*?)\s{2,}(\S.*)$")
+_ROW_PATTERN = re.compile(r"^\s+'(.+?)':\s+(.*)$")
+_MODEL_PATTERN = re.compile(r"^(Initial|Presolved) optimization model")
+_COUNT_PATTERN = re.compile(r"^#(\w+):\s+([\d']+)")
+_RULE_PATTERN = re.compile(r"^\s+- rule '(.+)' was applied ([\d']+) times?\.")
+_RELATIONS_PATTERN = re.compile(r"^\s+- ([\d']+) affine relations were detected\.")
+
+
+def next_report_name():
+    """
+    Name for the report files of the next solve in this process
+    
+    Returns:
+    - Name unique across the worker processes of a decomposed solve (e.g. "cp_solve_1234_001")
+    """
+    return f"cp_solve_{os.getpid()}_{next(_solve_counter):03d}"
+
+
+def _parse_value(text):
+    """Parse a number of the CP-SAT log (with ' as thousands separator), or keep the text"""
+    plain = text.replace("'", "")
+    for parse in (int, float):
+        try:
+            return parse(plain)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_solver_log(log_text):
+    """
+    Parse the statistics of a CP-SAT search log
+    
+    Parameters:
+    - log_text: Log of a solve with log_search_progress enabled
+    
+    Returns:
+    - Dict with "initial_model" and "presolved_model" ({"variables", "constraints" by type}),
+      "presolve" ({"affine_relations", "rules" applied with their counts}) and "tables"
+      (title -> subsolver -> column -> value, e.g. tables["Search stats"]["default_lp"]["Conflicts"]
+      and tables["LNS stats"]["rnd_var_lns"]["Improv/Calls"]; rows that do not match the
+      columns are kept as text)
+    """
+    lines = log_text.splitlines()
+    stats = {
+        "initial_model": None,
+        "presolved_model": None,
+        "presolve": {"affine_relations": None, "rules": {}},
+        "tables": {}
+    }
+    
+    model = None
+    table = None
+    for line in lines:
+        model_match = _MODEL_PATTERN.match(line)
+        if model_match:
+            model = {"variables": None, "constraints": {}}
+            stats["initial_model" if model_match.group(1) == "Initial" else "presolved_model"] = model
+            continue
+        if model is not None:
+            count_match = _COUNT_PATTERN.match(line)
+            if count_match and count_match.group(1) == "Variables":
+                model["variables"] = _parse_value(count_match.group(2))
+                continue
+            if count_match:
+                model["constraints"][count_match.group(1)] = _parse_value(count_match.group(2))
+                continue
+            if line.startswith("  "):
+                continue  # Variable domains
+            model = None
+        
+        rule_match = _RULE_PATTERN.match(line)
+        if rule_match:
+            stats["presolve"]["rules"][rule_match.group(1)] = _parse_value(rule_match.group(2))
+            continue
+        relations_match = _RELATIONS_PATTERN.match(line)
+        if relations_match:
+            stats["presolve"]["affine_relations"] = _parse_value(relations_match.group(1))
+            continue
+        
+        row_match = _ROW_PATTERN.match(line)
+        if row_match and table is not None:
+            values = re.split(r"\s{2,}", row_match.group(2).strip())
+            if len(values) == len(table["columns"]):
+                row = {column: _parse_value(value) for column, value in zip(table["columns"], values)}
+            else:
+                row = row_match.group(2).strip()
+            table["rows"][row_match.group(1)] = row
+            continue
+        
+        header_match = _HEADER_PATTERN.match(line)
+        if header_match and not line.startswith("#") and ":" not in line:
+            table = {"columns": re.split(r"\s{2,}", header_match.group(2).strip()), "rows": {}}
+            stats["tables"][header_match.group(1)] = table
+        else:
+            table = None
+    
+    stats["tables"] = {title: table["rows"] for title, table in stats["tables"].items() if table["rows"]}
+    return stats
+
+
+def response_statistics(solver):
+    """
+    Read the statistics of the last solve from the solver response
+    
+    Parameters:
+    - solver: CpSolver object after a solve
+    
+    Returns:
+    - Dict of RESPONSE_FIELDS plus "solution_info"
+    """
+    response = solver.response_proto
+    statistics = {name: getattr(response, name) for name in RESPONSE_FIELDS if hasattr(response, name)}
+    statistics["solution_info"] = response.solution_info
+    return statistics
+
+
+def write_solve_report(directory, name, model, solver, log_lines, solve_stats, model_stats=None,
+                       export_model=True):
+    """
+    Write the report of a CP-SAT solve to a directory
+    
+    Writes <name>.log (the search log), <name>.pb.txt (the model with its hints, in the
+    protobuf text format) if export_model, and <name>.json (the report).
+    
+    Parameters:
+    - directory: Output directory (created if needed)
+    - name: Base name of the files (see next_report_name)
+    - model: CpModel object that was solved
+    - solver: CpSolver object after the solve
+    - log_lines: Captured log messages of the solve
+    - solve_stats: Dict of solve statistics of the caller (status, times, objective and so on)
+    - model_stats: Optional dict describing the model (e.g. its flights and stands)
+    - export_model: Whether to write the model
+    
+    Returns:
+    - Report dict
+    """
+    os.makedirs(directory, exist_ok=True)
+    log_text = "\n".join(log_lines)
+    log_path = os.path.join(directory, f"{name}.log")
+    with open(log_path, "w") as f:
+        f.write(log_text + "\n")
+    
+    model_path = None
+    if export_model:
+        model_path = os.path.join(directory, f"{name}.pb.txt")
+        model.ExportToFile(model_path)
+    
+    report = {
+        "name": name,
+        "solve": solve_stats,
+        "model": model_stats or {},
+        "parameters": str(solver.parameters),
+        "response": response_statistics(solver),
+        "log_statistics": parse_solver_log(log_text),
+        "log_file": os.path.basename(log_path),
+        "model_file": os.path.basename(model_path) if model_path else None
+    }
+    with open(os.path.join(directory, f"{name}.json"), "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    return report
+
+
+def replay(report_path, time_limit=None, num_workers=None):
+    """
+    Solve the exported model of a report again with the recorded solver parameters
+    
+    Parameters:
+    - report_path: Path of the report JSON file
+    - time_limit: Optional time limit in seconds replacing the recorded one
+    - num_workers: Optional number of search workers replacing the recorded one
+    
+    Returns:
+    - Tuple of (status name, response statistics dict)
+    """
+    with open(report_path, "r") as f:
+        report = json.load(f)
+    if not report.get("model_file"):
+        raise ValueError(f"Report {report_path} has no exported model")
+    
+    model = cp_model.CpModel()
+    with open(os.path.join(os.path.dirname(report_path), report["model_file"]), "r") as f:
+        model_text = f.read()
+    # Newer OR-Tools releases wrap the protos with parse_text_format() instead of protobuf messages
+    if hasattr(model.Proto(), "parse_text_format"):
+        model.Proto().parse_text_format(model_text)
+    else:
+        from google.protobuf import text_format
+        text_format.Parse(model_text, model.Proto())
+    
+    solver = cp_model.CpSolver()
+    if hasattr(solver.parameters, "parse_text_format"):
+        solver.parameters.parse_text_format(report["parameters"])
+    else:
+        from google.protobuf import text_format
+        text_format.Merge(report["parameters"], solver.parameters)
+    if time_limit is not None:
+        solver.parameters.max_time_in_seconds = time_limit
+    if num_workers is not None:
+        solver.parameters.num_workers = num_workers
+    solver.parameters.log_search_progress = True
+    
+    status = solver.Solve(model)
+    return solver.StatusName(status), response_statistics(solver)
+
+
+def _format_value(value):
+    """Format a response statistic for the replay table"""
+    return f"{value:.4g}" if isinstance(value, float) else str(value)
+
+
+def main():
+    """
+    Replay the model of a solve report
+    """
+    parser = argparse.ArgumentParser(description='Replay the exported CP model of a solve report')
+    parser.add_argument('report', help='Report JSON file written by the CP solver')
+    parser.add_argument('--time-limit', type=float, help='Time limit in seconds (default: as recorded)')
+    parser.add_argument('--workers', type=int, help='Number of search workers (default: as recorded)')
+    args = parser.parse_args()
+    
+    status, statistics = replay(args.report, args.time_limit, args.workers)
+    
+    with open(args.report, "r") as f:
+        recorded = json.load(f)
+    print(f"\n{'':>26} | {'Recorded':>12} | {'Replayed':>12}")
+    print(f"{'status':>26} | {recorded['solve'].get('status', '-'):>12} | {status:>12}")
+    for name in RESPONSE_FIELDS:
+        if name in statistics:
+            print(f"{name:>26} | {_format_value(recorded['response'].get(name, '-')):>12} | "
+                  f"{_format_value(statistics[name]):>12}")
+
+if __name__ == "__main__":
+    main()
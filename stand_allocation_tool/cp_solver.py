@@ -9,47 +9,252 @@ from typing import Dict, List, Tuple, Optional
 import logging
 import time
 import sys
-try:
-    from tqdm import tqdm
-except ImportError:
-    # Fallback if tqdm is not installed
-    tqdm = lambda x, **kwargs: x
+import os
+import bisect
+import threading
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from allocation_metrics import AllocationMetrics
+from progress_events import ProgressReporter, create_progress_reporter
+from cp_solve_report import next_report_name, write_solve_report
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('cp_solver')
 
+# Solver profiles, selected with the "solver_profile" solver parameter
+# - workers: number of parallel search workers (the portfolio size); "auto" uses every available core
+# - max_workers: upper bound on the number of workers when "auto" is used (None for no bound)
+# - full_subsolvers: workers that search the full problem, the rest run LNS (None lets CP-SAT decide)
+# - use_lns: whether large neighbourhood search workers are used at all
+# - linearization_level: 0 (none), 1 (default) or 2 (strongest LP relaxation, most memory)
+# - memory_fraction: share of the available memory the solver may use
+# - worker_overhead_mb: memory needed by each worker on top of the model itself
+SOLVER_PROFILES = {
+    "balanced": {
+        "workers": "auto",
+        "max_workers": None,
+        "full_subsolvers": None,
+        "use_lns": True,
+        "linearization_level": 1,
+        "memory_fraction": 0.75,
+        "worker_overhead_mb": 200,
+    },
+    "fast": {
+        "workers": "auto",
+        "max_workers": 8,
+        "full_subsolvers": None,
+        "use_lns": True,
+        "linearization_level": 0,
+        "memory_fraction": 0.75,
+        "worker_overhead_mb": 150,
+    },
+    "thorough": {
+        "workers": "auto",
+        "max_workers": None,
+        "full_subsolvers": None,
+        "use_lns": True,
+        "linearization_level": 2,
+        "memory_fraction": 0.85,
+        "worker_overhead_mb": 300,
+    },
+    "large_scale": {
+        "workers": "auto",
+        "max_workers": None,
+        "full_subsolvers": 2,
+        "use_lns": True,
+        "linearization_level": 0,
+        "memory_fraction": 0.75,
+        "worker_overhead_mb": 250,
+    },
+    "low_memory": {
+        "workers": 1,
+        "max_workers": 1,
+        "full_subsolvers": None,
+        "use_lns": False,
+        "linearization_level": 0,
+        "memory_fraction": 0.5,
+        "worker_overhead_mb": 100,
+    },
+}
+
+# Problems above this many flights use the "large_scale" profile when the profile is "auto"
+LARGE_SCALE_PROFILE_THRESHOLD = 10000
+
+# Rough memory used by each worker per optional interval in the model
+MEMORY_PER_INTERVAL_MB = 0.002
+
+
+def get_available_cores():
+    """
+    Get the number of CPU cores this process may run on
+    
+    Returns:
+    - Integer number of cores (at least 1)
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def get_available_memory_mb():
+    """
+    Get the physical memory currently available to the process
+    
+    Returns:
+    - Available memory in megabytes, or None if it cannot be determined
+    """
+    try:
+        import psutil
+        return psutil.virtual_memory().available / (1024 * 1024)
+    except ImportError:
+        pass
+    
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def resolve_solver_profile(solver_parameters, num_flights, num_intervals,
+                           available_cores=None, available_memory_mb=None):
+    """
+    Turn the solver parameters into concrete CP-SAT settings for this machine and problem
+    
+    Parameters:
+    - solver_parameters: Dict of solver parameters from the Settings object
+    - num_flights: Number of flights in the model
+    - num_intervals: Number of optional interval variables in the model
+    - available_cores: Number of usable CPU cores (detected if None)
+    - available_memory_mb: Available memory in MB (detected if None)
+    
+    Returns:
+    - Dict with the profile name, "num_workers", "full_subsolvers", "use_lns",
+      "linearization_level" and "max_memory_in_mb" (None if unknown)
+    """
+    profile_name = solver_parameters.get("solver_profile", "auto")
+    if profile_name == "auto":
+        profile_name = "large_scale" if num_flights > LARGE_SCALE_PROFILE_THRESHOLD else "balanced"
+    if profile_name not in SOLVER_PROFILES:
+        logger.warning("Unknown solver profile '%s', using 'balanced'", profile_name)
+        profile_name = "balanced"
+    
+    # Individual settings can be overridden on top of the profile
+    profile = dict(SOLVER_PROFILES[profile_name])
+    profile.update(solver_parameters.get("solver_profile_overrides", {}))
+    
+    if available_cores is None:
+        available_cores = get_available_cores()
+    if available_memory_mb is None:
+        available_memory_mb = get_available_memory_mb()
+    
+    # Worker count follows the available cores, capped by the profile
+    if profile["workers"] == "auto":
+        num_workers = available_cores
+        if profile["max_workers"]:
+            num_workers = min(num_workers, profile["max_workers"])
+    else:
+        num_workers = int(profile["workers"])
+    
+    # Each worker keeps its own copy of the search state, so cap workers by memory
+    max_memory_in_mb = None
+    if available_memory_mb:
+        max_memory_in_mb = int(available_memory_mb * profile["memory_fraction"])
+        per_worker_mb = profile["worker_overhead_mb"] + num_intervals * MEMORY_PER_INTERVAL_MB
+        num_workers = min(num_workers, max(1, int(max_memory_in_mb // per_worker_mb)))
+    
+    num_workers = max(1, num_workers)
+    
+    full_subsolvers = profile["full_subsolvers"]
+    if full_subsolvers is not None:
+        full_subsolvers = min(full_subsolvers, num_workers)
+    
+    return {
+        "profile": profile_name,
+        "num_workers": num_workers,
+        "full_subsolvers": full_subsolvers,
+        "use_lns": profile["use_lns"],
+        "linearization_level": profile["linearization_level"],
+        "max_memory_in_mb": max_memory_in_mb,
+    }
+
+def _solve_component(component):
+    """
+    Solve one independent component of the allocation problem (runs in a worker process)
+    
+    Parameters:
+    - component: Dict with the component's "flights", "stands", "fixed_occupancy", "time_limit"
+      and "available_cores", plus the shared "airlines", "settings" and "maintenance_tracker"
+    
+    Returns:
+    - Dict with "solved", "allocated" (list of (FlightID, StandName, start_time, end_time)),
+      "unallocated" (list of (FlightID, reason)) and "occupancy" (FlightID -> occupancy tuple)
+    """
+    solver = StandAllocationCPSolver(
+        component["flights"], component["stands"], component["airlines"], component["settings"],
+        component["maintenance_tracker"], None, verbose=False,
+        fixed_occupancy=component["fixed_occupancy"]
+    )
+    solver.available_cores = component["available_cores"]
+    allocated_report, unallocated_report = solver.solve(
+        time_limit=component["time_limit"], log_unallocated=False
+    )
+    
+    # Flight and Stand objects are copies in the worker, so results are passed back by name
+    return {
+        "solved": bool(allocated_report or unallocated_report),
+        "allocated": [
+            (allocation['flight'].FlightID, allocation['stand'].StandName,
+             allocation['start_time'], allocation['end_time'])
+            for allocation in allocated_report
+        ],
+        "unallocated": [
+            (unallocation['flight'].FlightID, unallocation['reason'])
+            for unallocation in unallocated_report
+        ],
+        "occupancy": solver.solution_occupancy,
+        "metrics": solver.metrics,
+    }
+
+
 class SolutionCallback(cp_model.CpSolverSolutionCallback):
     """
-    Custom solution callback to display progress during the solving process
+    Custom solution callback to report progress during the solving process
+    
+    Every improving solution is reported as an incumbent event with its objective and
+    bound. The allocated flight count costs a pass over all flights, so it is only read
+    for the throttled progress ticks, which keeps the callback cheap on large models and
+    does not need solution enumeration.
     """
     
-    def __init__(self, flight_allocated_vars, total_flights, verbose, display_interval=2.0):
+    def __init__(self, flight_allocated_vars, total_flights, progress=None, display_interval=2.0,
+                 on_solution=None, cancel_event=None, phase="cp_solve"):
         """
         Initialize the callback
         
         Parameters:
         - flight_allocated_vars: Dict of flight_idx -> Boolean variable indicating if flight is allocated
         - total_flights: Total number of flights being processed
-        - verbose: Whether to display progress updates
-        - display_interval: How often to display progress (in seconds)
+        - progress: Optional ProgressReporter for incumbent and progress events
+        - display_interval: Least time between two progress ticks with the allocated count (in seconds)
+        - on_solution: Optional function called with this callback for every new solution
+        - cancel_event: Optional threading.Event that stops the search when set
+        - phase: Name of the solve phase in the progress events
         """
         cp_model.CpSolverSolutionCallback.__init__(self)
         self._flight_allocated_vars = flight_allocated_vars
+        self._on_solution = on_solution
+        self._cancel_event = cancel_event
         self._total_flights = total_flights
-        self._verbose = verbose
+        self._progress = progress if progress is not None else ProgressReporter()
         self._display_interval = display_interval
+        self._phase = phase
         self._start_time = time.time()
-        self._last_display_time = self._start_time
         self._solution_count = 0
         self._best_objective = None
-        self._progress_bar = None
+        self._first_solution_time = None
         
-        # Initialize progress bar if verbose
-        if self._verbose:
-            self._progress_bar = tqdm(total=total_flights, desc="CP solver allocation", 
-                                     unit="flights", leave=True)
-            self._last_allocated_count = 0
+        self._progress.phase_start(phase, total=total_flights, description="CP solver allocation", unit="flights")
         
     def on_solution_callback(self):
         """
@@ -57,60 +262,64 @@ class SolutionCallback(cp_model.CpSolverSolutionCallback):
         """
         current_time = time.time()
         self._solution_count += 1
+        if self._first_solution_time is None:
+            self._first_solution_time = current_time - self._start_time
         
-        # Calculate allocated flights
-        allocated_count = sum(1 for idx in self._flight_allocated_vars if self.Value(self._flight_allocated_vars[idx]))
         objective = self.ObjectiveValue()
         
         if self._best_objective is None or objective > self._best_objective:
             self._best_objective = objective
         
-        # Display progress updates at regular intervals or on every new solution if requested
-        display_now = (current_time - self._last_display_time >= self._display_interval)
+        if self._on_solution:
+            self._on_solution(self)
         
-        if self._verbose and display_now:
-            if self._progress_bar:
-                # Update the progress bar with the new allocated count
-                progress_diff = allocated_count - self._last_allocated_count
-                if progress_diff > 0:
-                    self._progress_bar.update(progress_diff)
-                
-                # Update progress bar description with solution info
-                elapsed_time = current_time - self._start_time
-                percentage = (allocated_count / self._total_flights) * 100
-                self._progress_bar.set_postfix_str(
-                    f"Solution #{self._solution_count} - {percentage:.1f}% - Time: {elapsed_time:.1f}s"
-                )
-                
-                self._last_allocated_count = allocated_count
-            else:
-                # Fallback to print if progress bar couldn't be created
-                elapsed_time = current_time - self._start_time
-                percentage = (allocated_count / self._total_flights) * 100
-                print(f"\rCP solver progress: {allocated_count}/{self._total_flights} flights allocated ({percentage:.1f}%) - "
-                    f"Solution #{self._solution_count} - Time: {elapsed_time:.1f}s", end="", flush=True)
+        if self._cancel_event is not None and self._cancel_event.is_set():
+            self.StopSearch()
+        
+        progress = self._progress
+        if progress.enabled:
+            bound = self.BestObjectiveBound()
+            elapsed_time = current_time - self._start_time
+            progress.incumbent(self._phase, solution=self._solution_count, objective=objective, bound=bound,
+                               gap=abs(bound - objective) / max(1.0, abs(objective)), solve_time=elapsed_time)
             
-            self._last_display_time = current_time
+            if progress.due(self._phase, self._display_interval):
+                allocated_count = sum(1 for idx in self._flight_allocated_vars
+                                      if self.Value(self._flight_allocated_vars[idx]))
+                progress.emit("progress", phase=self._phase, done=allocated_count, total=self._total_flights,
+                              solution=self._solution_count, objective=objective, bound=bound)
             
     def solution_count(self):
         """
         Return the number of solutions found
         """
         return self._solution_count
+    
+    def elapsed_time(self):
+        """
+        Return the time in seconds since the search started
+        """
+        return time.time() - self._start_time
+    
+    def first_solution_time(self):
+        """
+        Return the time in seconds until the first solution was found (None if none was found)
+        """
+        return self._first_solution_time
         
     def close(self):
         """
-        Close the progress bar properly
+        Report the end of the solve phase
         """
-        if self._progress_bar:
-            self._progress_bar.close()
+        self._progress.phase_end(self._phase, solutions=self._solution_count, objective=self._best_objective)
 
 class StandAllocationCPSolver:
     """
     CP solver implementation for stand allocation optimization
     """
     
-    def __init__(self, flights, stands, airlines, settings, maintenance_tracker, ai_support, verbose=False):
+    def __init__(self, flights, stands, airlines, settings, maintenance_tracker, ai_support, verbose=False,
+                 fixed_occupancy=None, metrics=None, progress=None):
         """
         Initialize the CP solver
         
@@ -122,6 +331,12 @@ class StandAllocationCPSolver:
         - maintenance_tracker: MockMaintenanceTracker object
         - ai_support: MockAISupport object
         - verbose: Whether to show detailed progress information
+        - fixed_occupancy: Optional list of (StandName, start_datetime, end_datetime) tuples for
+          stand time that is already taken by flights outside this model (e.g. allocated in an
+          earlier time window); the gap between flights is kept after each of them
+        - metrics: Optional AllocationMetrics object to record the model size and solve statistics
+          in (a new one if None)
+        - progress: Optional ProgressReporter for progress events (progress bars if verbose and None)
         """
         self.flights = flights
         self.stands = stands
@@ -131,9 +346,16 @@ class StandAllocationCPSolver:
         self.ai_support = ai_support
         self.airline_map = {airline.AirlineCode: airline for airline in airlines}
         self.verbose = verbose
+        self.metrics = metrics if metrics is not None else AllocationMetrics()
+        self.progress = progress if progress is not None else create_progress_reporter(verbose)
         
         # Constants for the CP model
         self.UNALLOCATED_STAND = -1  # Special value for unallocated flights
+        self.solver_profile = None  # Resolved solver profile of the last solve
+        self.available_cores = None  # Cores the solver may use (detected if None)
+        
+        # Stand occupancy of the last solution (FlightID -> (StandName, start_datetime, end_datetime))
+        self.solution_occupancy = {}
         
         # Calculate the time horizon dynamically based on the flight data
         self.calculate_time_horizon()
@@ -159,6 +381,22 @@ class StandAllocationCPSolver:
                 if flight.LinkID not in self.link_id_to_flights:
                     self.link_id_to_flights[flight.LinkID] = []
                 self.link_id_to_flights[flight.LinkID].append(flight)
+        
+        # Fixed stand occupancy (stand_idx -> list of (start_minutes, end_minutes))
+        self.fixed_occupancy = fixed_occupancy or []
+        self.fixed_intervals = self._get_fixed_intervals(self.fixed_occupancy)
+        
+        # Groups of stands that are interchangeable in the model, used for symmetry breaking
+        if settings.solver_parameters.get("symmetry_breaking", False):
+            self.interchangeable_stand_classes = self._find_interchangeable_stands()
+        else:
+            self.interchangeable_stand_classes = []
+        
+        # Statistics, improving solutions and result of the last solve
+        self.solve_stats = {}
+        self.solve_report = None  # Report of the last solve if "cp_report_dir" is set (see cp_solve_report.py)
+        self.incumbents = []
+        self.last_result = None
                 
         if self.verbose:
             print(f"CP solver initialization complete")
@@ -219,17 +457,49 @@ class StandAllocationCPSolver:
             minutes_diff = days_diff * 24 * 60 + dt.hour * 60 + dt.minute
             return minutes_diff
     
+    def _minutes_to_datetime(self, minutes):
+        """
+        Convert minutes since the reference point back to a datetime
+        
+        Parameters:
+        - minutes: Integer minutes since reference (as returned by _datetime_to_minutes)
+        
+        Returns:
+        - datetime object
+        """
+        return datetime.combine(self.earliest_time.date(), datetime.min.time()) + timedelta(minutes=minutes)
+    
+    def _format_report_time(self, flight, minutes):
+        """
+        Format a time in model minutes for the allocation report
+        
+        Parameters:
+        - flight: Flight object the time belongs to
+        - minutes: Integer minutes since reference
+        
+        Returns:
+        - "HH:MM" for legacy time-only flights, otherwise "YYYY-MM-DD HH:MM"
+        """
+        if flight.parsed_time.year == 1900:  # Legacy time format
+            # Just use the time portion
+            return datetime(2000, 1, 1, minutes // 60, minutes % 60).strftime("%H:%M")
+        
+        # Use proper date handling
+        return self._minutes_to_datetime(minutes).strftime("%Y-%m-%d %H:%M")
+    
     def prepare_flights_data(self):
         """
         Convert flight data into a format suitable for the CP model
         """
-        if self.verbose:
-            flights_pbar = tqdm(self.flights, desc="Preparing flight data", unit="flights")
-            flight_iter = flights_pbar
-        else:
-            flight_iter = self.flights
+        progress = self.progress
+        report_progress = progress.enabled
+        progress.phase_start("cp_prepare_flights", total=len(self.flights),
+                             description="Preparing flight data", unit="flights")
+        
+        for flight_idx, flight in enumerate(self.flights):
+            if report_progress:
+                progress.tick("cp_prepare_flights", flight_idx, len(self.flights))
             
-        for flight in flight_iter:
             # Convert parsed_time to minutes since reference point
             minutes = self._datetime_to_minutes(flight.parsed_time)
             
@@ -268,6 +538,8 @@ class StandAllocationCPSolver:
                 "turnaround_minutes": turnaround_minutes,
                 "airline": airline
             })
+        
+        progress.phase_end("cp_prepare_flights", done=len(self.flights))
     
     def _get_aircraft_category(self, aircraft_type):
         """
@@ -327,22 +599,1136 @@ class StandAllocationCPSolver:
                         if end_minutes <= start_minutes:
                             end_minutes += 24 * 60  # Add a day
                     
+                    # Maintenance that ends before the model's time range cannot affect it
+                    if end_minutes <= 0:
+                        continue
+                    
                     maintenance_intervals.append((stand_idx, start_minutes, end_minutes))
         
         return maintenance_intervals
     
-    def solve(self):
+    def _get_fixed_intervals(self, fixed_occupancy):
+        """
+        Convert fixed stand occupancy to intervals in model minutes, grouped by stand
+        
+        Intervals that end (gap included) before the start of the model's time range
+        cannot overlap any flight in the model and are left out.
+        
+        Parameters:
+        - fixed_occupancy: List of (StandName, start_datetime, end_datetime) tuples
+        
+        Returns:
+        - Dict of stand_idx -> list of (start_minutes, end_minutes)
+        """
+        fixed_intervals = {}
+        
+        for stand_name, start_time, end_time in fixed_occupancy:
+            if stand_name not in self.stand_indices:
+                continue
+            
+            start_minutes = self._datetime_to_minutes(start_time)
+            end_minutes = self._datetime_to_minutes(end_time)
+            if end_minutes + self.settings.GapBetweenFlights <= 0 or end_minutes <= start_minutes:
+                continue
+            
+            fixed_intervals.setdefault(self.stand_indices[stand_name], []).append((start_minutes, end_minutes))
+        
+        return fixed_intervals
+    
+    def _find_interchangeable_stands(self):
+        """
+        Find groups of stands that any solution can swap without changing its feasibility or objective
+        
+        Stands are interchangeable if they have the same terminal, size limit and contact status
+        (so the same flights are compatible with them) and none of them has maintenance,
+        fixed occupancy or adjacency rules.
+        
+        Returns:
+        - List of lists of stand indices (each with at least two stands, in index order)
+        """
+        maintenance_stands = {stand_idx for stand_idx, _, _ in self._get_maintenance_intervals()}
+        adjacency_stands = set()
+        for stand in self.stands:
+            if stand.AdjacencyRules:
+                adjacency_stands.add(stand.StandName)
+                for stand_names in stand.AdjacencyRules.values():
+                    adjacency_stands.update(stand_names)
+        
+        classes = {}
+        for stand_idx, stand in enumerate(self.stands):
+            if stand_idx in maintenance_stands or stand_idx in self.fixed_intervals:
+                continue
+            if stand.StandName in adjacency_stands:
+                continue
+            key = (stand.Terminal, stand.SizeLimit, stand.IsContactStand)
+            classes.setdefault(key, []).append(stand_idx)
+        
+        return [stand_indices for stand_indices in classes.values() if len(stand_indices) > 1]
+    
+    def _symmetry_flight_order(self, stand_class):
+        """
+        Get the flights that may use a class of interchangeable stands, in the order used to break symmetry
+        
+        Parameters:
+        - stand_class: List of stand indices
+        
+        Returns:
+        - List of flight indices, sorted by scheduled time
+        """
+        class_flights = [
+            flight_idx for flight_idx, flight_data in enumerate(self.flights_data)
+            if stand_class[0] in flight_data["compatible_stands"]
+        ]
+        return sorted(class_flights, key=lambda flight_idx: (self.flights_data[flight_idx]["minutes"], flight_idx))
+    
+    def _add_symmetry_breaking(self, model, flight_uses_stand_vars, hint):
+        """
+        Break the symmetry between interchangeable stands
+        
+        Within each class, stands must be taken into use in order: the first flight (in
+        scheduled order) on a stand must come before the first flight on the next stand,
+        and unused stands come last. Every solution has exactly one such relabelling of
+        its stands, so no allocation is lost.
+        
+        Parameters:
+        - model: cp_model.CpModel object
+        - flight_uses_stand_vars: Dict of (flight_idx, stand_idx) -> Boolean variable
+        - hint: Hint values from _build_hint_values, or None
+        """
+        for stand_class in self.interchangeable_stand_classes:
+            class_flights = self._symmetry_flight_order(stand_class)
+            if len(class_flights) < 2:
+                continue
+            
+            unused_position = len(class_flights)
+            first_use_vars = []
+            for stand_idx in stand_class:
+                # Position of the first flight on the stand, or unused_position if the stand is unused
+                first_use = model.NewIntVar(0, unused_position, f'first_use_{stand_idx}')
+                model.AddMinEquality(first_use, [
+                    unused_position - (unused_position - position) * flight_uses_stand_vars[(flight_idx, stand_idx)]
+                    for position, flight_idx in enumerate(class_flights)
+                ])
+                if hint:
+                    model.AddHint(first_use, next(
+                        (position for position, flight_idx in enumerate(class_flights)
+                         if hint["stand"][flight_idx] == stand_idx),
+                        unused_position
+                    ))
+                first_use_vars.append(first_use)
+            
+            # A flight uses one stand, so the first-use positions of used stands are distinct
+            for first_use, next_first_use in zip(first_use_vars, first_use_vars[1:]):
+                model.Add(first_use <= next_first_use)
+        
+        logger.info("Added symmetry breaking for %d classes of interchangeable stands (%d stands)",
+                    len(self.interchangeable_stand_classes),
+                    sum(len(stand_class) for stand_class in self.interchangeable_stand_classes))
+    
+    def _canonical_stand_mapping(self, stand_of_flight):
+        """
+        Relabel interchangeable stands in an allocation so it satisfies the symmetry breaking
+        
+        Parameters:
+        - stand_of_flight: Dict of flight_idx -> stand_idx
+        
+        Returns:
+        - Dict of stand_idx -> stand_idx to apply to the allocation
+        """
+        mapping = {}
+        for stand_class in self.interchangeable_stand_classes:
+            next_stands = iter(stand_class)
+            for flight_idx in self._symmetry_flight_order(stand_class):
+                stand_idx = stand_of_flight.get(flight_idx)
+                if stand_idx in stand_class and stand_idx not in mapping:
+                    mapping[stand_idx] = next(next_stands)
+            
+            # Unused stands of the class fill the remaining labels
+            for stand_idx in stand_class:
+                if stand_idx not in mapping:
+                    mapping[stand_idx] = next(next_stands)
+        return mapping
+    
+    def _configure_solver(self, solver, num_intervals):
+        """
+        Apply the configured solver profile to a CP-SAT solver
+        
+        Parameters:
+        - solver: cp_model.CpSolver object
+        - num_intervals: Number of optional interval variables in the model
+        """
+        profile = resolve_solver_profile(self.settings.solver_parameters, len(self.flights), num_intervals,
+                                         available_cores=self.available_cores)
+        
+        solver.parameters.num_workers = profile["num_workers"]
+        solver.parameters.use_lns = profile["use_lns"]
+        solver.parameters.linearization_level = profile["linearization_level"]
+        if profile["full_subsolvers"] is not None:
+            solver.parameters.num_full_subsolvers = profile["full_subsolvers"]
+        if profile["max_memory_in_mb"] is not None:
+            solver.parameters.max_memory_in_mb = profile["max_memory_in_mb"]
+        
+        self.solver_profile = profile
+        
+        logger.info("Solver profile '%s': %d workers, LNS %s, linearization level %d, memory limit %s MB",
+                    profile["profile"], profile["num_workers"], "on" if profile["use_lns"] else "off",
+                    profile["linearization_level"], profile["max_memory_in_mb"])
+        if self.verbose:
+            print(f"Using solver profile '{profile['profile']}' with {profile['num_workers']} search workers")
+    
+    def _flight_weight(self, flight):
+        """
+        Objective weight of allocating a flight (criticality score scaled to an integer)
+        
+        Parameters:
+        - flight: Flight object
+        
+        Returns:
+        - Positive integer weight
+        """
+        return int(flight.criticality_score * 100) + 1  # ensure positive weight
+    
+    def _linked_partner(self, flight):
+        """
+        Get the other flight of a linked arrival/departure pair
+        
+        Parameters:
+        - flight: Flight object
+        
+        Returns:
+        - The partner Flight object, or None if the flight is not part of a complete pair
+        """
+        linked_flights = self.link_id_to_flights.get(flight.LinkID, []) if flight.LinkID else []
+        if len(linked_flights) != 2:
+            return None
+        return next((f for f in linked_flights if f.IsArrival != flight.IsArrival), None)
+    
+    def _solution_occupancy_minutes(self, flight_idx, start_minutes, end_minutes):
+        """
+        Trim a solved flight interval to the stand time the flight actually needs
+        
+        End times of arrivals and start times of departures are only bounded from one side
+        in the model, so the solver may return longer intervals than needed. Shrinking an
+        interval never creates an overlap, so the trimmed interval is still feasible.
+        
+        Parameters:
+        - flight_idx: Index of the flight in flights_data
+        - start_minutes: Solved start of the flight's interval
+        - end_minutes: Solved end of the flight's interval
+        
+        Returns:
+        - Tuple of (start_minutes, end_minutes)
+        """
+        flight_data = self.flights_data[flight_idx]
+        flight = flight_data["flight"]
+        partner = self._linked_partner(flight)
+        if partner is not None:
+            partner_minutes = self.flights_data[self.flight_indices[partner.FlightID]]["minutes"]
+        
+        if flight.IsArrival:
+            latest_end = partner_minutes if partner is not None else start_minutes + flight_data["turnaround_minutes"]
+            end_minutes = max(start_minutes + 1, min(end_minutes, latest_end))
+        else:
+            earliest_start = partner_minutes if partner is not None else end_minutes - flight_data["turnaround_minutes"]
+            start_minutes = min(end_minutes - 1, max(start_minutes, earliest_start))
+        
+        return start_minutes, end_minutes
+    
+    def _hint_occupancy_minutes(self, flight_idx, hint_allocation):
+        """
+        Work out the interval a hinted flight would have in the CP model
+        
+        The arrival and departure of a linked pair have separate intervals on the stand,
+        so the pair's occupancy is split in two with the gap between flights in between.
+        
+        Parameters:
+        - flight_idx: Index of the flight in flights_data
+        - hint_allocation: Dict of FlightID -> StandName
+        
+        Returns:
+        - Tuple of (start_minutes, end_minutes), or None if the hinted allocation
+          is not representable in the CP model (e.g. an overnight legacy-format pair)
+        """
+        flight_data = self.flights_data[flight_idx]
+        flight = flight_data["flight"]
+        scheduled_minutes = flight_data["minutes"]
+        
+        partner = self._linked_partner(flight)
+        if partner is not None:
+            # Linked pairs must share a stand and occupy it from arrival to departure
+            if hint_allocation.get(partner.FlightID) != hint_allocation.get(flight.FlightID):
+                return None
+            partner_minutes = self.flights_data[self.flight_indices[partner.FlightID]]["minutes"]
+            if flight.IsArrival:
+                start_minutes = scheduled_minutes
+                end_minutes = partner_minutes - self.settings.GapBetweenFlights - 1
+            else:
+                start_minutes, end_minutes = scheduled_minutes - 1, scheduled_minutes
+                if start_minutes - self.settings.GapBetweenFlights - 1 < partner_minutes:
+                    return None
+        elif flight.IsArrival:
+            start_minutes = scheduled_minutes
+            end_minutes = scheduled_minutes + flight_data["turnaround_minutes"]
+        else:
+            start_minutes = scheduled_minutes - flight_data["turnaround_minutes"]
+            end_minutes = scheduled_minutes
+        
+        if start_minutes < 0 or end_minutes <= start_minutes:
+            return None
+        if end_minutes - start_minutes > self.time_horizon:
+            return None
+        
+        return start_minutes, end_minutes
+    
+    def _usable_hint(self, hint_allocation):
+        """
+        Filter a hinted allocation down to the flights the CP model can accept as-is
+        
+        Parameters:
+        - hint_allocation: Dict of FlightID -> StandName
+        
+        Returns:
+        - Dict of flight_idx -> (stand_idx, start_minutes, end_minutes)
+        """
+        usable = {}
+        for flight_idx, flight_data in enumerate(self.flights_data):
+            stand_name = hint_allocation.get(flight_data["flight"].FlightID)
+            stand_idx = self.stand_indices.get(stand_name)
+            if stand_idx is None or stand_idx not in flight_data["compatible_stands"]:
+                continue
+            
+            occupancy = self._hint_occupancy_minutes(flight_idx, hint_allocation)
+            if occupancy is None:
+                continue
+            
+            usable[flight_idx] = (stand_idx, occupancy[0], occupancy[1])
+        
+        # A linked pair is only usable if both flights are
+        for flight_idx in list(usable):
+            flight = self.flights_data[flight_idx]["flight"]
+            linked_flights = self.link_id_to_flights.get(flight.LinkID, []) if flight.LinkID else []
+            if len(linked_flights) == 2 and any(
+                self.flight_indices[f.FlightID] not in usable for f in linked_flights
+            ):
+                del usable[flight_idx]
+        
+        return usable
+    
+    def _hint_is_feasible(self, usable_hint):
+        """
+        Check that the usable part of a hinted allocation satisfies the model's stand constraints
+        
+        _usable_hint only checks each flight on its own, so a hint can still overlap other
+        hinted flights, fixed occupancy or maintenance (e.g. after a disruption).
+        
+        Parameters:
+        - usable_hint: Dict of flight_idx -> (stand_idx, start_minutes, end_minutes) from _usable_hint
+        
+        Returns:
+        - Boolean indicating if the hinted flights can all keep their stand and interval
+        """
+        gap = self.settings.GapBetweenFlights
+        
+        # Flights and fixed occupancy are followed by the gap between flights, maintenance is not
+        stand_intervals = {}
+        for stand_idx, start_minutes, end_minutes in usable_hint.values():
+            stand_intervals.setdefault(stand_idx, []).append((start_minutes, end_minutes + gap))
+        for stand_idx, intervals in self.fixed_intervals.items():
+            for start_minutes, end_minutes in intervals:
+                stand_intervals.setdefault(stand_idx, []).append((start_minutes, end_minutes + gap))
+        
+        for intervals in stand_intervals.values():
+            intervals.sort()
+            if any(next_start < end for (_, end), (next_start, _) in zip(intervals, intervals[1:])):
+                return False
+        
+        for maint_stand_idx, maint_start, maint_end in self._get_maintenance_intervals():
+            for stand_idx, start_minutes, end_minutes in usable_hint.values():
+                if stand_idx == maint_stand_idx and start_minutes < maint_end and maint_start < end_minutes:
+                    return False
+        
+        return True
+    
+    def _build_hint_values(self, hint_allocation, relabel_stands=True):
+        """
+        Build a complete, feasible assignment of the model's decision values from a hinted allocation
+        
+        Flights the model cannot accept as hinted are hinted as unallocated. The hinted flights
+        may still overlap each other, fixed occupancy or maintenance, e.g. after a disruption.
+        
+        Parameters:
+        - hint_allocation: Dict of FlightID -> StandName
+        - relabel_stands: Whether to relabel interchangeable stands for the symmetry breaking
+        
+        Returns:
+        - Dict of per-flight lists ("stand", "allocated", "start", "end", "duration"),
+          the hinted "objective" value and whether the hint is "feasible"
+        """
+        usable_hint = self._usable_hint(hint_allocation)
+        feasible = self._hint_is_feasible(usable_hint)
+        if not feasible:
+            # The model lets other flights use a stand between the arrival and departure of a
+            # linked pair, so an allocation found by the model may only fit with the shortest intervals
+            shortest_hint = {
+                flight_idx: (stand_idx,) + self._minimal_occupancy_minutes(flight_idx)
+                for flight_idx, (stand_idx, _, _) in usable_hint.items()
+            }
+            if self._hint_is_feasible(shortest_hint):
+                usable_hint, feasible = shortest_hint, True
+        
+        # Swapping interchangeable stands keeps the hint feasible, so relabel them to
+        # satisfy the symmetry breaking constraints
+        stand_mapping = self._canonical_stand_mapping(
+            {flight_idx: hinted[0] for flight_idx, hinted in usable_hint.items()}
+        ) if relabel_stands else {}
+        usable_hint = {
+            flight_idx: (stand_mapping.get(stand_idx, stand_idx), start_minutes, end_minutes)
+            for flight_idx, (stand_idx, start_minutes, end_minutes) in usable_hint.items()
+        }
+        
+        hint = {"stand": [], "allocated": [], "start": [], "end": [], "duration": [], "objective": 0,
+                "feasible": feasible}
+        
+        for flight_idx, flight_data in enumerate(self.flights_data):
+            hinted = usable_hint.get(flight_idx)
+            scheduled_minutes = flight_data["minutes"]
+            
+            if hinted:
+                stand_idx, start_minutes, end_minutes = hinted
+                hint["objective"] += self._flight_weight(flight_data["flight"])
+            else:
+                stand_idx = self.UNALLOCATED_STAND
+                # Any value in the variable's domain will do for an unallocated flight
+                if flight_data["flight"].IsArrival:
+                    start_minutes = scheduled_minutes
+                    end_minutes = scheduled_minutes + flight_data["turnaround_minutes"]
+                else:
+                    start_minutes = max(0, scheduled_minutes - flight_data["turnaround_minutes"])
+                    end_minutes = scheduled_minutes
+            
+            hint["stand"].append(stand_idx)
+            hint["allocated"].append(hinted is not None)
+            hint["start"].append(start_minutes)
+            hint["end"].append(end_minutes)
+            hint["duration"].append(max(1, end_minutes - start_minutes))
+        
+        return hint
+    
+    def find_independent_components(self):
+        """
+        Split the flights into groups that cannot affect each other's allocation
+        
+        Two flights are connected if they share a compatible stand or form a linked pair.
+        Terminal and aircraft size filtering usually leave several such groups (e.g. one per
+        terminal), each of which can be solved as a separate, smaller model.
+        
+        Returns:
+        - List of lists of flight indices, largest component first
+        """
+        parent = list(range(len(self.flights_data)))
+        
+        def find(idx):
+            while parent[idx] != idx:
+                parent[idx] = parent[parent[idx]]
+                idx = parent[idx]
+            return idx
+        
+        def union(idx_a, idx_b):
+            root_a, root_b = find(idx_a), find(idx_b)
+            if root_a != root_b:
+                parent[root_b] = root_a
+        
+        # Connect all flights that may use the same stand
+        first_flight_on_stand = {}
+        for flight_idx, flight_data in enumerate(self.flights_data):
+            for stand_idx in flight_data["compatible_stands"]:
+                if stand_idx in first_flight_on_stand:
+                    union(first_flight_on_stand[stand_idx], flight_idx)
+                else:
+                    first_flight_on_stand[stand_idx] = flight_idx
+        
+        # Keep linked pairs together
+        for linked_flights in self.link_id_to_flights.values():
+            for flight in linked_flights[1:]:
+                union(self.flight_indices[linked_flights[0].FlightID], self.flight_indices[flight.FlightID])
+        
+        components = {}
+        for flight_idx in range(len(self.flights_data)):
+            components.setdefault(find(flight_idx), []).append(flight_idx)
+        
+        return sorted(components.values(), key=len, reverse=True)
+    
+    def _no_candidate_reason(self, flight_data):
+        """
+        Explain why a flight has no compatible stand
+        
+        Parameters:
+        - flight_data: Entry of flights_data with no compatible stands
+        
+        Returns:
+        - String reason for the unallocated report
+        """
+        airline = flight_data["airline"]
+        requirements = [f"{flight_data['aircraft_category']} aircraft"]
+        if airline:
+            requirements.append(f"terminal {airline.BaseTerminal}")
+            if airline.RequiresContactStand:
+                requirements.append("contact stand required")
+        return f"No compatible stand ({', '.join(requirements)})"
+    
+    def _minimal_occupancy_minutes(self, flight_idx):
+        """
+        Get the shortest interval a flight can have on a stand in the model
+        
+        Single flights need their turnaround time; flights with a LinkID have no
+        turnaround constraint in the model and need a single minute.
+        
+        Parameters:
+        - flight_idx: Index of the flight in flights_data
+        
+        Returns:
+        - Tuple of (start_minutes, end_minutes)
+        """
+        flight_data = self.flights_data[flight_idx]
+        flight = flight_data["flight"]
+        duration = 1 if flight.LinkID else flight_data["turnaround_minutes"]
+        if flight.IsArrival:
+            return flight_data["minutes"], flight_data["minutes"] + duration
+        return flight_data["minutes"] - duration, flight_data["minutes"]
+    
+    def _fixed_report_minutes(self, flight_idx, start_minutes, end_minutes):
+        """
+        Get the interval to report for a flight fixed by the presolve reduction
+        
+        The fixed interval of a linked pair is split as in a hint (see _hint_occupancy_minutes),
+        but the report uses the times the CP model gives a pair: the arrival keeps its shortest
+        interval and the departure starts the gap after it, so fixed and solved flights read the same.
+        
+        Parameters:
+        - flight_idx: Index of the flight in flights_data
+        - start_minutes: Start of the fixed interval
+        - end_minutes: End of the fixed interval
+        
+        Returns:
+        - Tuple of (start_minutes, end_minutes)
+        """
+        flight = self.flights_data[flight_idx]["flight"]
+        partner = self._linked_partner(flight)
+        if partner is None:
+            return start_minutes, end_minutes
+        if flight.IsArrival:
+            return self._minimal_occupancy_minutes(flight_idx)
+        _, arrival_end = self._minimal_occupancy_minutes(self.flight_indices[partner.FlightID])
+        return arrival_end + self.settings.GapBetweenFlights, end_minutes
+    
+    def reduce_problem(self):
+        """
+        Presolve reduction: take the flights that need no search out of the CP model
+        
+        - Flights with no compatible stand go straight to the unallocated report with the reason,
+          together with their linked partner (linked pairs are allocated together or not at all).
+        - A flight (or linked pair) is fixed to a stand if, on that stand, its interval cannot
+          overlap (gap included) the shortest possible interval of any other flight, maintenance,
+          fixed occupancy or flight fixed earlier. Any solution can shrink the other flights'
+          intervals and move the fixed flight onto that stand without losing an allocation, so
+          fixing it never makes the result worse.
+        - Stands that no remaining flight can use are left out of the core model.
+        
+        Returns:
+        - Dict with "fixed" (flight_idx -> (stand_idx, start_minutes, end_minutes)),
+          "no_candidates" (flight_idx -> reason), "core" (list of flight indices)
+          and "core_stands" (list of stand indices)
+        """
+        gap = self.settings.GapBetweenFlights
+        no_candidates = {}
+        for flight_idx, flight_data in enumerate(self.flights_data):
+            if flight_data["compatible_stands"]:
+                continue
+            no_candidates[flight_idx] = self._no_candidate_reason(flight_data)
+            partner = self._linked_partner(flight_data["flight"])
+            if partner is not None:
+                partner_idx = self.flight_indices[partner.FlightID]
+                no_candidates.setdefault(partner_idx, f"Linked flight {flight_data['flight'].FlightID} has no compatible stand")
+        
+        # Shortest intervals of all flights on each stand, sorted by start
+        stand_items = {}
+        for flight_idx, flight_data in enumerate(self.flights_data):
+            start_minutes, end_minutes = self._minimal_occupancy_minutes(flight_idx)
+            for stand_idx in flight_data["compatible_stands"]:
+                stand_items.setdefault(stand_idx, []).append((start_minutes, end_minutes, flight_idx))
+        for items in stand_items.values():
+            items.sort()
+        stand_item_starts = {stand_idx: [item[0] for item in items] for stand_idx, items in stand_items.items()}
+        longest_item = max(
+            (end_minutes - start_minutes for items in stand_items.values() for start_minutes, end_minutes, _ in items),
+            default=0
+        )
+        
+        # Stand time that is taken regardless of the allocation (maintenance has no gap in the model)
+        blocked = {}
+        for stand_idx, start_minutes, end_minutes in self._get_maintenance_intervals():
+            blocked.setdefault(stand_idx, []).append((start_minutes, end_minutes, 0))
+        for stand_idx, intervals in self.fixed_intervals.items():
+            for start_minutes, end_minutes in intervals:
+                blocked.setdefault(stand_idx, []).append((start_minutes, end_minutes, gap))
+        
+        fixed = {}
+        handled = set(no_candidates)
+        for flight_idx, flight_data in enumerate(self.flights_data):
+            if flight_idx in handled:
+                continue
+            
+            # Linked pairs are fixed together, to the same stand
+            partner = self._linked_partner(flight_data["flight"])
+            unit = [flight_idx] if partner is None else [flight_idx, self.flight_indices[partner.FlightID]]
+            handled.update(unit)
+            
+            candidate_stands = [
+                stand_idx for stand_idx in flight_data["compatible_stands"]
+                if all(stand_idx in self.flights_data[idx]["compatible_stands"] for idx in unit)
+            ]
+            for stand_idx in candidate_stands:
+                hint_allocation = {self.flights_data[idx]["flight"].FlightID: self.stands[stand_idx].StandName for idx in unit}
+                occupancy = [self._hint_occupancy_minutes(idx, hint_allocation) for idx in unit]
+                if None in occupancy:
+                    break
+                unit_start = min(start_minutes for start_minutes, _ in occupancy)
+                unit_end = max(end_minutes for _, end_minutes in occupancy)
+                
+                # Other flights' shortest intervals that could overlap the unit
+                items = stand_items[stand_idx]
+                first = bisect.bisect_left(stand_item_starts[stand_idx], unit_start - longest_item - gap)
+                last = bisect.bisect_left(stand_item_starts[stand_idx], unit_end + gap)
+                if any(
+                    other_idx not in unit and start_minutes < unit_end + gap and unit_start < end_minutes + gap
+                    for start_minutes, end_minutes, other_idx in items[first:last]
+                ):
+                    continue
+                if any(
+                    start_minutes < unit_end + blocked_gap and unit_start < end_minutes + blocked_gap
+                    for start_minutes, end_minutes, blocked_gap in blocked.get(stand_idx, [])
+                ):
+                    continue
+                
+                for idx, (start_minutes, end_minutes) in zip(unit, occupancy):
+                    fixed[idx] = (stand_idx, start_minutes, end_minutes)
+                blocked.setdefault(stand_idx, []).append((unit_start, unit_end, gap))
+                break
+        
+        core = [
+            flight_idx for flight_idx in range(len(self.flights_data))
+            if flight_idx not in fixed and flight_idx not in no_candidates
+        ]
+        core_stands = sorted({
+            stand_idx for flight_idx in core for stand_idx in self.flights_data[flight_idx]["compatible_stands"]
+        })
+        
+        logger.info("Presolve reduction: %d flights fixed, %d without a compatible stand, "
+                    "%d flights and %d of %d stands left for the CP model",
+                    len(fixed), len(no_candidates), len(core), len(core_stands), len(self.stands))
+        
+        return {"fixed": fixed, "no_candidates": no_candidates, "core": core, "core_stands": core_stands}
+    
+    def solve_reduced(self, time_limit=None, log_unallocated=True):
+        """
+        Apply the presolve reduction and solve only the contended core with the CP model
+        
+        Parameters:
+        - time_limit: Optional time limit in seconds (defaults to "solver_time_limit_seconds")
+        - log_unallocated: Whether to pass unallocated flights to the AI support module
+        
+        Returns:
+        - Tuple of (allocated_flights_report, unallocated_flights_report)
+        """
+        reduction = self.reduce_problem()
+        if self.verbose:
+            print(f"Presolve reduction: {len(reduction['fixed'])} flights fixed, "
+                  f"{len(reduction['no_candidates'])} without a compatible stand, "
+                  f"{len(reduction['core'])} flights left for the CP model")
+        
+        allocations = {}
+        reasons = {}
+        self.solution_occupancy = {}
+        
+        for flight_idx, (stand_idx, start_minutes, end_minutes) in reduction["fixed"].items():
+            flight = self.flights_data[flight_idx]["flight"]
+            report_start, report_end = self._fixed_report_minutes(flight_idx, start_minutes, end_minutes)
+            allocations[flight.FlightID] = (
+                self.stands[stand_idx],
+                self._format_report_time(flight, report_start),
+                self._format_report_time(flight, report_end)
+            )
+            self.solution_occupancy[flight.FlightID] = (
+                self.stands[stand_idx].StandName,
+                self._minutes_to_datetime(start_minutes),
+                self._minutes_to_datetime(end_minutes)
+            )
+        
+        for flight_idx, reason in reduction["no_candidates"].items():
+            reasons[self.flights_data[flight_idx]["flight"].FlightID] = reason
+        
+        if reduction["core"]:
+            # The fixed flights cannot conflict with the core, but keep the core's intervals clear of them
+            core_solver = StandAllocationCPSolver(
+                [self.flights_data[flight_idx]["flight"] for flight_idx in reduction["core"]],
+                [self.stands[stand_idx] for stand_idx in reduction["core_stands"]],
+                self.airlines, self.settings, self.maintenance_tracker, self.ai_support,
+                verbose=self.verbose,
+                fixed_occupancy=self.fixed_occupancy + list(self.solution_occupancy.values()),
+                metrics=self.metrics, progress=self.progress
+            )
+            core_solver.available_cores = self.available_cores
+            core_allocated, core_unallocated = core_solver.solve(time_limit=time_limit, log_unallocated=False)
+            self.solve_stats = core_solver.solve_stats
+            self.solve_report = core_solver.solve_report
+            self.solver_profile = core_solver.solver_profile
+            
+            if not core_allocated and not core_unallocated:
+                return [], []  # No solution, trigger fallback to greedy algorithm
+            
+            for allocation in core_allocated:
+                allocations[allocation['flight'].FlightID] = (
+                    allocation['stand'], allocation['start_time'], allocation['end_time']
+                )
+            for unallocation in core_unallocated:
+                reasons[unallocation['flight'].FlightID] = unallocation['reason']
+            self.solution_occupancy.update(core_solver.solution_occupancy)
+        
+        allocated_flights_report = []
+        unallocated_flights_report = []
+        for flight_data in self.flights_data:
+            flight = flight_data["flight"]
+            if flight.FlightID in allocations:
+                stand, start_time_str, end_time_str = allocations[flight.FlightID]
+                allocated_flights_report.append({
+                    'flight': flight,
+                    'stand': stand,
+                    'start_time': start_time_str,
+                    'end_time': end_time_str
+                })
+            else:
+                reason = reasons[flight.FlightID]
+                if log_unallocated:
+                    self.ai_support.log_unallocated_flight(flight, reason)
+                unallocated_flights_report.append({
+                    'flight': flight,
+                    'reason': reason
+                })
+        
+        return allocated_flights_report, unallocated_flights_report
+    
+    def _record_model_metrics(self, model):
+        """
+        Record the size of a built CP model in self.metrics
+        
+        Parameters:
+        - model: CpModel object
+        """
+        proto = model.Proto()
+        constraints = proto.constraints
+        # Newer OR-Tools releases wrap the proto with has_<field>() methods instead of HasField()
+        if len(constraints) and hasattr(constraints[0], "has_interval"):
+            num_intervals = sum(1 for constraint in constraints if constraint.has_interval())
+        else:
+            num_intervals = sum(1 for constraint in constraints if constraint.HasField("interval"))
+        
+        self.metrics.set("cp_model_flights", len(self.flights_data))
+        self.metrics.set("cp_model_variables", len(proto.variables))
+        self.metrics.set("cp_model_constraints", len(constraints))
+        self.metrics.set("cp_model_intervals", num_intervals)
+    
+    def _relative_gap(self, objective, bound):
+        """
+        Relative gap between a solution and the objective bound (0 means proven optimal)
+        """
+        return abs(bound - objective) / max(1.0, abs(objective))
+    
+    def _build_incumbent(self, callback, flight_stand_vars, flight_allocated_vars):
+        """
+        Read an improving solution from the solution callback
+        
+        Parameters:
+        - callback: SolutionCallback positioned on the solution
+        - flight_stand_vars: Dict of flight_idx -> stand variable
+        - flight_allocated_vars: Dict of flight_idx -> "flight is allocated" Boolean variable
+        
+        Returns:
+        - Dict with "solution" (number), "time" (seconds since the search started), "objective",
+          "bound", "gap" (relative) and "allocation" (FlightID -> StandName for allocated flights)
+        """
+        objective = callback.ObjectiveValue()
+        bound = callback.BestObjectiveBound()
+        allocation = {}
+        for flight_idx, flight_data in enumerate(self.flights_data):
+            if callback.Value(flight_allocated_vars[flight_idx]):
+                allocation[flight_data["flight"].FlightID] = self.stands[callback.Value(flight_stand_vars[flight_idx])].StandName
+        
+        return {
+            "solution": callback.solution_count(),
+            "time": callback.elapsed_time(),
+            "objective": objective,
+            "bound": bound,
+            "gap": self._relative_gap(objective, bound),
+            "allocation": allocation,
+        }
+    
+    def solve_anytime(self, time_limit=None, cancel_event=None, **solve_kwargs):
+        """
+        Solve in a background thread and yield improving solutions as they are found
+        
+        The generator finishes when the search stops (time limit, optimality gap reached or
+        cancel_event set). The final reports are then available in self.last_result. An
+        exception raised by solve() is raised again by the generator. Closing the generator
+        early (e.g. breaking out of the loop) stops the search and waits for it to end.
+        
+        Parameters:
+        - time_limit: Optional time limit in seconds (defaults to "solver_time_limit_seconds")
+        - cancel_event: Optional threading.Event to stop the search early
+        - solve_kwargs: Other keyword arguments for solve()
+        
+        Yields:
+        - Incumbent dicts (see _build_incumbent)
+        """
+        incumbents = queue.Queue()
+        finished = object()
+        errors = []
+        self.last_result = None
+        if cancel_event is None:
+            cancel_event = threading.Event()
+        
+        def run():
+            try:
+                self.last_result = self.solve(time_limit=time_limit, on_incumbent=incumbents.put,
+                                              cancel_event=cancel_event, **solve_kwargs)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                incumbents.put(finished)
+        
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+        
+        search_ended = False
+        try:
+            while True:
+                incumbent = incumbents.get()
+                if incumbent is finished:
+                    search_ended = True
+                    break
+                yield incumbent
+        finally:
+            # The caller stopped early, so stop the search instead of letting it run to the time limit
+            if not search_ended:
+                cancel_event.set()
+            worker.join()
+        
+        if errors:
+            raise errors[0]
+    
+    def repair(self, current_allocation, window_start, window_end, current_occupancy=None,
+               time_limit=None, log_unallocated=True):
+        """
+        Re-optimize an existing allocation around a disrupted time window (large neighbourhood repair)
+        
+        The neighbourhood is every flight scheduled in the window or occupying a stand during it,
+        plus flights whose current stand is no longer compatible, together with their linked
+        partners. Only these flights are modelled, on the stands they can use; all other allocated
+        flights keep their stand and are fixed occupancy in the model. Fixed flights keep their
+        interval from current_occupancy if given, otherwise they take their shortest interval,
+        which any allocation found by the CP model leaves free of overlaps.
+        
+        Parameters:
+        - current_allocation: Dict of FlightID -> StandName of the existing allocation
+        - window_start: Start of the disrupted window (datetime)
+        - window_end: End of the disrupted window (datetime)
+        - current_occupancy: Optional dict of FlightID -> (StandName, start_datetime, end_datetime)
+          of the existing allocation, e.g. solution_occupancy of the solver that produced it
+        - time_limit: Optional time limit in seconds (defaults to "solver_time_limit_seconds")
+        - log_unallocated: Whether to pass unallocated flights to the AI support module
+        
+        Returns:
+        - Tuple of (allocated_flights_report, unallocated_flights_report) for all flights
+        """
+        window_start_minutes = self._datetime_to_minutes(window_start)
+        window_end_minutes = self._datetime_to_minutes(window_end)
+        
+        current_occupancy = current_occupancy or {}
+        current_stands = {}
+        for flight_idx, flight_data in enumerate(self.flights_data):
+            stand_idx = self.stand_indices.get(current_allocation.get(flight_data["flight"].FlightID))
+            if stand_idx is not None:
+                current_stands[flight_idx] = stand_idx
+        
+        neighbourhood = set()
+        for flight_idx, flight_data in enumerate(self.flights_data):
+            in_window = window_start_minutes <= flight_data["minutes"] <= window_end_minutes
+            if flight_idx in current_stands:
+                start_minutes, end_minutes = self._minimal_occupancy_minutes(flight_idx)
+                if start_minutes < window_end_minutes and window_start_minutes < end_minutes:
+                    in_window = True
+                elif current_stands[flight_idx] not in flight_data["compatible_stands"]:
+                    in_window = True
+            if in_window:
+                neighbourhood.add(flight_idx)
+                partner = self._linked_partner(flight_data["flight"])
+                if partner is not None:
+                    neighbourhood.add(self.flight_indices[partner.FlightID])
+        
+        neighbourhood_flights = sorted(neighbourhood)
+        neighbourhood_stands = sorted({
+            stand_idx for flight_idx in neighbourhood_flights
+            for stand_idx in self.flights_data[flight_idx]["compatible_stands"]
+        })
+        neighbourhood_stand_set = set(neighbourhood_stands)
+        
+        # Everything outside the neighbourhood keeps its allocation
+        allocations = {}
+        self.solution_occupancy = {}
+        fixed_occupancy = list(self.fixed_occupancy)
+        for flight_idx, stand_idx in current_stands.items():
+            if flight_idx in neighbourhood:
+                continue
+            flight = self.flights_data[flight_idx]["flight"]
+            stand_name = self.stands[stand_idx].StandName
+            occupancy = current_occupancy.get(flight.FlightID)
+            if occupancy is not None and occupancy[0] == stand_name:
+                fixed_start, fixed_end = occupancy[1], occupancy[2]
+                report_occupancy = (self._datetime_to_minutes(fixed_start), self._datetime_to_minutes(fixed_end))
+            else:
+                start_minutes, end_minutes = self._minimal_occupancy_minutes(flight_idx)
+                fixed_start, fixed_end = self._minutes_to_datetime(start_minutes), self._minutes_to_datetime(end_minutes)
+                report_occupancy = self._hint_occupancy_minutes(flight_idx, current_allocation) or (start_minutes, end_minutes)
+            allocations[flight.FlightID] = (
+                self.stands[stand_idx],
+                self._format_report_time(flight, report_occupancy[0]),
+                self._format_report_time(flight, report_occupancy[1])
+            )
+            self.solution_occupancy[flight.FlightID] = (stand_name, fixed_start, fixed_end)
+            if stand_idx in neighbourhood_stand_set:
+                fixed_occupancy.append((stand_name, fixed_start, fixed_end))
+        
+        logger.info("Repairing %d of %d flights on %d stands (%d fixed intervals)",
+                    len(neighbourhood_flights), len(self.flights), len(neighbourhood_stands), len(fixed_occupancy))
+        if self.verbose:
+            print(f"Repairing {len(neighbourhood_flights)} flights on {len(neighbourhood_stands)} stands "
+                  f"between {window_start} and {window_end}...")
+        
+        reasons = {}
+        if neighbourhood_flights:
+            repair_solver = StandAllocationCPSolver(
+                [self.flights_data[flight_idx]["flight"] for flight_idx in neighbourhood_flights],
+                [self.stands[stand_idx] for stand_idx in neighbourhood_stands],
+                self.airlines, self.settings, self.maintenance_tracker, self.ai_support,
+                verbose=self.verbose, fixed_occupancy=fixed_occupancy, metrics=self.metrics,
+                progress=self.progress
+            )
+            repair_solver.available_cores = self.available_cores
+            
+            # The current allocation guides the search, but may no longer be feasible. If it still is,
+            # it is a lower bound, so the repair never does worse; flights only change stand if that
+            # allocates more. The optimality gap would stop the search at the first solution within
+            # the gap, which need not be as good as the current allocation.
+            neighbourhood_hint = {
+                self.flights_data[flight_idx]["flight"].FlightID: self.stands[current_stands[flight_idx]].StandName
+                for flight_idx in neighbourhood_flights if flight_idx in current_stands
+            }
+            repair_allocated, repair_unallocated = repair_solver.solve(
+                hint_allocation=neighbourhood_hint or None, hint_as_lower_bound=True,
+                time_limit=time_limit, log_unallocated=False, stand_change_penalty=True,
+                stop_at_optimality_gap=False
+            )
+            self.solve_stats = repair_solver.solve_stats
+            self.solve_report = repair_solver.solve_report
+            
+            if not repair_allocated and not repair_unallocated:
+                return [], []  # No solution found for the neighbourhood
+            
+            for allocation in repair_allocated:
+                allocations[allocation['flight'].FlightID] = (
+                    allocation['stand'], allocation['start_time'], allocation['end_time']
+                )
+            for unallocation in repair_unallocated:
+                reasons[unallocation['flight'].FlightID] = unallocation['reason']
+            self.solution_occupancy.update(repair_solver.solution_occupancy)
+        
+        allocated_flights_report = []
+        unallocated_flights_report = []
+        for flight_data in self.flights_data:
+            flight = flight_data["flight"]
+            if flight.FlightID in allocations:
+                stand, start_time_str, end_time_str = allocations[flight.FlightID]
+                allocated_flights_report.append({
+                    'flight': flight,
+                    'stand': stand,
+                    'start_time': start_time_str,
+                    'end_time': end_time_str
+                })
+            else:
+                # Unallocated before the window and not part of the repair
+                reason = reasons.get(flight.FlightID, "No suitable stand available (CP solver)")
+                if log_unallocated:
+                    self.ai_support.log_unallocated_flight(flight, reason)
+                unallocated_flights_report.append({
+                    'flight': flight,
+                    'reason': reason
+                })
+        
+        return allocated_flights_report, unallocated_flights_report
+    
+    def solve_decomposed(self, time_limit=None, log_unallocated=True):
+        """
+        Solve each independent component as its own CP model in a pool of worker processes
+        
+        Each component gets a share of the time limit in proportion to its number of flights,
+        and the available cores are divided between the worker processes. If any component
+        cannot be solved, no solution is returned, as with solve().
+        
+        Parameters:
+        - time_limit: Optional time limit in seconds (defaults to "solver_time_limit_seconds")
+        - log_unallocated: Whether to pass unallocated flights to the AI support module
+        
+        Returns:
+        - Tuple of (allocated_flights_report, unallocated_flights_report)
+        """
+        if time_limit is None:
+            time_limit = self.settings.solver_parameters.get("solver_time_limit_seconds", 30)
+        
+        components = self.find_independent_components()
+        
+        # Flights without any compatible stand need no model
+        solvable_components = [
+            component for component in components
+            if any(self.flights_data[flight_idx]["compatible_stands"] for flight_idx in component)
+        ]
+        if len(solvable_components) <= 1:
+            return self.solve(time_limit=time_limit, log_unallocated=log_unallocated)
+        
+        available_cores = self.available_cores or get_available_cores()
+        max_processes = self.settings.solver_parameters.get("decomposition_max_processes", available_cores)
+        num_processes = max(1, min(len(solvable_components), max_processes, available_cores))
+        cores_per_process = max(1, available_cores // num_processes)
+        
+        # Components run side by side, so together they may use the time limit once per process
+        total_flights = sum(len(component) for component in solvable_components)
+        
+        tasks = []
+        for component in solvable_components:
+            component_stand_indices = sorted({
+                stand_idx for flight_idx in component
+                for stand_idx in self.flights_data[flight_idx]["compatible_stands"]
+            })
+            component_stands = [self.stands[stand_idx] for stand_idx in component_stand_indices]
+            component_stand_names = {stand.StandName for stand in component_stands}
+            
+            tasks.append({
+                "flights": [self.flights_data[flight_idx]["flight"] for flight_idx in component],
+                "stands": component_stands,
+                "fixed_occupancy": [entry for entry in self.fixed_occupancy if entry[0] in component_stand_names],
+                "time_limit": min(time_limit, max(1.0, time_limit * num_processes * len(component) / total_flights)),
+                "available_cores": cores_per_process,
+                "airlines": self.airlines,
+                "settings": self.settings,
+                "maintenance_tracker": self.maintenance_tracker,
+            })
+        
+        logger.info("Solving %d independent components in %d processes (%d cores each)",
+                    len(tasks), num_processes, cores_per_process)
+        if self.verbose:
+            print(f"Solving {len(tasks)} independent components "
+                  f"(largest {len(solvable_components[0])} flights) in {num_processes} processes...")
+        
+        start_time = time.time()
+        if num_processes > 1:
+            with ProcessPoolExecutor(max_workers=num_processes) as executor:
+                results = list(executor.map(_solve_component, tasks))
+        else:
+            results = [_solve_component(task) for task in tasks]
+        
+        logger.info("Components solved in %.2f seconds", time.time() - start_time)
+        
+        if not all(result["solved"] for result in results):
+            logger.warning("CP solver could not find a solution for every component")
+            if self.verbose:
+                print("CP solver could not find a solution for every component")
+            return [], []
+        
+        # Merge the component results back into reports on this solver's flights and stands
+        allocations = {}
+        reasons = {}
+        self.solution_occupancy = {}
+        for result in results:
+            for flight_id, stand_name, start_time_str, end_time_str in result["allocated"]:
+                allocations[flight_id] = (stand_name, start_time_str, end_time_str)
+            for flight_id, reason in result["unallocated"]:
+                reasons[flight_id] = reason
+            self.solution_occupancy.update(result["occupancy"])
+            self.metrics.merge(result["metrics"])
+        
+        allocated_flights_report = []
+        unallocated_flights_report = []
+        for flight_data in self.flights_data:
+            flight = flight_data["flight"]
+            if flight.FlightID in allocations:
+                stand_name, start_time_str, end_time_str = allocations[flight.FlightID]
+                allocated_flights_report.append({
+                    'flight': flight,
+                    'stand': self.stands[self.stand_indices[stand_name]],
+                    'start_time': start_time_str,
+                    'end_time': end_time_str
+                })
+            else:
+                reason = reasons.get(flight.FlightID, "No suitable stand available (CP solver)")
+                if log_unallocated:
+                    self.ai_support.log_unallocated_flight(flight, reason)
+                unallocated_flights_report.append({
+                    'flight': flight,
+                    'reason': reason
+                })
+        
+        if self.verbose:
+            print(f"Final allocation: {len(allocated_flights_report)}/{len(self.flights)} flights allocated "
+                  f"({len(allocated_flights_report)/len(self.flights)*100:.1f}%)")
+        
+        return allocated_flights_report, unallocated_flights_report
+    
+    def solve(self, hint_allocation=None, hint_as_lower_bound=True, time_limit=None, log_unallocated=True,
+              on_incumbent=None, cancel_event=None, stand_change_penalty=False, stop_at_optimality_gap=True):
         """
         Create and solve the CP model for stand allocation
         
+        The search stops at the time limit, once the relative gap between the best solution
+        and the bound is at most the "optimality_gap" solver parameter, or when cancelled.
+        The last "max_solutions" improving solutions are kept in self.incumbents.
+        
+        With stand_change_penalty, every hinted flight that does not keep its hinted stand (if
+        compatible) costs 1, and the flight weights are multiplied by one more than the number
+        of such flights, so moving all of them still costs less than any flight. The objective values
+        in solve_stats and the incumbents are then in these scaled units.
+        
+        Parameters:
+        - hint_allocation: Optional dict of FlightID -> StandName used as a warm-start
+          solution hint (e.g. the result of the greedy algorithm)
+        - hint_as_lower_bound: Whether to require the solution to be at least as good
+          as the hinted allocation (only if the hinted allocation is feasible)
+        - time_limit: Optional time limit in seconds (defaults to "solver_time_limit_seconds")
+        - log_unallocated: Whether to pass unallocated flights to the AI support module
+        - on_incumbent: Optional function called with each improving solution (see _build_incumbent)
+        - cancel_event: Optional threading.Event; setting it stops the search and returns
+          the best solution found so far
+        - stand_change_penalty: Whether to prefer solutions that keep hinted flights on their stand
+        - stop_at_optimality_gap: Whether to apply the "optimality_gap" solver parameter
+        
         Returns:
         - Tuple of (allocated_flights_report, unallocated_flights_report)
         """
         allocated_flights_report = []
         unallocated_flights_report = []
+        self.solution_occupancy = {}
+        self.incumbents = []
         
         # Get timing parameters from settings
-        time_limit = self.settings.solver_parameters.get("solver_time_limit_seconds", 30)
+        if time_limit is None:
+            time_limit = self.settings.solver_parameters.get("solver_time_limit_seconds", 30)
         
         # Get gap between flights in minutes
         gap_between_flights = self.settings.GapBetweenFlights
@@ -358,10 +1744,17 @@ class StandAllocationCPSolver:
         flight_stand_vars = {}  # flight_idx -> stand_idx variable
         flight_start_vars = {}  # flight_idx -> start_time variable
         flight_end_vars = {}   # flight_idx -> end_time variable
+        flight_uses_stand_vars = {}  # (flight_idx, stand_idx) -> "flight uses stand" Boolean variable
         
         # Get maintenance intervals
         maintenance_intervals = self._get_maintenance_intervals()
         
+        # Warm start: work out a complete assignment to hint from the given allocation
+        # Relabelling interchangeable stands would move hinted flights, so keep their stands
+        # (and skip the symmetry breaking) when moves are penalized
+        break_symmetry = bool(self.interchangeable_stand_classes) and not stand_change_penalty
+        hint = self._build_hint_values(hint_allocation, relabel_stands=break_symmetry) if hint_allocation else None
+        
         # Create variables and initial constraints
         for flight_idx, flight_data in enumerate(self.flights_data):
             flight = flight_data["flight"]
@@ -374,6 +1767,8 @@ class StandAllocationCPSolver:
                 f'stand_{flight.FlightID}'
             )
             flight_stand_vars[flight_idx] = stand_var
+            if hint:
+                model.AddHint(stand_var, hint["stand"][flight_idx])
             
             # Add constraint: stand must be compatible or UNALLOCATED_STAND
             compatible_stands = flight_data["compatible_stands"] + [self.UNALLOCATED_STAND]
@@ -397,6 +1792,8 @@ class StandAllocationCPSolver:
                     scheduled_minutes + self.time_horizon, 
                     f'end_{flight.FlightID}'
                 )
+                if hint:
+                    model.AddHint(end_var, hint["end"][flight_idx])
             else:  # departure
                 # For departures, end time is fixed at scheduled time
                 end_var = model.NewConstant(scheduled_minutes)
@@ -406,6 +1803,8 @@ class StandAllocationCPSolver:
                     scheduled_minutes, 
                     f'start_{flight.FlightID}'
                 )
+                if hint:
+                    model.AddHint(start_var, hint["start"][flight_idx])
             
             flight_start_vars[flight_idx] = start_var
             flight_end_vars[flight_idx] = end_var
@@ -415,6 +1814,8 @@ class StandAllocationCPSolver:
                 turnaround_minutes = flight_data["turnaround_minutes"]
                 # Only enforce this constraint if the flight is allocated
                 b = model.NewBoolVar(f'enforce_turnaround_{flight_idx}')
+                if hint:
+                    model.AddHint(b, hint["allocated"][flight_idx])
                 model.Add(stand_var != self.UNALLOCATED_STAND).OnlyEnforceIf(b)
                 model.Add(stand_var == self.UNALLOCATED_STAND).OnlyEnforceIf(b.Not())
                 model.Add(end_var - start_var >= turnaround_minutes).OnlyEnforceIf(b)
@@ -432,9 +1833,14 @@ class StandAllocationCPSolver:
                 if arrival and departure:
                     arrival_idx = self.flight_indices[arrival.FlightID]
                     departure_idx = self.flight_indices[departure.FlightID]
+                    if hint:
+                        arrival_hinted = hint["allocated"][arrival_idx]
+                        departure_hinted = hint["allocated"][departure_idx]
                     
                     # 1. Same stand constraint (only if both are allocated)
                     b_same_stand = model.NewBoolVar(f'linked_same_stand_{link_id}')
+                    if hint:
+                        model.AddHint(b_same_stand, arrival_hinted and departure_hinted)
                     model.Add(flight_stand_vars[arrival_idx] != self.UNALLOCATED_STAND).OnlyEnforceIf(b_same_stand)
                     model.Add(flight_stand_vars[departure_idx] != self.UNALLOCATED_STAND).OnlyEnforceIf(b_same_stand)
                     model.Add(flight_stand_vars[arrival_idx] == flight_stand_vars[departure_idx]).OnlyEnforceIf(b_same_stand)
@@ -442,6 +1848,9 @@ class StandAllocationCPSolver:
                     # 2. If one is allocated, both must be allocated
                     b_arrival_allocated = model.NewBoolVar(f'arrival_allocated_{link_id}')
                     b_departure_allocated = model.NewBoolVar(f'departure_allocated_{link_id}')
+                    if hint:
+                        model.AddHint(b_arrival_allocated, arrival_hinted)
+                        model.AddHint(b_departure_allocated, departure_hinted)
                     
                     model.Add(flight_stand_vars[arrival_idx] != self.UNALLOCATED_STAND).OnlyEnforceIf(b_arrival_allocated)
                     model.Add(flight_stand_vars[arrival_idx] == self.UNALLOCATED_STAND).OnlyEnforceIf(b_arrival_allocated.Not())
@@ -455,6 +1864,9 @@ class StandAllocationCPSolver:
                     
                     # 3. Linked flights timing constraint (if both are allocated)
                     b_linked_timing = model.NewBoolVar(f'linked_timing_{link_id}')
+                    if hint:
+                        # Hinted pairs are split around the gap between flights (see _hint_occupancy_minutes)
+                        model.AddHint(b_linked_timing, False)
                     model.Add(flight_stand_vars[arrival_idx] != self.UNALLOCATED_STAND).OnlyEnforceIf(b_linked_timing)
                     model.Add(flight_stand_vars[departure_idx] != self.UNALLOCATED_STAND).OnlyEnforceIf(b_linked_timing)
                     model.Add(flight_end_vars[arrival_idx] == flight_start_vars[departure_idx]).OnlyEnforceIf(b_linked_timing)
@@ -462,12 +1874,14 @@ class StandAllocationCPSolver:
         # Progress update
         if self.verbose:
             print(f"Adding non-overlap constraints for {len(self.stands)} stands...")
-            constraints_start_time = time.time()
-            stands_processed = 0
-            stands_pbar = tqdm(total=len(self.stands), desc="Adding stand constraints", unit="stands")
+        progress = self.progress
+        progress.phase_start("cp_stand_constraints", total=len(self.stands),
+                             description="Adding stand constraints", unit="stands")
             
         # Add no-overlap constraints for all flights that might use this stand
         for stand_idx in range(len(self.stands)):
+            progress.tick("cp_stand_constraints", stand_idx, len(self.stands))
+            
             # Collect all flight indices that might use this stand
             stand_flights = []
             
@@ -475,16 +1889,6 @@ class StandAllocationCPSolver:
                 if stand_idx in flight_data["compatible_stands"]:
                     stand_flights.append(flight_idx)
             
-            # Show progress with tqdm
-            if self.verbose:
-                stands_processed += 1
-                stands_pbar.update(1)
-                
-                # Update progress bar description occasionally
-                if stands_processed % 10 == 0 or stands_processed == len(self.stands):
-                    elapsed = time.time() - constraints_start_time
-                    stands_pbar.set_postfix_str(f"Elapsed: {elapsed:.1f}s")
-            
             # Add no-overlap constraints for all flights that might use this stand
             if stand_flights:
                 # Instead of pairwise constraints, use the more efficient NoOverlap1D global constraint
@@ -499,6 +1903,9 @@ class StandAllocationCPSolver:
                 for flight_idx in stand_flights:
                     # Create a Boolean variable for "flight uses this stand"
                     b_flight_uses_stand = model.NewBoolVar(f'flight_{flight_idx}_uses_{stand_idx}')
+                    if hint:
+                        model.AddHint(b_flight_uses_stand, hint["stand"][flight_idx] == stand_idx)
+                    flight_uses_stand_vars[(flight_idx, stand_idx)] = b_flight_uses_stand
                     
                     # Link boolean variable to stand assignment
                     model.Add(flight_stand_vars[flight_idx] == stand_idx).OnlyEnforceIf(b_flight_uses_stand)
@@ -512,9 +1919,12 @@ class StandAllocationCPSolver:
                     min_duration = 1  # Minimum duration of 1 minute
                     
                     # Create an optional interval variable
+                    duration_var = model.NewIntVar(min_duration, self.time_horizon, f'duration_{flight_idx}_{stand_idx}')
+                    if hint:
+                        model.AddHint(duration_var, hint["duration"][flight_idx])
                     interval_var = model.NewOptionalIntervalVar(
                         start_var,
-                        model.NewIntVar(min_duration, self.time_horizon, f'duration_{flight_idx}_{stand_idx}'),
+                        duration_var,
                         end_var,
                         b_flight_uses_stand,
                         f'interval_{flight_idx}_{stand_idx}'
@@ -522,6 +1932,17 @@ class StandAllocationCPSolver:
                     
                     optional_interval_vars.append(interval_var)
                 
+                # Stand time already taken outside this model, followed by the gap between flights
+                fixed_interval_vars = [
+                    model.NewIntervalVar(
+                        start_minutes,
+                        end_minutes + gap_between_flights - start_minutes,
+                        end_minutes + gap_between_flights,
+                        f'fixed_{stand_idx}_{start_minutes}_{end_minutes}'
+                    )
+                    for start_minutes, end_minutes in self.fixed_intervals.get(stand_idx, [])
+                ]
+                
                 # Add a NoOverlap constraint for all intervals with a minimum gap
                 if gap_between_flights > 0:
                     # If we need gaps between flights, we need to account for that in the interval creation
@@ -532,6 +1953,8 @@ class StandAllocationCPSolver:
                         # Get this flight's Boolean variable for using this stand
                         # We need to create this again since we need to reference the existing one
                         b_flight_uses_stand = model.NewBoolVar(f'flight_{flight_idx}_uses_{stand_idx}_gap')
+                        if hint:
+                            model.AddHint(b_flight_uses_stand, hint["stand"][flight_idx] == stand_idx)
                         model.Add(flight_stand_vars[flight_idx] == stand_idx).OnlyEnforceIf(b_flight_uses_stand)
                         model.Add(flight_stand_vars[flight_idx] != stand_idx).OnlyEnforceIf(b_flight_uses_stand.Not())
                         
@@ -541,19 +1964,24 @@ class StandAllocationCPSolver:
                             0, self.time_horizon, f'end_with_gap_{flight_idx}_{stand_idx}'
                         )
                         model.Add(end_var_with_gap == flight_end_vars[flight_idx] + gap_between_flights)
+                        if hint:
+                            model.AddHint(end_var_with_gap, hint["end"][flight_idx] + gap_between_flights)
                         
                         # Replace the interval with one that includes the gap
+                        gap_duration_var = model.NewIntVar(min_duration, self.time_horizon, f'duration_gap_{flight_idx}_{stand_idx}')
+                        if hint:
+                            model.AddHint(gap_duration_var, hint["duration"][flight_idx] + gap_between_flights)
                         optional_interval_vars[idx] = model.NewOptionalIntervalVar(
                             start_var,
-                            model.NewIntVar(min_duration, self.time_horizon, f'duration_gap_{flight_idx}_{stand_idx}'),
+                            gap_duration_var,
                             end_var_with_gap,
                             b_flight_uses_stand,
                             f'interval_gap_{flight_idx}_{stand_idx}'
                         )
                     
-                    model.AddNoOverlap(optional_interval_vars)
+                    model.AddNoOverlap(optional_interval_vars + fixed_interval_vars)
                 else:
-                    model.AddNoOverlap(optional_interval_vars)
+                    model.AddNoOverlap(optional_interval_vars + fixed_interval_vars)
             
             # Add maintenance constraints
             for maint_stand_idx, start_minutes, end_minutes in maintenance_intervals:
@@ -571,6 +1999,8 @@ class StandAllocationCPSolver:
                     for flight_idx in stand_flights:
                         # Reuse the existing Boolean variable for "flight uses this stand"
                         b_flight_uses_stand = model.NewBoolVar(f'flight_{flight_idx}_uses_{stand_idx}_maint')
+                        if hint:
+                            model.AddHint(b_flight_uses_stand, hint["stand"][flight_idx] == stand_idx)
                         
                         # Link boolean variable to stand assignment
                         model.Add(flight_stand_vars[flight_idx] == stand_idx).OnlyEnforceIf(b_flight_uses_stand)
@@ -581,9 +2011,12 @@ class StandAllocationCPSolver:
                         flight_end_var = flight_end_vars[flight_idx]
                         
                         # Create flight interval
+                        maint_duration_var = model.NewIntVar(1, self.time_horizon, f'maint_duration_{flight_idx}_{stand_idx}')
+                        if hint:
+                            model.AddHint(maint_duration_var, hint["duration"][flight_idx])
                         flight_interval = model.NewOptionalIntervalVar(
                             flight_start_var,
-                            model.NewIntVar(1, self.time_horizon, f'maint_duration_{flight_idx}_{stand_idx}'),
+                            maint_duration_var,
                             flight_end_var,
                             b_flight_uses_stand,
                             f'maint_interval_{flight_idx}_{stand_idx}'
@@ -592,9 +2025,11 @@ class StandAllocationCPSolver:
                         # Make sure flight doesn't overlap with maintenance
                         model.AddNoOverlap([maint_interval, flight_interval])
         
-        # Close the progress bar if it was created
-        if self.verbose:
-            stands_pbar.close()
+        progress.phase_end("cp_stand_constraints", done=len(self.stands))
+        
+        # Break the symmetry between interchangeable stands
+        if break_symmetry:
+            self._add_symmetry_breaking(model, flight_uses_stand_vars, hint)
         
         if self.verbose:
             print("\nSetting up objective function...")
@@ -608,6 +2043,8 @@ class StandAllocationCPSolver:
         for flight_idx, flight_data in enumerate(self.flights_data):
             flight = flight_data["flight"]
             b_allocated = model.NewBoolVar(f'is_allocated_{flight_idx}')
+            if hint:
+                model.AddHint(b_allocated, hint["allocated"][flight_idx])
             
             model.Add(flight_stand_vars[flight_idx] != self.UNALLOCATED_STAND).OnlyEnforceIf(b_allocated)
             model.Add(flight_stand_vars[flight_idx] == self.UNALLOCATED_STAND).OnlyEnforceIf(b_allocated.Not())
@@ -615,11 +2052,32 @@ class StandAllocationCPSolver:
             flight_allocated_vars[flight_idx] = b_allocated
             
             # Weight by criticality score (convert to integer by multiplying by 100)
-            weight = int(flight.criticality_score * 100) + 1  # ensure positive weight
+            weight = self._flight_weight(flight)
             objective_terms.append(weight * b_allocated)
         
         # Set the objective
-        model.Maximize(sum(objective_terms))
+        objective_expr = sum(objective_terms)
+        if hint is not None and stand_change_penalty:
+            # Every flight with a compatible hinted stand counts, including flights left out of the
+            # hint values (e.g. the two flights of a linked pair hinted on different stands)
+            stand_changes = []
+            for flight_idx, flight_data in enumerate(self.flights_data):
+                stand_idx = self.stand_indices.get(hint_allocation.get(flight_data["flight"].FlightID))
+                if stand_idx in flight_data["compatible_stands"]:
+                    stand_changes.append(flight_uses_stand_vars[(flight_idx, stand_idx)].Not())
+            model.Maximize((len(stand_changes) + 1) * objective_expr - sum(stand_changes))
+        else:
+            model.Maximize(objective_expr)
+        
+        # Warm start: require the solution to be at least as good as the hinted allocation
+        if hint is not None:
+            if hint_as_lower_bound and hint["feasible"]:
+                model.Add(objective_expr >= hint["objective"])
+            elif hint_as_lower_bound:
+                logger.info("Warm start hint overlaps fixed occupancy or maintenance; not using it as a lower bound")
+            
+            logger.info("Warm start hint covers %d of %d flights (objective %d)",
+                        sum(hint["allocated"]), len(self.flights_data), hint["objective"])
         
         # Show model creation time
         if self.verbose:
@@ -627,61 +2085,87 @@ class StandAllocationCPSolver:
             print(f"Model creation complete in {model_creation_time:.2f} seconds")
             print(f"Starting CP solver with {len(self.flights)} flights...")
         
+        self._record_model_metrics(model)
+        
         # Create solver and solve
         solver = cp_model.CpSolver()
         
-        # Configure solver parameters for large-scale problems
+        # Configure solver parameters from the solver profile
         solver.parameters.max_time_in_seconds = time_limit
         solver.parameters.log_search_progress = True
+        self._configure_solver(solver, num_intervals=sum(
+            len(flight_data["compatible_stands"]) for flight_data in self.flights_data
+        ))
         
-        # Configure for large problem instances
-        if len(self.flights) > 1000:
-            if self.verbose:
-                print("Configuring solver for large-scale problem...")
-            
-            # Limit time on the first solution (help with feasibility)
-            solver.parameters.max_time_in_seconds = time_limit
-            
-            # Set heuristic with more focus on feasibility
-            solver.parameters.search_branching = cp_model.AUTOMATIC_SEARCH
-            
-            # For very large problems, add constraints progressively
-            if len(self.flights) > 10000:
-                if self.verbose:
-                    print("Using large-scale search strategy for 10k+ flights")
-                
-                # Optimize for memory usage
-                solver.parameters.num_search_workers = 1
-                solver.parameters.log_search_progress = True
-                
-                # Focus on finding feasible solutions
-                solver.parameters.linearization_level = 0  # Less pre-solving
-                
-                # Adjust time limit to avoid out-of-memory
-                solver.parameters.max_time_in_seconds = min(time_limit, 300)  # 5 minutes max for 10k+ flights
+        if len(self.flights) > LARGE_SCALE_PROFILE_THRESHOLD:
+            # Adjust time limit to avoid out-of-memory
+            solver.parameters.max_time_in_seconds = min(time_limit, 300)  # 5 minutes max for 10k+ flights
+        
+        # With a complete warm-start hint, presolve on large models can use the whole time limit
+        # before the hint is even loaded, so by default skip it and start improving the hint straight away
+        if hint is not None:
+            solver.parameters.cp_model_presolve = self.settings.solver_parameters.get("warm_start_presolve", False)
+        
+        # Stop as soon as the solution is proven to be within the accepted gap of the optimum
+        optimality_gap = self.settings.solver_parameters.get("optimality_gap", 0)
+        if optimality_gap and stop_at_optimality_gap:
+            solver.parameters.relative_gap_limit = optimality_gap
+        
+        # Capture the search log for the solve report instead of writing it to stdout, and keep it
+        # off stdout if that carries the progress events ("cp_log_to_stderr")
+        report_dir = self.settings.solver_parameters.get("cp_report_dir")
+        log_to_stderr = self.settings.solver_parameters.get("cp_log_to_stderr", False)
+        log_lines = []
+        if report_dir or log_to_stderr:
+            def capture_log(message):
+                if report_dir:
+                    log_lines.append(message)
+                if self.verbose or not report_dir:
+                    print(message, file=sys.stderr if log_to_stderr else sys.stdout)
+            solver.parameters.log_to_stdout = False
+            solver.log_callback = capture_log
         
         logger.info("Starting CP solver with dynamically calculated time horizon: %d minutes", self.time_horizon)
         logger.info("Date range: %s to %s", self.earliest_time.strftime('%Y-%m-%d %H:%M'), 
                                             self.latest_time.strftime('%Y-%m-%d %H:%M'))
         logger.info("Time limit: %d seconds", time_limit)
         
-        # Create and attach solution callback
-        solution_callback = None
-        if self.verbose:
-            solution_callback = SolutionCallback(flight_allocated_vars, len(self.flights), self.verbose)
-            solver.parameters.enumerate_all_solutions = True
+        # Create and attach solution callback (it reports incumbents as progress events)
+        max_solutions = max(1, self.settings.solver_parameters.get("max_solutions", 1))
+        keep_incumbents = on_incumbent is not None or max_solutions > 1
+        
+        def handle_solution(callback):
+            # Reading the full allocation costs a pass over all flights, so only do it if asked for
+            if not keep_incumbents:
+                return
+            incumbent = self._build_incumbent(callback, flight_stand_vars, flight_allocated_vars)
+            self.incumbents = (self.incumbents + [incumbent])[-max_solutions:]
+            if on_incumbent:
+                on_incumbent(incumbent)
+        
+        solution_callback = SolutionCallback(
+            flight_allocated_vars, len(self.flights), self.progress,
+            on_solution=handle_solution, cancel_event=cancel_event
+        )
+        
+        # The callback only sees solutions, so watch for cancellation while none are found
+        search_done = threading.Event()
+        if cancel_event is not None:
+            def stop_on_cancel():
+                while not search_done.is_set():
+                    if cancel_event.wait(0.1):
+                        solver.StopSearch()
+                        return
+            threading.Thread(target=stop_on_cancel, daemon=True).start()
             
         start_time = time.time()
         
         try:
-            if solution_callback:
-                status = solver.Solve(model, solution_callback)
-            else:
-                status = solver.Solve(model)
+            status = solver.Solve(model, solution_callback)
         finally:
-            # Ensure progress bar is closed
-            if solution_callback:
-                solution_callback.close()
+            search_done.set()
+            # Ensure the solve phase is reported as ended
+            solution_callback.close()
                 
         solve_time = time.time() - start_time
         
@@ -691,9 +2175,47 @@ class StandAllocationCPSolver:
             
         logger.info("CP solver completed in %.2f seconds with status %s", solve_time, solver.StatusName(status))
         
+        self.solve_stats = {
+            "status": solver.StatusName(status),
+            "solve_time": solve_time,
+            "first_solution_time": solution_callback.first_solution_time(),
+            "num_solutions": solution_callback.solution_count(),
+            "objective": solver.ObjectiveValue() if status in [cp_model.OPTIMAL, cp_model.FEASIBLE] else None,
+            "best_bound": solver.BestObjectiveBound(),
+            "gap": self._relative_gap(solver.ObjectiveValue(), solver.BestObjectiveBound())
+                   if status in [cp_model.OPTIMAL, cp_model.FEASIBLE] else None,
+            "cancelled": cancel_event is not None and cancel_event.is_set(),
+            "num_conflicts": solver.NumConflicts(),
+            "num_branches": solver.NumBranches(),
+        }
+        
+        self.metrics.increment("cp_solves")
+        self.metrics.increment("cp_solve_seconds", solve_time)
+        self.metrics.increment("cp_conflicts", self.solve_stats["num_conflicts"])
+        self.metrics.increment("cp_branches", self.solve_stats["num_branches"])
+        self.metrics.increment("cp_solutions", self.solve_stats["num_solutions"])
+        self.metrics.set("cp_objective", self.solve_stats["objective"])
+        self.metrics.set("cp_best_bound", self.solve_stats["best_bound"])
+        self.metrics.set_info("cp_status", self.solve_stats["status"])
+        
+        if report_dir:
+            self.solve_report = write_solve_report(
+                report_dir, next_report_name(), model, solver, log_lines, self.solve_stats,
+                model_stats={
+                    "flights": len(self.flights_data),
+                    "stands": len(self.stands),
+                    "fixed_occupancy": len(self.fixed_occupancy),
+                    "hinted": hint is not None,
+                    "solver_profile": self.solver_profile,
+                    **{name: value for name, value in self.metrics.gauges.items() if name.startswith("cp_model_")}
+                },
+                export_model=self.settings.solver_parameters.get("cp_report_export_model", True)
+            )
+            logger.info("CP solve report written to %s",
+                        os.path.join(report_dir, f"{self.solve_report['name']}.json"))
+        
         if self.verbose:
-            solution_count = solution_callback.solution_count() if solution_callback else 0
-            print(f"CP solver completed in {solve_time:.2f} seconds (found {solution_count} solutions)")
+            print(f"CP solver completed in {solve_time:.2f} seconds (found {solution_callback.solution_count()} solutions)")
         
         # Process results if optimal or feasible solution found
         if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
@@ -711,37 +2233,8 @@ class StandAllocationCPSolver:
                     end_minutes = solver.Value(flight_end_vars[flight_idx])
                     
                     # Convert minutes back to datetime, handling multi-day scenarios
-                    if flight.parsed_time.year == 1900:  # Legacy time format
-                        # Just use the time portion
-                        start_time = datetime(2000, 1, 1, start_minutes // 60, start_minutes % 60)
-                        end_time = datetime(2000, 1, 1, end_minutes // 60, end_minutes % 60)
-                        
-                        # Format as time only
-                        start_time_str = start_time.strftime("%H:%M")
-                        end_time_str = end_time.strftime("%H:%M")
-                    else:
-                        # Use proper date handling
-                        start_days = start_minutes // (24 * 60)
-                        start_hour = (start_minutes % (24 * 60)) // 60
-                        start_minute = start_minutes % 60
-                        
-                        end_days = end_minutes // (24 * 60)
-                        end_hour = (end_minutes % (24 * 60)) // 60
-                        end_minute = end_minutes % 60
-                        
-                        start_time = datetime.combine(
-                            self.earliest_time.date() + timedelta(days=start_days),
-                            datetime.min.time().replace(hour=start_hour, minute=start_minute)
-                        )
-                        
-                        end_time = datetime.combine(
-                            self.earliest_time.date() + timedelta(days=end_days),
-                            datetime.min.time().replace(hour=end_hour, minute=end_minute)
-                        )
-                        
-                        # Format with date and time
-                        start_time_str = start_time.strftime("%Y-%m-%d %H:%M")
-                        end_time_str = end_time.strftime("%Y-%m-%d %H:%M")
+                    start_time_str = self._format_report_time(flight, start_minutes)
+                    end_time_str = self._format_report_time(flight, end_minutes)
                     
                     # Add to allocated flights report
                     allocation = {
@@ -751,10 +2244,19 @@ class StandAllocationCPSolver:
                         'end_time': end_time_str
                     }
                     allocated_flights_report.append(allocation)
+                    
+                    # Record the stand time the flight needs, e.g. to fix it in a later solve
+                    occupied_start, occupied_end = self._solution_occupancy_minutes(flight_idx, start_minutes, end_minutes)
+                    self.solution_occupancy[flight.FlightID] = (
+                        stand.StandName,
+                        self._minutes_to_datetime(occupied_start),
+                        self._minutes_to_datetime(occupied_end)
+                    )
                 else:
                     # Flight was not allocated
                     reason = "No suitable stand available (CP solver)"
-                    self.ai_support.log_unallocated_flight(flight, reason)
+                    if log_unallocated:
+                        self.ai_support.log_unallocated_flight(flight, reason)
                     unallocated_flights_report.append({
                         'flight': flight,
                         'reason': reason
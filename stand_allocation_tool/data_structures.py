@@ -63,6 +63,7 @@ class Settings:
         "optimality_gap": 0.05,          # Acceptable optimality gap
         "max_solutions": 1               # Number of solutions to generate
     })
+    stand_selection_policy: str = "first_fit"  # Greedy choice among free stands: "first_fit", "best_fit", "robust_fit" or "contact_first"
 
 @dataclass
 class MaintenanceEntry:
@@ -0,0 +1,96 @@
+"""
+Min-Cost-Flow Allocation for Stand Allocation
+Solves weighted interval scheduling on a class of interchangeable stands exactly
+with Google OR-Tools min-cost flow
+"""
+
+from ortools.graph.python import min_cost_flow
+
+from interval_partitioning import peak_overlap
+
+
+def max_weight_interval_selection(intervals, weights, capacity):
+    """
+    Select the intervals of maximum total weight such that at most `capacity` overlap at any time
+    
+    This is the min-cost-flow formulation of weighted interval scheduling on identical machines:
+    the time points form a chain of arcs with capacity `capacity` and zero cost, and every
+    interval is an arc from its start to its end with capacity 1 and cost -weight. A flow of
+    `capacity` units along the chain picks the intervals whose arcs carry flow.
+    
+    Groups of intervals that overlap each other (directly or through other intervals) are
+    independent. A group that never has more than `capacity` intervals at once is selected
+    whole; only the congested groups are solved with min-cost flow, each on its own.
+    
+    Parameters:
+    - intervals: List of (start, end) integer tuples, half-open ([start, end))
+    - weights: List of positive integer weights, one per interval
+    - capacity: Number of identical stands
+    
+    Returns:
+    - List of indices of the selected intervals
+    """
+    if not intervals or capacity <= 0:
+        return []
+    
+    selected = []
+    for group in _overlapping_groups(intervals):
+        if peak_overlap([intervals[idx] for idx in group]) <= capacity:
+            selected.extend(group)
+        else:
+            group_selection = _min_cost_flow_selection(
+                [intervals[idx] for idx in group], [weights[idx] for idx in group], capacity
+            )
+            selected.extend(group[idx] for idx in group_selection)
+    
+    return sorted(selected)
+
+
+def _overlapping_groups(intervals):
+    """
+    Split intervals into groups that do not overlap any interval of another group
+    
+    Returns:
+    - List of lists of interval indices
+    """
+    groups = []
+    group_end = None
+    for idx in sorted(range(len(intervals)), key=lambda idx: intervals[idx]):
+        start, end = intervals[idx]
+        if group_end is None or start >= group_end:
+            groups.append([])
+            group_end = end
+        groups[-1].append(idx)
+        group_end = max(group_end, end)
+    return groups
+
+
+def _min_cost_flow_selection(intervals, weights, capacity):
+    """
+    Solve the min-cost-flow formulation for one group of intervals
+    
+    Returns:
+    - List of indices of the selected intervals
+    """
+    time_points = sorted({point for interval in intervals for point in interval})
+    node_index = {point: idx for idx, point in enumerate(time_points)}
+    capacity = min(capacity, len(intervals))
+    
+    flow = min_cost_flow.SimpleMinCostFlow()
+    for node in range(len(time_points) - 1):
+        flow.add_arc_with_capacity_and_unit_cost(node, node + 1, capacity, 0)
+    
+    interval_arcs = []
+    for (start, end), weight in zip(intervals, weights):
+        interval_arcs.append(flow.add_arc_with_capacity_and_unit_cost(
+            node_index[start], node_index[end], 1, -weight
+        ))
+    
+    flow.set_node_supply(0, capacity)
+    flow.set_node_supply(len(time_points) - 1, -capacity)
+    
+    status = flow.solve()
+    if status != flow.OPTIMAL:
+        raise RuntimeError(f"Min-cost flow failed with status {status}")
+    
+    return [idx for idx, arc in enumerate(interval_arcs) if flow.flow(arc) > 0]
@@ -2,14 +2,22 @@
 """
 Generate a large flight dataset for testing the stand allocation algorithm's performance.
 This creates a dataset with 50,000 flights spread across a full year.
+
+The data is drawn with NumPy from a seeded generator, so the same seed and arguments always
+give the same files. Flights are generated in chunks of CHUNK_SIZE flight units (a linked
+pair or a single flight), each with its own random stream derived from the seed, so chunks
+can be generated by worker processes in any order and written to flights.json as they are
+done, in a compact format with one flight per line.
 """
 
 import json
-import random
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 import os
+import time
 from typing import List, Dict
+import numpy as np
 
 # Configuration
 DEFAULT_NUM_FLIGHTS = 50000
@@ -18,6 +26,18 @@ DEFAULT_END_DATE = "2023-12-31"
 DEFAULT_NUM_STANDS = 100
 DEFAULT_NUM_AIRLINES = 20
 DEFAULT_LINKED_PAIRS_PERCENTAGE = 80  # Percentage of flights that are linked pairs
+DEFAULT_SEED = 42
+
+# Flight units per chunk; part of the random streams, so changing it changes the flights
+CHUNK_SIZE = 50000
+
+# Random streams derived from the seed (flight chunks use their chunk index after FLIGHT_STREAM)
+AIRLINE_STREAM = 0
+STAND_STREAM = 1
+MAINTENANCE_STREAM = 2
+FLIGHT_STREAM = 3
+
+TERMINALS = ["T1", "T2", "T3", "T4"]
 
 # Aircraft types with proportions
 AIRCRAFT_TYPES = {
@@ -32,119 +52,165 @@ AIRCRAFT_TYPE_WEIGHTS = {
     "Super": 5     # 5% super jumbo
 }
 
-def random_time_between(start_date: datetime, end_date: datetime) -> datetime:
-    """Generate a random datetime between start_date and end_date"""
-    delta = end_date - start_date
-    random_seconds = random.randint(0, int(delta.total_seconds()))
-    return start_date + timedelta(seconds=random_seconds)
-
-def generate_flight_id(index: int) -> str:
-    """Generate a unique flight ID"""
-    return f"F{index:06d}"
-
-def generate_flight_number(airline_code: str) -> str:
-    """Generate a flight number for an airline"""
-    return f"{airline_code}{random.randint(100, 9999)}"
-
-def select_aircraft_type() -> str:
-    """Select an aircraft type based on weighted distribution"""
-    category = random.choices(
-        list(AIRCRAFT_TYPE_WEIGHTS.keys()),
-        weights=list(AIRCRAFT_TYPE_WEIGHTS.values()),
-        k=1
-    )[0]
-    
-    return random.choice(AIRCRAFT_TYPES[category])
-
-def generate_linked_flights(
-    flight_id: str, 
-    airline_code: str, 
-    aircraft_type: str,
-    arrival_time: datetime, 
-    turnaround_time: int,
-    terminals: List[str]
-) -> tuple:
-    """Generate a linked pair of flights (arrival and departure)"""
-    link_id = f"LINK{flight_id[1:]}"
-    departure_time = arrival_time + timedelta(minutes=turnaround_time)
-    
-    terminal = random.choice(terminals)
-    origin = f"ORIG{random.randint(1, 100)}"
-    destination = f"DEST{random.randint(1, 100)}"
-    
-    # Ensure origin and destination are different
-    while destination == origin:
-        destination = f"DEST{random.randint(1, 100)}"
-    
-    arrival = {
-        "FlightID": flight_id,
-        "FlightNumber": generate_flight_number(airline_code),
-        "AirlineCode": airline_code,
-        "AircraftType": aircraft_type,
-        "Origin": origin,
-        "Destination": terminal,
-        "ScheduledTime": arrival_time.strftime("%Y-%m-%dT%H:%M"),
-        "Terminal": terminal,
-        "IsArrival": True,
-        "LinkID": link_id,
-        "is_critical_connection": random.random() < 0.1,  # 10% are critical connections
-        "base_priority_score": random.randint(0, 5)
-    }
-    
-    departure = {
-        "FlightID": f"D{flight_id[1:]}",
-        "FlightNumber": generate_flight_number(airline_code),
-        "AirlineCode": airline_code,
-        "AircraftType": aircraft_type,
-        "Origin": terminal,
-        "Destination": destination,
-        "ScheduledTime": departure_time.strftime("%Y-%m-%dT%H:%M"),
-        "Terminal": terminal,
-        "IsArrival": False,
-        "LinkID": link_id,
-        "is_critical_connection": random.random() < 0.1,
-        "base_priority_score": random.randint(0, 5)
-    }
-    
-    return arrival, departure
-
-def generate_single_flight(
-    flight_id: str, 
-    airline_code: str, 
-    aircraft_type: str,
-    flight_time: datetime,
-    terminals: List[str],
-    is_arrival: bool
-) -> dict:
-    """Generate a single flight (either arrival or departure)"""
-    terminal = random.choice(terminals)
-    
-    if is_arrival:
-        origin = f"ORIG{random.randint(1, 100)}"
-        destination = terminal
-    else:
-        origin = terminal
-        destination = f"DEST{random.randint(1, 100)}"
-    
-    return {
-        "FlightID": flight_id,
-        "FlightNumber": generate_flight_number(airline_code),
-        "AirlineCode": airline_code,
-        "AircraftType": aircraft_type,
-        "Origin": origin,
-        "Destination": destination,
-        "ScheduledTime": flight_time.strftime("%Y-%m-%dT%H:%M"),
-        "Terminal": terminal,
-        "IsArrival": is_arrival,
-        "LinkID": None,
-        "is_critical_connection": random.random() < 0.1,
-        "base_priority_score": random.randint(0, 5)
-    }
+# Turnaround of linked pairs in minutes by aircraft type (45 for the rest)
+TURNAROUND_MINUTES = {
+    "A380": 120, "B747": 120, "AN225": 120,
+    "B777": 90, "B787": 90, "A330": 90, "A350": 90
+}
+
+# One line of flights.json per flight
+FLIGHT_TEMPLATE = (
+    '{{"FlightID": "{}", "FlightNumber": "{}", "AirlineCode": "{}", "AircraftType": "{}", '
+    '"Origin": "{}", "Destination": "{}", "ScheduledTime": "{}", "Terminal": "{}", '
+    '"IsArrival": {}, "LinkID": {}, "is_critical_connection": {}, "base_priority_score": {}}}'
+)
+
+
+def _rng(seed: int, stream: int) -> np.random.Generator:
+    """Random generator of a stream derived from the seed"""
+    return np.random.default_rng([seed, stream])
+
+
+def _random_times(rng: np.random.Generator, start_date: datetime, end_date: datetime, size: int) -> np.ndarray:
+    """Draw datetimes (to the second) between start_date and end_date"""
+    seconds = rng.integers(0, int((end_date - start_date).total_seconds()), size=size, endpoint=True)
+    return np.datetime64(start_date, "s") + seconds.astype("timedelta64[s]")
+
 
-def generate_stands(num_stands: int, terminals: List[str]) -> List[Dict]:
+def _select_aircraft_types(rng: np.random.Generator, size: int) -> np.ndarray:
+    """Draw aircraft types by the weights of their categories, uniformly within a category"""
+    weights = np.array(list(AIRCRAFT_TYPE_WEIGHTS.values()), dtype=float)
+    categories = rng.choice(len(weights), size=size, p=weights / weights.sum())
+    types = np.empty(size, dtype=object)
+    for category_idx, category in enumerate(AIRCRAFT_TYPE_WEIGHTS):
+        mask = categories == category_idx
+        names = np.array(AIRCRAFT_TYPES[category], dtype=object)
+        types[mask] = names[rng.integers(0, len(names), size=int(mask.sum()))]
+    return types
+
+
+def _json_bool(values: np.ndarray) -> List[str]:
+    """Format a Boolean array as JSON literals"""
+    return np.where(values, "true", "false").tolist()
+
+
+def generate_flight_chunk(task: Dict) -> str:
+    """
+    Generate the flights of a chunk of flight units as lines of flights.json
+    
+    Linked pairs come before single flights, and every unit has a fixed index, so the
+    flight IDs do not depend on the chunking.
+    
+    Parameters:
+    - task: Dict with "seed", "chunk" (index), "first_unit" and "num_units" (unit range),
+      "num_linked_pairs", "airline_codes", "start_date" and "end_date"
+    
+    Returns:
+    - The chunk's flights, one JSON object per line (without a separator after the last one)
+    """
+    rng = _rng(task["seed"], FLIGHT_STREAM + task["chunk"])
+    start_date = datetime.strptime(task["start_date"], "%Y-%m-%d")
+    end_date = datetime.strptime(task["end_date"], "%Y-%m-%d")
+    airline_codes = np.array(task["airline_codes"], dtype=object)
+    
+    first_unit = task["first_unit"]
+    units = np.arange(first_unit, first_unit + task["num_units"])
+    num_pairs = int(np.clip(task["num_linked_pairs"] - first_unit, 0, task["num_units"]))
+    num_singles = task["num_units"] - num_pairs
+    lines = []
+    
+    if num_pairs:
+        pair_units = units[:num_pairs]
+        airlines = airline_codes[rng.integers(0, len(airline_codes), size=num_pairs)]
+        aircraft_types = _select_aircraft_types(rng, num_pairs)
+        arrival_times = _random_times(rng, start_date, end_date - timedelta(hours=24), num_pairs)
+        turnarounds = np.array([TURNAROUND_MINUTES.get(aircraft_type, 45) for aircraft_type in aircraft_types])
+        departure_times = arrival_times + (turnarounds * 60).astype("timedelta64[s]")
+        terminals = np.array(TERMINALS, dtype=object)[rng.integers(0, len(TERMINALS), size=num_pairs)].tolist()
+        origins = rng.integers(1, 100, size=num_pairs, endpoint=True).tolist()
+        destinations = rng.integers(1, 100, size=num_pairs, endpoint=True).tolist()
+        numbers = rng.integers(100, 9999, size=(2, num_pairs), endpoint=True).tolist()
+        critical = rng.random(size=(2, num_pairs)) < 0.1
+        scores = rng.integers(0, 5, size=(2, num_pairs), endpoint=True).tolist()
+        
+        arrival_strings = np.datetime_as_string(arrival_times, unit="m").tolist()
+        departure_strings = np.datetime_as_string(departure_times, unit="m").tolist()
+        arrival_critical, departure_critical = _json_bool(critical[0]), _json_bool(critical[1])
+        airlines, aircraft_types = airlines.tolist(), aircraft_types.tolist()
+        for i, unit in enumerate(pair_units.tolist()):
+            link_id = f'"LINK{unit:06d}"'
+            lines.append(FLIGHT_TEMPLATE.format(
+                f"F{unit:06d}", f"{airlines[i]}{numbers[0][i]}", airlines[i], aircraft_types[i],
+                f"ORIG{origins[i]}", terminals[i], arrival_strings[i], terminals[i],
+                "true", link_id, arrival_critical[i], scores[0][i]
+            ))
+            lines.append(FLIGHT_TEMPLATE.format(
+                f"D{unit:06d}", f"{airlines[i]}{numbers[1][i]}", airlines[i], aircraft_types[i],
+                terminals[i], f"DEST{destinations[i]}", departure_strings[i], terminals[i],
+                "false", link_id, departure_critical[i], scores[1][i]
+            ))
+    
+    if num_singles:
+        single_units = units[num_pairs:]
+        airlines = airline_codes[rng.integers(0, len(airline_codes), size=num_singles)].tolist()
+        aircraft_types = _select_aircraft_types(rng, num_singles).tolist()
+        times = np.datetime_as_string(_random_times(rng, start_date, end_date, num_singles), unit="m").tolist()
+        is_arrival = rng.random(size=num_singles) < 0.5  # 50% arrivals, 50% departures
+        terminals = np.array(TERMINALS, dtype=object)[rng.integers(0, len(TERMINALS), size=num_singles)].tolist()
+        airports = rng.integers(1, 100, size=num_singles, endpoint=True).tolist()
+        numbers = rng.integers(100, 9999, size=num_singles, endpoint=True).tolist()
+        critical = _json_bool(rng.random(size=num_singles) < 0.1)
+        scores = rng.integers(0, 5, size=num_singles, endpoint=True).tolist()
+        
+        arrivals = is_arrival.tolist()
+        for i, unit in enumerate(single_units.tolist()):
+            if arrivals[i]:
+                origin, destination = f"ORIG{airports[i]}", terminals[i]
+            else:
+                origin, destination = terminals[i], f"DEST{airports[i]}"
+            lines.append(FLIGHT_TEMPLATE.format(
+                f"F{unit:06d}", f"{airlines[i]}{numbers[i]}", airlines[i], aircraft_types[i],
+                origin, destination, times[i], terminals[i],
+                "true" if arrivals[i] else "false", "null", critical[i], scores[i]
+            ))
+    
+    return ",\n".join(lines)
+
+
+def write_flights(file_path: str, tasks: List[Dict], workers: int = 1) -> None:
+    """
+    Generate the flight chunks and stream them to flights.json in order
+    
+    Parameters:
+    - file_path: Output file
+    - tasks: Chunk tasks (see generate_flight_chunk)
+    - workers: Number of worker processes (1 generates in this process)
+    """
+    with open(file_path, "w") as f:
+        f.write("[\n")
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunks = executor.map(generate_flight_chunk, tasks)
+                _write_chunks(f, chunks)
+        else:
+            _write_chunks(f, map(generate_flight_chunk, tasks))
+        f.write("\n]\n")
+
+
+def _write_chunks(f, chunks) -> None:
+    """Write chunks of flight lines, separated by commas"""
+    first = True
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if not first:
+            f.write(",\n")
+        f.write(chunk)
+        first = False
+
+
+def generate_stands(num_stands: int, terminals: List[str], rng: np.random.Generator) -> List[Dict]:
     """Generate stands for testing"""
-    stands = []
-    
     # Distribution of stand types
     contact_percentage = 0.7  # 70% contact stands
     
@@ -155,64 +221,54 @@ def generate_stands(num_stands: int, terminals: List[str]) -> List[Dict]:
         "Super": 0.1    # 10% super-capable stands
     }
     
+    stand_terminals = np.array(terminals, dtype=object)[rng.integers(0, len(terminals), size=num_stands)]
+    is_contact = rng.random(size=num_stands) < contact_percentage
+    size_limits = rng.choice(list(size_distribution), size=num_stands, p=list(size_distribution.values()))
+    
+    # Simple adjacency rules for 20% of stands, never with the stand itself
+    has_adjacency = rng.random(size=num_stands) < 0.2
+    adjacent_offsets = rng.integers(1, max(2, num_stands), size=num_stands)
+    
+    stands = []
     for i in range(num_stands):
-        stand_name = f"STAND{i+1:03d}"
-        terminal = random.choice(terminals)
-        is_contact = random.random() < contact_percentage
-        
-        # Select size limit based on distribution
-        size_rand = random.random()
-        if size_rand < size_distribution["Narrow"]:
-            size_limit = "Narrow"
-        elif size_rand < size_distribution["Narrow"] + size_distribution["Wide"]:
-            size_limit = "Wide"
-        else:
-            size_limit = "Super"
-        
-        # Simple adjacency rules for 20% of stands
         adjacency_rules = {}
-        if random.random() < 0.2:
-            adjacent_stand = f"STAND{random.randint(1, num_stands):03d}"
-            while adjacent_stand == stand_name:
-                adjacent_stand = f"STAND{random.randint(1, num_stands):03d}"
-            adjacency_rules = {"Incompatible": [adjacent_stand]}
+        if has_adjacency[i] and num_stands > 1:
+            adjacency_rules = {"Incompatible": [f"STAND{(i + adjacent_offsets[i]) % num_stands + 1:03d}"]}
         
         stands.append({
-            "StandName": stand_name,
-            "Terminal": terminal,
-            "IsContactStand": is_contact,
-            "SizeLimit": size_limit,
+            "StandName": f"STAND{i+1:03d}",
+            "Terminal": stand_terminals[i],
+            "IsContactStand": bool(is_contact[i]),
+            "SizeLimit": str(size_limits[i]),
             "AdjacencyRules": adjacency_rules
         })
     
     return stands
 
-def generate_airlines(num_airlines: int, terminals: List[str]) -> List[Dict]:
+
+def generate_airlines(num_airlines: int, terminals: List[str], rng: np.random.Generator) -> List[Dict]:
     """Generate airlines for testing"""
-    airlines = []
-    
-    # Airline codes (two letters)
+    # Unique airline codes (two letters)
     letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-    used_codes = set()
-    
-    for i in range(num_airlines):
-        # Generate unique airline code
-        while True:
-            code = random.choice(letters) + random.choice(letters)
-            if code not in used_codes:
-                used_codes.add(code)
-                break
-        
+    codes = rng.choice(len(letters) ** 2, size=num_airlines, replace=False)
+    base_terminals = rng.integers(0, len(terminals), size=num_airlines)
+    requires_contact = rng.random(size=num_airlines) < 0.5  # 50% require contact stands
+    tiers = rng.integers(1, 3, size=num_airlines, endpoint=True)  # Priority tiers 1-3
+    
+    airlines = []
+    for i, code_idx in enumerate(codes.tolist()):
+        code = letters[code_idx // len(letters)] + letters[code_idx % len(letters)]
         airlines.append({
             "AirlineCode": code,
             "AirlineName": f"Airline {code}",
-            "BaseTerminal": random.choice(terminals),
-            "RequiresContactStand": random.random() < 0.5,  # 50% require contact stands
-            "priority_tier": random.randint(1, 3)  # Priority tiers 1-3
+            "BaseTerminal": terminals[base_terminals[i]],
+            "RequiresContactStand": bool(requires_contact[i]),
+            "priority_tier": int(tiers[i])
         })
     
     return airlines
 
+
 def generate_settings() -> Dict:
     """Generate settings for testing"""
     return {
@@ -240,109 +296,80 @@ def generate_settings() -> Dict:
         }
     }
 
-def generate_maintenance_schedules(stands: List[Dict], start_date: datetime, end_date: datetime) -> List[Dict]:
+
+def generate_maintenance_schedules(stands: List[Dict], start_date: datetime, end_date: datetime,
+                                   rng: np.random.Generator) -> List[Dict]:
     """Generate maintenance schedules for testing"""
     maintenance = []
     
     # Randomly select 10% of stands for maintenance
-    maintenance_stands = random.sample(stands, int(len(stands) * 0.1))
+    maintenance_stands = rng.choice(len(stands), size=int(len(stands) * 0.1), replace=False)
     
-    for stand in maintenance_stands:
+    for stand_idx in maintenance_stands.tolist():
         # Generate 1-3 maintenance periods for each selected stand
-        for _ in range(random.randint(1, 3)):
-            # Maintenance periods between 2 hours and 2 days
-            maintenance_start = random_time_between(start_date, end_date - timedelta(days=2))
-            duration_hours = random.randint(2, 48)
-            maintenance_end = maintenance_start + timedelta(hours=duration_hours)
-            
+        num_periods = int(rng.integers(1, 3, endpoint=True))
+        # Maintenance periods between 2 hours and 2 days
+        starts = _random_times(rng, start_date, end_date - timedelta(days=2), num_periods)
+        durations = rng.integers(2, 48, size=num_periods, endpoint=True)
+        ends = starts + (durations * 3600).astype("timedelta64[s]")
+        
+        for maintenance_start, maintenance_end in zip(np.datetime_as_string(starts, unit="m"),
+                                                      np.datetime_as_string(ends, unit="m")):
             maintenance.append({
-                "StandName": stand["StandName"],
-                "StartTime": maintenance_start.strftime("%Y-%m-%dT%H:%M"),
-                "EndTime": maintenance_end.strftime("%Y-%m-%dT%H:%M")
+                "StandName": stands[stand_idx]["StandName"],
+                "StartTime": str(maintenance_start),
+                "EndTime": str(maintenance_end)
             })
     
     return maintenance
 
+
 def generate_data(args):
     """Generate the complete test dataset"""
+    start_time = time.perf_counter()
+    
     # Parse dates
     start_date = datetime.strptime(args.start_date, "%Y-%m-%d")
     end_date = datetime.strptime(args.end_date, "%Y-%m-%d")
     
-    # Define terminals
-    terminals = ["T1", "T2", "T3", "T4"]
-    
     # Generate airlines
-    airlines = generate_airlines(args.num_airlines, terminals)
+    airlines = generate_airlines(args.num_airlines, TERMINALS, _rng(args.seed, AIRLINE_STREAM))
     airline_codes = [airline["AirlineCode"] for airline in airlines]
     
     # Generate stands
-    stands = generate_stands(args.num_stands, terminals)
-    
-    # Generate flights
-    flights = []
-    flight_count = 0
+    stands = generate_stands(args.num_stands, TERMINALS, _rng(args.seed, STAND_STREAM))
     
     # Calculate how many linked pairs we need
     num_linked_pairs = int((args.num_flights * args.linked_pairs_percentage) / 200)
     num_single_flights = args.num_flights - (num_linked_pairs * 2)
-    
-    print(f"Generating {num_linked_pairs} linked pairs ({num_linked_pairs * 2} flights)")
-    
-    # Generate linked pairs
-    for i in range(num_linked_pairs):
-        flight_id = generate_flight_id(flight_count)
-        flight_count += 1
-        
-        airline_code = random.choice(airline_codes)
-        aircraft_type = select_aircraft_type()
-        arrival_time = random_time_between(start_date, end_date - timedelta(hours=24))
-        
-        # Get appropriate turnaround time based on aircraft type
-        if "A380" in aircraft_type or "B747" in aircraft_type or "AN225" in aircraft_type:
-            turnaround_time = 120
-        elif any(wide in aircraft_type for wide in ["B777", "B787", "A330", "A350"]):
-            turnaround_time = 90
-        else:
-            turnaround_time = 45
-        
-        arrival, departure = generate_linked_flights(
-            flight_id, airline_code, aircraft_type, arrival_time, turnaround_time, terminals
-        )
-        
-        flights.append(arrival)
-        flights.append(departure)
-    
-    print(f"Generating {num_single_flights} single flights")
-    
-    # Generate single flights
-    for i in range(num_single_flights):
-        flight_id = generate_flight_id(flight_count)
-        flight_count += 1
-        
-        airline_code = random.choice(airline_codes)
-        aircraft_type = select_aircraft_type()
-        flight_time = random_time_between(start_date, end_date)
-        is_arrival = random.random() < 0.5  # 50% arrivals, 50% departures
-        
-        flight = generate_single_flight(
-            flight_id, airline_code, aircraft_type, flight_time, terminals, is_arrival
-        )
-        
-        flights.append(flight)
-    
-    # Generate maintenance schedules
-    maintenance = generate_maintenance_schedules(stands, start_date, end_date)
-    
-    # Generate settings
-    settings = generate_settings()
+    num_units = num_linked_pairs + num_single_flights
+    
+    print(f"Generating {num_linked_pairs} linked pairs ({num_linked_pairs * 2} flights) "
+          f"and {num_single_flights} single flights")
+    
+    tasks = [
+        {
+            "seed": args.seed,
+            "chunk": chunk,
+            "first_unit": first_unit,
+            "num_units": min(CHUNK_SIZE, num_units - first_unit),
+            "num_linked_pairs": num_linked_pairs,
+            "airline_codes": airline_codes,
+            "start_date": args.start_date,
+            "end_date": args.end_date
+        }
+        for chunk, first_unit in enumerate(range(0, num_units, CHUNK_SIZE))
+    ]
     
     # Write to files
     output_dir = args.output
     os.makedirs(output_dir, exist_ok=True)
     
-    with open(os.path.join(output_dir, "flights.json"), "w") as f:
-        json.dump(flights, f, indent=2)
+    workers = args.workers or os.cpu_count() or 1
+    write_flights(os.path.join(output_dir, "flights.json"), tasks, min(workers, len(tasks)))
+    
+    # Generate maintenance schedules
+    maintenance = generate_maintenance_schedules(stands, start_date, end_date, _rng(args.seed, MAINTENANCE_STREAM))
     
     with open(os.path.join(output_dir, "stands.json"), "w") as f:
         json.dump(stands, f, indent=2)
@@ -351,17 +378,18 @@ def generate_data(args):
         json.dump(airlines, f, indent=2)
     
     with open(os.path.join(output_dir, "settings.json"), "w") as f:
-        json.dump(settings, f, indent=2)
+        json.dump(generate_settings(), f, indent=2)
     
     with open(os.path.join(output_dir, "maintenance_schedule.json"), "w") as f:
         json.dump(maintenance, f, indent=2)
     
-    print(f"Generated {len(flights)} flights, {len(stands)} stands, {len(airlines)} airlines")
+    print(f"Generated {args.num_flights} flights, {len(stands)} stands, {len(airlines)} airlines "
+          f"in {time.perf_counter() - start_time:.2f} seconds (seed {args.seed})")
     print(f"Output written to {output_dir}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Generate large flight dataset for testing")
-    parser.add_argument("--num-flights", type=int, default=DEFAULT_NUM_FLIGHTS, 
+    parser.add_argument("--num-flights", type=int, default=DEFAULT_NUM_FLIGHTS,
                         help=f"Number of flights to generate (default: {DEFAULT_NUM_FLIGHTS})")
     parser.add_argument("--start-date", type=str, default=DEFAULT_START_DATE,
                         help=f"Start date in YYYY-MM-DD format (default: {DEFAULT_START_DATE})")
@@ -372,9 +400,13 @@ if __name__ == "__main__":
     parser.add_argument("--num-airlines", type=int, default=DEFAULT_NUM_AIRLINES,
                         help=f"Number of airlines to generate (default: {DEFAULT_NUM_AIRLINES})")
     parser.add_argument("--linked-pairs-percentage", type=int, default=DEFAULT_LINKED_PAIRS_PERCENTAGE,
-                        help=f"Percentage of flights that are linked pairs (default: {DEFAULT_LINKED_PAIRS_PERCENTAGE}%)")
+                        help=f"Percentage of flights that are linked pairs (default: {DEFAULT_LINKED_PAIRS_PERCENTAGE}%%)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED,
+                        help=f"Random seed; the same seed and arguments give the same files (default: {DEFAULT_SEED})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes generating flight chunks (default: one per CPU)")
     parser.add_argument("--output", type=str, default="test_scenarios/large_scale_test",
                         help="Output directory for generated files")
     
     args = parser.parse_args()
-    generate_data(args) 
\ No newline at end of file
+    generate_data(args)
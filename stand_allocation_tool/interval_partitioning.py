@@ -0,0 +1,104 @@
+"""
+Interval Partitioning for Stand Allocation
+Optimal allocation of flights to a group of identical stands that no other flights can use
+"""
+
+import heapq
+
+
+def peak_overlap(intervals):
+    """
+    Count the most intervals that overlap at one time (sweep line)
+    
+    Parameters:
+    - intervals: List of (start, end) tuples, half-open ([start, end))
+    
+    Returns:
+    - Largest number of intervals that contain the same point in time
+    """
+    # An interval ending at a time is processed before one starting at that time
+    events = sorted([(start, 1) for start, _ in intervals] + [(end, -1) for _, end in intervals])
+    peak = 0
+    overlap = 0
+    for _, change in events:
+        overlap += change
+        peak = max(peak, overlap)
+    return peak
+
+
+def select_max_intervals(intervals, capacity, weights=None):
+    """
+    Select the most intervals such that at most `capacity` overlap at any time
+    
+    Sweeps the intervals in order of start time; whenever more than `capacity` are active,
+    the active interval that ends last is dropped. This keeps the largest possible number of
+    intervals (the rule is optimal for the count), and among intervals ending at the same
+    time the one with the lowest weight is dropped first.
+    
+    Parameters:
+    - intervals: List of (start, end) tuples, half-open ([start, end))
+    - capacity: Number of identical stands
+    - weights: Optional list of weights used to break ties
+    
+    Returns:
+    - List of indices of the selected intervals
+    """
+    if capacity <= 0:
+        return []
+    
+    weights = weights or [0] * len(intervals)
+    active_by_end = []  # min-heap of (end, idx) to expire finished intervals
+    active_by_drop = []  # min-heap of (-end, weight, idx) to drop the interval ending last
+    active = set()
+    dropped = set()
+    
+    for idx in sorted(range(len(intervals)), key=lambda idx: intervals[idx]):
+        start, end = intervals[idx]
+        while active_by_end and active_by_end[0][0] <= start:
+            active.discard(heapq.heappop(active_by_end)[1])
+        
+        active.add(idx)
+        heapq.heappush(active_by_end, (end, idx))
+        heapq.heappush(active_by_drop, (-end, weights[idx], idx))
+        
+        if len(active) > capacity:
+            # Skip entries of intervals that have already finished
+            while active_by_drop[0][2] not in active:
+                heapq.heappop(active_by_drop)
+            drop_idx = heapq.heappop(active_by_drop)[2]
+            active.discard(drop_idx)
+            dropped.add(drop_idx)
+    
+    return [idx for idx in range(len(intervals)) if idx not in dropped]
+
+
+def assign_intervals_to_stands(intervals, selected, num_stands):
+    """
+    Assign selected intervals to concrete stands (interval partitioning)
+    
+    Intervals are taken in order of start time and put on the stand that became free
+    the earliest. This needs no more stands than the most intervals overlapping at one
+    time, so any selection from select_max_intervals (or the min-cost-flow selection
+    in flow_allocator) fits.
+    
+    Parameters:
+    - intervals: List of (start, end) integer tuples, half-open ([start, end))
+    - selected: Indices of the intervals to assign
+    - num_stands: Number of stands
+    
+    Returns:
+    - Dict of interval index -> stand index (0 to num_stands - 1)
+    """
+    free_stands = [(float('-inf'), stand_idx) for stand_idx in range(num_stands)]
+    heapq.heapify(free_stands)
+    
+    assignment = {}
+    for idx in sorted(selected, key=lambda idx: intervals[idx]):
+        start, end = intervals[idx]
+        free_time, stand_idx = heapq.heappop(free_stands)
+        if free_time > start:
+            raise ValueError("Selected intervals need more stands than available")
+        assignment[idx] = stand_idx
+        heapq.heappush(free_stands, (end, stand_idx))
+    
+    return assignment
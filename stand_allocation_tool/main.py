@@ -14,6 +14,11 @@ from data_loader import (
 from maintenance_tracker import MockMaintenanceTracker
 from ai_support import MockAISupport
 from stand_allocation_engine import StandAllocationEngine
+from allocation_bounds import allocation_weight
+from profiler import profile_call, PROFILE_MODES, DEFAULT_SAMPLE_INTERVAL
+from allocation_metrics import AllocationMetrics
+from progress_events import create_progress_reporter, DEFAULT_THROTTLE_SECONDS
+from contextlib import nullcontext, redirect_stdout
 import time
 
 # Try to import tqdm, install if not available
@@ -31,20 +36,76 @@ except ImportError:
         # Fallback if tqdm can't be installed
         tqdm = lambda x, **kwargs: x
 
-def run_scenario(scenario_path, verbose=True):
+def run_scenario(scenario_path, verbose=True, report_bound=False, solver_parameters=None, phase_timer=None,
+                 settings_overrides=None, metrics=None, progress=None):
     """
     Run a stand allocation scenario
     
     Parameters:
     - scenario_path: Path to the scenario directory
     - verbose: Whether to print progress information
+    - report_bound: Whether to print the estimated optimality gap of the allocation
+    - solver_parameters: Optional dict of solver parameters that override the scenario settings
+    - phase_timer: Optional PhaseTimer that times loading the scenario as the "load" phase
+    - settings_overrides: Optional dict of other Settings attributes to override
+      (e.g. {"stand_selection_policy": "best_fit"})
+    - metrics: Optional AllocationMetrics object that the engine and the CP solver record their
+      counters, latencies and model statistics in
+    - progress: Optional ProgressReporter for the progress events of the engine and the CP solver
+      (progress bars if verbose and None)
     
     Returns:
     - Tuple of (allocated_flights_report, unallocated_flights_report)
     """
     if verbose:
         print(f"Loading scenario from: {scenario_path}")
-        
+    
+    with phase_timer.phase("load") if phase_timer else nullcontext():
+        flights, stands, airlines, settings, maintenance_schedules, connection_tracker = _load_scenario(
+            scenario_path, verbose
+        )
+    
+    if solver_parameters:
+        settings.solver_parameters.update(solver_parameters)
+    for name, value in (settings_overrides or {}).items():
+        setattr(settings, name, value)
+    
+    # Create helper objects
+    maintenance_tracker = MockMaintenanceTracker(maintenance_schedules)
+    ai_support = MockAISupport()
+    
+    # Create and run the allocation engine
+    if verbose:
+        print("\nInitializing stand allocation engine...")
+    engine = StandAllocationEngine(
+        flights, stands, airlines, settings, maintenance_tracker, ai_support, 
+        connection_tracker, verbose=verbose, metrics=metrics, progress=progress
+    )
+    
+    if verbose:
+        print("\nRunning allocation algorithm...")
+    allocated, unallocated = engine.run_allocation()
+    
+    if verbose:
+        print(f"\nAllocation complete: {len(allocated)} flights allocated, {len(unallocated)} flights unallocated")
+    
+    if report_bound:
+        print_optimality_gap(engine.compute_allocation_bound(), allocated)
+    
+    return allocated, unallocated
+
+def _load_scenario(scenario_path, verbose):
+    """
+    Load the data files of a scenario
+    
+    Parameters:
+    - scenario_path: Path to the scenario directory
+    - verbose: Whether to print progress information
+    
+    Returns:
+    - Tuple of (flights, stands, airlines, settings, maintenance_schedules, connection_tracker),
+      where connection_tracker is None if the scenario has no connections file
+    """
     # Load data from the scenario with progress indicators
     if verbose:
         print("Loading flights data...")
@@ -74,10 +135,6 @@ def run_scenario(scenario_path, verbose=True):
     if verbose:
         print(f"Loaded {len(maintenance_schedules)} maintenance entries")
     
-    # Create helper objects
-    maintenance_tracker = MockMaintenanceTracker(maintenance_schedules)
-    ai_support = MockAISupport()
-    
     # Check if connections file exists
     connections_path = os.path.join(scenario_path, 'connections.json')
     connection_tracker = None
@@ -88,22 +145,28 @@ def run_scenario(scenario_path, verbose=True):
         if verbose and connection_tracker:
             print(f"Loaded connections for {len(connection_tracker.connections)} flights")
     
-    # Create and run the allocation engine
-    if verbose:
-        print("\nInitializing stand allocation engine...")
-    engine = StandAllocationEngine(
-        flights, stands, airlines, settings, maintenance_tracker, ai_support, 
-        connection_tracker, verbose=verbose
-    )
-    
-    if verbose:
-        print("\nRunning allocation algorithm...")
-    allocated, unallocated = engine.run_allocation()
+    return flights, stands, airlines, settings, maintenance_schedules, connection_tracker
+
+def print_optimality_gap(bound, allocated_report):
+    """
+    Print how far an allocation is at most from the best possible allocation
     
-    if verbose:
-        print(f"\nAllocation complete: {len(allocated)} flights allocated, {len(unallocated)} flights unallocated")
+    Parameters:
+    - bound: AllocationBound object
+    - allocated_report: List of allocated flight reports
+    """
+    gap = bound.gap(len(allocated_report), allocation_weight(allocated_report))
+    print(f"\n===== OPTIMALITY GAP ESTIMATE ({bound.method} bound, {bound.compute_time:.2f} seconds) =====")
+    print(f"Allocated flights: {gap['allocated_flights']} (at most {gap['max_allocated_flights']} of "
+          f"{bound.total_flights} possible, gap {gap['flights_gap']:.2%})")
+    print(f"Criticality weight: {gap['allocated_weight']} (at most {gap['max_weight']}, gap {gap['weight_gap']:.2%})")
     
-    return allocated, unallocated
+    congested = [peak for peak in bound.class_peaks if peak["excess"] > 0]
+    if congested:
+        print(f"{len(congested)} stand classes have more concurrent demand than stands:")
+        for peak in congested[:5]:
+            print(f"  {peak['flight_units']} flight operations on {peak['stands']} stands, "
+                  f"peak demand {peak['peak_demand']}")
 
 def print_report(allocated_report, unallocated_report):
     """
@@ -193,24 +256,79 @@ def main():
     parser.add_argument('--compare', action='store_true', help='Compare with expected output')
     parser.add_argument('--quiet', action='store_true', help='Suppress progress output')
     parser.add_argument('--summary', action='store_true', help='Print only a summary of results')
+    parser.add_argument('--bound', action='store_true', help='Estimate the optimality gap of the allocation')
+    parser.add_argument('--metrics-output',
+                        help='Write the metrics of the run to this file in the OpenMetrics text format')
+    parser.add_argument('--profile', nargs='?', const='sampling', choices=PROFILE_MODES,
+                        help='Profile the run with the sampling (default) or deterministic profiler')
+    parser.add_argument('--profile-output', default='profile.collapsed',
+                        help='Collapsed-stack file of the profile, for flame graph tools')
+    parser.add_argument('--profile-top', type=int, default=20, help='Number of hot functions to list')
+    parser.add_argument('--profile-interval', type=float, default=DEFAULT_SAMPLE_INTERVAL * 1000,
+                        help='Time between samples of the sampling profiler in milliseconds')
+    parser.add_argument('--progress-output',
+                        help='Write progress events as JSON lines to this file ("-" for standard output)')
+    parser.add_argument('--progress-interval', type=float, default=DEFAULT_THROTTLE_SECONDS,
+                        help='Least time between two progress events of a phase in seconds')
+    parser.add_argument('--cp-report-dir',
+                        help='Write the model, search log and statistics of each CP solve to this directory')
     args = parser.parse_args()
     
-    # Run the scenario
-    allocated_report, unallocated_report = run_scenario(args.scenario_path, verbose=not args.quiet)
-    
-    # Print the report
-    if args.summary:
-        print(f"\nSummary: {len(allocated_report)} flights allocated, {len(unallocated_report)} flights unallocated")
-    else:
-        print_report(allocated_report, unallocated_report)
+    # Progress events on stdout keep it to JSON lines: the CP search log, the report and all
+    # other output go to stderr instead
+    events_on_stdout = args.progress_output == "-"
+    solver_parameters = {}
+    if args.cp_report_dir:
+        solver_parameters["cp_report_dir"] = args.cp_report_dir
+    if events_on_stdout:
+        solver_parameters["cp_log_to_stderr"] = True
     
-    # Compare with expected output (optional)
-    if args.compare:
-        matches = compare_with_expected(args.scenario_path, allocated_report, unallocated_report)
-        if matches:
-            print("\nResults match expected output.")
+    # Run the scenario
+    metrics = AllocationMetrics()
+    progress = create_progress_reporter(
+        verbose=not args.quiet, output=args.progress_output, throttle_seconds=args.progress_interval
+    )
+    with redirect_stdout(sys.stderr) if events_on_stdout else nullcontext():
+        try:
+            if args.profile:
+                (allocated_report, unallocated_report), profile = profile_call(
+                    run_scenario, args.scenario_path, verbose=not args.quiet, report_bound=args.bound,
+                    solver_parameters=solver_parameters, metrics=metrics, progress=progress,
+                    mode=args.profile, interval=args.profile_interval / 1000
+                )
+            else:
+                allocated_report, unallocated_report = run_scenario(
+                    args.scenario_path, verbose=not args.quiet, report_bound=args.bound,
+                    solver_parameters=solver_parameters, metrics=metrics, progress=progress
+                )
+        finally:
+            progress.close()
+        
+        if args.metrics_output:
+            metrics.set("allocated_flights", len(allocated_report))
+            metrics.set("unallocated_flights", len(unallocated_report))
+            scenario = os.path.basename(os.path.normpath(args.scenario_path))
+            metrics.write_openmetrics(args.metrics_output, labels={"scenario": scenario})
+        
+        # Print the report
+        if args.summary:
+            print(f"\nSummary: {len(allocated_report)} flights allocated, {len(unallocated_report)} flights unallocated")
         else:
-            print("\nResults DO NOT match expected output!")
+            print_report(allocated_report, unallocated_report)
+        
+        # Compare with expected output (optional)
+        if args.compare:
+            matches = compare_with_expected(args.scenario_path, allocated_report, unallocated_report)
+            if matches:
+                print("\nResults match expected output.")
+            else:
+                print("\nResults DO NOT match expected output!")
+        
+        # Report the profile last, so it is not buried in the allocation report
+        if args.profile:
+            profile.print_summary(args.profile_top)
+            profile.write_collapsed(args.profile_output)
+            print(f"\nCollapsed stacks written to {args.profile_output} (e.g. flamegraph.pl {args.profile_output} > profile.svg)")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
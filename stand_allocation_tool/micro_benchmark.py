@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the hot functions of the stand allocation engine.
+Runs each function over synthetic inputs of increasing size and reports operations per
+second and how the time per operation scales with the input size.
+"""
+
+import math
+import time
+import json
+import random
+import argparse
+from datetime import datetime, timedelta
+
+from data_structures import (
+    Flight, Stand, Airline, Settings, MaintenanceEntry, TransferWindow,
+    FlightConnectionTracker, FlightOperationUnit, parse_time
+)
+from maintenance_tracker import MockMaintenanceTracker
+from ai_support import MockAISupport
+from stand_allocation_engine import StandAllocationEngine
+
+DEFAULT_SIZES = [1000, 2000, 4000, 8000]
+START_DATE = datetime(2023, 1, 1)
+TERMINALS = ["T1", "T2", "T3"]
+AIRCRAFT_TYPES = ["A320", "B737", "E190", "B777", "A350", "A380", "B747"]
+SIZE_LIMITS = ["Narrow", "Wide", "Super"]
+
+def make_airlines(num_airlines, rng):
+    """Create airlines spread over the terminals"""
+    return [
+        Airline(f"A{idx:02d}", f"Airline {idx}", TERMINALS[idx % len(TERMINALS)],
+                RequiresContactStand=rng.random() < 0.3, priority_tier=rng.randint(1, 3))
+        for idx in range(num_airlines)
+    ]
+
+def make_stands(num_stands, rng):
+    """Create stands spread over the terminals"""
+    return [
+        Stand(f"S{idx:05d}", TERMINALS[idx % len(TERMINALS)], IsContactStand=rng.random() < 0.5,
+              SizeLimit=rng.choice(SIZE_LIMITS))
+        for idx in range(num_stands)
+    ]
+
+def make_flights(num_flights, airlines, rng, days=30):
+    """Create alternating arrivals and departures spread over a number of days"""
+    flights = []
+    for idx in range(num_flights):
+        airline = rng.choice(airlines)
+        scheduled = START_DATE + timedelta(minutes=rng.randint(0, days * 24 * 60))
+        flights.append(Flight(
+            FlightID=f"F{idx:07d}", FlightNumber=f"{airline.AirlineCode}{idx}", AirlineCode=airline.AirlineCode,
+            AircraftType=rng.choice(AIRCRAFT_TYPES), Origin="AAA", Destination="BBB",
+            ScheduledTime=scheduled.strftime("%Y-%m-%dT%H:%M"), Terminal=airline.BaseTerminal,
+            IsArrival=idx % 2 == 0
+        ))
+    return flights
+
+def make_settings():
+    """Create settings with the default weights"""
+    return Settings(GapBetweenFlights=15, TurnaroundTimeSettings={"Default": 45, "Narrow": 30, "Wide": 45, "Super": 60})
+
+def make_engine(flights, stands, airlines, maintenance_schedules=(), connection_tracker=None):
+    """Create an allocation engine over synthetic data"""
+    return StandAllocationEngine(
+        flights, stands, airlines, make_settings(), MockMaintenanceTracker(list(maintenance_schedules)),
+        MockAISupport(), connection_tracker
+    )
+
+def bench_check_stand_availability(size, rng):
+    """
+    _check_stand_availability on a stand with `size` allocated flights (interval tree query)
+    """
+    airlines = make_airlines(5, rng)
+    stand = make_stands(1, rng)[0]
+    engine = make_engine(make_flights(10, airlines, rng), [stand], airlines)
+    for idx in range(size):
+        start = START_DATE + timedelta(minutes=idx * 120)
+        engine._allocate_stand_to_flight(stand, None, engine.flights[0], start, start + timedelta(minutes=60))
+    
+    queries = []
+    for _ in range(1000):
+        start = START_DATE + timedelta(minutes=rng.randint(0, size * 120))
+        queries.append((start, start + timedelta(minutes=45)))
+    return lambda query: engine._check_stand_availability(stand.StandName, *query), queries
+
+def bench_identify_candidate_stands(size, rng):
+    """
+    _identify_candidate_stands with `size` stands (compatibility filter over all stands)
+    """
+    airlines = make_airlines(10, rng)
+    engine = make_engine(make_flights(200, airlines, rng), make_stands(size, rng), airlines)
+    queries = [(flight, engine._get_airline(flight.AirlineCode)) for flight in engine.flights]
+    return lambda query: engine._identify_candidate_stands(*query), queries
+
+def bench_get_connecting_flight_terminals(size, rng):
+    """
+    _get_connecting_flight_terminals with `size` flights, a tenth of them connecting
+    """
+    airlines = make_airlines(10, rng)
+    flights = make_flights(size, airlines, rng)
+    tracker = FlightConnectionTracker()
+    arrivals = [flight for flight in flights if flight.IsArrival]
+    departures = [flight for flight in flights if not flight.IsArrival]
+    for _ in range(size // 10):
+        tracker.add_connection(rng.choice(arrivals), rng.choice(departures), TransferWindow(30, 180))
+    engine = make_engine(flights, make_stands(30, rng), airlines, connection_tracker=tracker)
+    for flight in rng.sample(flights, size // 2):
+        engine.flight_terminals[flight.FlightID] = flight.Terminal
+    return engine._get_connecting_flight_terminals, flights[:1000]
+
+def bench_calculate_criticality_score(size, rng):
+    """
+    _calculate_criticality_score for units of a schedule with `size` flights
+    """
+    airlines = make_airlines(10, rng)
+    flights = make_flights(size, airlines, rng)
+    engine = make_engine(flights, make_stands(30, rng), airlines)
+    units = [FlightOperationUnit(arrival=flight) if flight.IsArrival else FlightOperationUnit(departure=flight)
+             for flight in flights[:1000]]
+    return engine._calculate_criticality_score, units
+
+def bench_parse_time(size, rng):
+    """
+    parse_time on `size` distinct ISO and legacy time strings
+    """
+    strings = []
+    for idx in range(size):
+        scheduled = START_DATE + timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+        strings.append(scheduled.strftime("%Y-%m-%dT%H:%M") if idx % 2 else scheduled.strftime("%H:%M"))
+    return parse_time, strings
+
+def bench_is_stand_under_maintenance(size, rng):
+    """
+    MockMaintenanceTracker.is_stand_under_maintenance with `size` maintenance entries
+    """
+    stand_names = [f"S{idx:05d}" for idx in range(100)]
+    entries = []
+    for _ in range(size):
+        start = START_DATE + timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+        entries.append(MaintenanceEntry(rng.choice(stand_names), start.strftime("%Y-%m-%dT%H:%M"),
+                                        (start + timedelta(hours=4)).strftime("%Y-%m-%dT%H:%M")))
+    tracker = MockMaintenanceTracker(entries)
+    queries = []
+    for _ in range(1000):
+        start = START_DATE + timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+        queries.append((rng.choice(stand_names), start, start + timedelta(hours=2)))
+    return lambda query: tracker.is_stand_under_maintenance(*query), queries
+
+BENCHMARKS = {
+    "check_stand_availability": bench_check_stand_availability,
+    "identify_candidate_stands": bench_identify_candidate_stands,
+    "get_connecting_flight_terminals": bench_get_connecting_flight_terminals,
+    "calculate_criticality_score": bench_calculate_criticality_score,
+    "parse_time": bench_parse_time,
+    "is_stand_under_maintenance": bench_is_stand_under_maintenance,
+}
+
+def measure(operation, inputs, min_time=0.2, repeat=3):
+    """
+    Measure the throughput of an operation
+    
+    The operation is applied to the inputs in turn until at least `min_time` seconds have
+    passed; the best of `repeat` such runs is reported.
+    
+    Parameters:
+    - operation: Function taking one input
+    - inputs: List of inputs
+    - min_time: Minimum duration of a run in seconds
+    - repeat: Number of runs
+    
+    Returns:
+    - Operations per second
+    """
+    best = 0.0
+    for _ in range(repeat):
+        ops = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time:
+            for item in inputs:
+                operation(item)
+                ops += 1
+                # Check the clock every few operations so that slow operations stop in time
+                if ops % 16 == 0 and time.perf_counter() - start >= min_time:
+                    break
+            elapsed = time.perf_counter() - start
+        best = max(best, ops / elapsed)
+    return best
+
+def fit_exponent(sizes, seconds_per_op):
+    """
+    Fit the exponent k of time per operation ~ size^k by least squares on a log-log scale
+    
+    Returns:
+    - Exponent (0 for constant time per operation, 1 for linear), or None for fewer than two sizes
+    """
+    if len(sizes) < 2:
+        return None
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(seconds) for seconds in seconds_per_op]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance if variance else None
+
+def run_micro_benchmarks(names, sizes, min_time=0.2, repeat=3, seed=42):
+    """
+    Run micro-benchmarks over increasing input sizes
+    
+    Parameters:
+    - names: Names of the benchmarks to run (keys of BENCHMARKS)
+    - sizes: List of input sizes
+    - min_time: Minimum duration of a measurement in seconds
+    - repeat: Number of measurements per size (the best is kept)
+    - seed: Random seed for the synthetic inputs
+    
+    Returns:
+    - List of result dicts with the ops/sec per size and the fitted scaling exponent
+    """
+    results = []
+    for name in names:
+        ops_per_second = []
+        for size in sizes:
+            operation, inputs = BENCHMARKS[name](size, random.Random(seed))
+            ops_per_second.append(measure(operation, inputs, min_time, repeat))
+        exponent = fit_exponent(sizes, [1 / ops for ops in ops_per_second])
+        results.append({
+            "benchmark": name,
+            "sizes": list(sizes),
+            "ops_per_second": ops_per_second,
+            "scaling_exponent": exponent
+        })
+        
+        throughput = "  ".join(f"{size}: {ops:,.0f}/s" for size, ops in zip(sizes, ops_per_second))
+        scaling = f"{exponent:+.2f}" if exponent is not None else "n/a"
+        print(f"{name:<32} {throughput}  (time/op ~ size^{scaling})")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark the hot functions of the allocation engine")
+    parser.add_argument("--benchmarks", type=str, nargs="+", choices=sorted(BENCHMARKS), default=list(BENCHMARKS),
+                      help="Benchmarks to run (default: all)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                      help="Input sizes (flights, stands, intervals or maintenance entries, per benchmark)")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                      help="Minimum duration of a measurement in seconds")
+    parser.add_argument("--repeat", type=int, default=3,
+                      help="Number of measurements per size (the best is kept)")
+    parser.add_argument("--seed", type=int, default=42,
+                      help="Random seed for the synthetic inputs")
+    parser.add_argument("--output", type=str,
+                      help="Output JSON file for the results")
+    
+    args = parser.parse_args()
+    
+    results = run_micro_benchmarks(args.benchmarks, args.sizes, args.min_time, args.repeat, args.seed)
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nMicro-benchmark results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Model Size Estimation for Stand Allocation
+Predicts the size and memory use of the CP model from the flight/stand compatibility
+structure, without building it, and selects the allocation engine that fits
+"""
+
+from dataclasses import dataclass
+from datetime import timedelta
+import logging
+
+logger = logging.getLogger('model_estimator')
+
+# Memory used per model constraint (calibrated on large_test_5k: ~1.15M constraints)
+# - while building the model in Python
+MODEL_MEMORY_PER_CONSTRAINT_KB = 0.4
+# - by each CP-SAT search worker
+SOLVER_MEMORY_PER_CONSTRAINT_KB = 0.7
+
+# Share of the available memory the CP solver may plan to use
+MEMORY_BUDGET_FRACTION = 0.75
+
+# Models with up to this many optional intervals are usually solved well within the time limit
+CP_DIRECT_MAX_INTERVALS = 20000
+
+# Window length used to estimate rolling-horizon model sizes (same default as the engine)
+DEFAULT_WINDOW_HOURS = 36
+
+
+@dataclass
+class ModelSizeEstimate:
+    """Estimated size of the CP model for an allocation problem"""
+    num_flights: int
+    num_stands: int
+    num_variables: int
+    num_intervals: int  # Optional flight/stand intervals (one per compatible flight/stand pair)
+    num_constraints: int
+    num_components: int  # Independent groups of flights and stands
+    largest_component_intervals: int
+    peak_window_flights: int  # Most flights starting within one rolling-horizon window
+    
+    def memory_mb(self, num_workers=1, scale=1.0):
+        """
+        Estimate the memory needed to build and solve the model
+        
+        Parameters:
+        - num_workers: Number of CP-SAT search workers
+        - scale: Share of the full model to estimate for (e.g. one component or window)
+        
+        Returns:
+        - Estimated memory in MB
+        """
+        per_constraint_kb = MODEL_MEMORY_PER_CONSTRAINT_KB + SOLVER_MEMORY_PER_CONSTRAINT_KB * num_workers
+        return self.num_constraints * scale * per_constraint_kb / 1024
+
+
+def _get_aircraft_category(aircraft_type):
+    """
+    Map an aircraft type to a size category (same as in StandAllocationEngine)
+    """
+    narrow_types = ["A320", "B737", "E190", "CRJ", "A220", "B717", "A319"]
+    wide_types = ["B777", "B787", "A330", "A350", "B767", "B757"]
+    super_types = ["A380", "B747", "AN225"]
+    
+    for narrow in narrow_types:
+        if narrow in aircraft_type:
+            return "Narrow"
+    
+    for wide in wide_types:
+        if wide in aircraft_type:
+            return "Wide"
+    
+    for super_type in super_types:
+        if super_type in aircraft_type:
+            return "Super"
+    
+    # Default to "Narrow" if unknown
+    return "Narrow"
+
+
+def _compatible_stand_indices(airline, aircraft_category, stands):
+    """
+    Get the stands a flight may use, with the same rules as the CP solver
+    
+    Parameters:
+    - airline: Airline object (or None)
+    - aircraft_category: Size category of the aircraft
+    - stands: List of Stand objects
+    
+    Returns:
+    - List of stand indices
+    """
+    compatibility = {
+        "Narrow": ["Narrow", "Wide", "Super"],
+        "Wide": ["Wide", "Super"],
+        "Super": ["Super"]
+    }
+    
+    compatible = []
+    for stand_idx, stand in enumerate(stands):
+        if airline and airline.BaseTerminal != stand.Terminal:
+            continue
+        if stand.SizeLimit not in compatibility.get(aircraft_category, []):
+            continue
+        if airline and airline.RequiresContactStand and not stand.IsContactStand:
+            continue
+        compatible.append(stand_idx)
+    
+    return compatible
+
+
+def estimate_cp_model_size(flights, stands, airlines, settings, maintenance_schedules=None):
+    """
+    Estimate the size of the CP model StandAllocationCPSolver would build
+    
+    Compatibility only depends on the airline and aircraft category, so it is worked out
+    once per (airline, category) group rather than per flight.
+    
+    Parameters:
+    - flights: List of Flight objects
+    - stands: List of Stand objects
+    - airlines: List of Airline objects
+    - settings: Settings object
+    - maintenance_schedules: Optional list of MaintenanceEntry objects
+    
+    Returns:
+    - ModelSizeEstimate object
+    """
+    airline_map = {airline.AirlineCode: airline for airline in airlines}
+    num_stands = len(stands)
+    has_gap = settings.GapBetweenFlights > 0
+    
+    # Group flights by the key that determines their compatible stands
+    group_flights = {}
+    group_stands = {}
+    flight_group = {}
+    for flight in flights:
+        category = _get_aircraft_category(flight.AircraftType)
+        key = (flight.AirlineCode, category)
+        if key not in group_stands:
+            group_stands[key] = _compatible_stand_indices(airline_map.get(flight.AirlineCode), category, stands)
+            group_flights[key] = 0
+        group_flights[key] += 1
+        flight_group[flight.FlightID] = key
+    
+    linked_flights = {}
+    for flight in flights:
+        if flight.LinkID:
+            linked_flights.setdefault(flight.LinkID, []).append(flight)
+    num_pairs = sum(1 for pair in linked_flights.values()
+                    if len(pair) == 2 and pair[0].IsArrival != pair[1].IsArrival)
+    num_single = sum(1 for flight in flights if not flight.LinkID)
+    
+    num_intervals = sum(group_flights[key] * len(group_stands[key]) for key in group_stands)
+    flights_per_stand = [0] * num_stands
+    for key, stand_indices in group_stands.items():
+        for stand_idx in stand_indices:
+            flights_per_stand[stand_idx] += group_flights[key]
+    
+    # Per flight: stand, start/end and allocated variables, the domain restriction to
+    # compatible stands, and the turnaround constraint for single flights
+    num_variables = 3 * len(flights) + num_single
+    num_constraints = sum(
+        group_flights[key] * (num_stands - len(group_stands[key]) + 2) for key in group_stands
+    ) + 3 * num_single
+    
+    # Per linked pair: same stand, allocated together and timing constraints
+    num_variables += 4 * num_pairs
+    num_constraints += 12 * num_pairs
+    
+    # Per optional interval: uses-stand literal, duration and the interval (twice with a gap)
+    num_variables += num_intervals * (5 if has_gap else 2)
+    num_constraints += num_intervals * (7 if has_gap else 3)
+    num_constraints += sum(1 for count in flights_per_stand if count)
+    
+    # Per maintenance entry: a separate interval and no-overlap for every flight on the stand
+    stand_indices = {stand.StandName: idx for idx, stand in enumerate(stands)}
+    for entry in maintenance_schedules or []:
+        stand_idx = stand_indices.get(entry.StandName)
+        if stand_idx is not None:
+            num_variables += 2 * flights_per_stand[stand_idx]
+            num_constraints += 4 * flights_per_stand[stand_idx] + 1
+    
+    num_components, largest_component_intervals = _estimate_components(
+        group_flights, group_stands, flight_group, linked_flights
+    )
+    
+    window_hours = settings.solver_parameters.get("rolling_window_hours", DEFAULT_WINDOW_HOURS)
+    
+    return ModelSizeEstimate(
+        num_flights=len(flights),
+        num_stands=num_stands,
+        num_variables=num_variables,
+        num_intervals=num_intervals,
+        num_constraints=num_constraints,
+        num_components=num_components,
+        largest_component_intervals=largest_component_intervals,
+        peak_window_flights=_peak_window_flights(flights, timedelta(hours=window_hours))
+    )
+
+
+def _estimate_components(group_flights, group_stands, flight_group, linked_flights):
+    """
+    Find the independent components of the problem at the level of compatibility groups
+    
+    Returns:
+    - Tuple of (number of components with at least one compatible stand,
+      optional intervals in the largest component)
+    """
+    parent = {key: key for key in group_stands}
+    
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+    
+    def union(key_a, key_b):
+        root_a, root_b = find(key_a), find(key_b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+    
+    first_group_on_stand = {}
+    for key, stand_indices in group_stands.items():
+        for stand_idx in stand_indices:
+            if stand_idx in first_group_on_stand:
+                union(first_group_on_stand[stand_idx], key)
+            else:
+                first_group_on_stand[stand_idx] = key
+    
+    for pair in linked_flights.values():
+        for flight in pair[1:]:
+            union(flight_group[pair[0].FlightID], flight_group[flight.FlightID])
+    
+    component_intervals = {}
+    for key, stand_indices in group_stands.items():
+        if stand_indices:
+            root = find(key)
+            component_intervals[root] = component_intervals.get(root, 0) + group_flights[key] * len(stand_indices)
+    
+    return len(component_intervals), max(component_intervals.values(), default=0)
+
+
+def _peak_window_flights(flights, window_length):
+    """
+    Count the most flights scheduled within any window of the given length
+    """
+    times = sorted(flight.parsed_time for flight in flights)
+    peak = 0
+    window_start_idx = 0
+    for idx, time_value in enumerate(times):
+        while time_value - times[window_start_idx] >= window_length:
+            window_start_idx += 1
+        peak = max(peak, idx - window_start_idx + 1)
+    return peak
+
+
+def select_engine(estimate, available_memory_mb=None, solver_available=True):
+    """
+    Choose the allocation engine for a problem from its estimated model size
+    
+    In order of preference:
+    - "cp": the full model is small enough to solve directly
+    - "decomposed": the model splits into independent components that are each small enough
+    - "hybrid": the full model fits in memory, so the CP solver can improve a greedy allocation
+    - "rolling_horizon": only a model of one time window fits in memory
+    - "greedy": no CP model fits (or OR-Tools is not available)
+    
+    Parameters:
+    - estimate: ModelSizeEstimate object
+    - available_memory_mb: Available memory in MB (None if unknown, memory is then not checked)
+    - solver_available: Whether OR-Tools can be imported
+    
+    Returns:
+    - Tuple of (engine mode, reason)
+    """
+    if not solver_available:
+        return "greedy", "OR-Tools is not installed"
+    
+    if estimate.num_intervals == 0:
+        return "greedy", "no flight has a compatible stand"
+    
+    budget_mb = available_memory_mb * MEMORY_BUDGET_FRACTION if available_memory_mb else None
+    full_memory_mb = estimate.memory_mb()
+    fits_memory = budget_mb is None or full_memory_mb <= budget_mb
+    
+    size = (f"{estimate.num_variables} variables, {estimate.num_constraints} constraints, "
+            f"{estimate.num_intervals} intervals, ~{full_memory_mb:.0f} MB")
+    
+    if fits_memory and estimate.num_intervals <= CP_DIRECT_MAX_INTERVALS:
+        engine, reason = "cp", f"model is small enough to solve directly ({size})"
+    elif fits_memory and estimate.num_components > 1 and estimate.largest_component_intervals <= CP_DIRECT_MAX_INTERVALS:
+        engine, reason = "decomposed", (f"model splits into {estimate.num_components} components of at most "
+                                        f"{estimate.largest_component_intervals} intervals ({size})")
+    elif fits_memory:
+        engine, reason = "hybrid", f"model fits in memory but is too large to solve from scratch ({size})"
+    else:
+        window_scale = min(1.0, estimate.peak_window_flights / max(1, estimate.num_flights))
+        if budget_mb is not None and estimate.memory_mb(scale=window_scale) <= budget_mb:
+            engine, reason = "rolling_horizon", (f"model needs more than the {budget_mb:.0f} MB budget, but a "
+                                                 f"window of {estimate.peak_window_flights} flights fits ({size})")
+        else:
+            engine, reason = "greedy", f"model needs more than the {budget_mb:.0f} MB memory budget ({size})"
+    
+    logger.info("Selected '%s' engine: %s", engine, reason)
+    return engine, reason
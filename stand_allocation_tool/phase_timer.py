@@ -0,0 +1,133 @@
+"""
+Phase Timing for Stand Allocation Benchmarks
+Accumulates wall-clock and CPU time per phase of an allocation run
+"""
+
+from contextlib import contextmanager
+import functools
+import time
+
+# Methods timed by PhaseTimer.instrument_allocation(), as (module, class, method, phase)
+ALLOCATION_PHASES = [
+    ("stand_allocation_engine", "StandAllocationEngine", "_prepare_flight_processing_order", "unit_preparation"),
+    ("stand_allocation_engine", "StandAllocationEngine", "_identify_candidate_stands", "candidate_generation"),
+    ("stand_allocation_engine", "StandAllocationEngine", "_unit_candidate_sets", "candidate_generation"),
+    ("stand_allocation_engine", "StandAllocationEngine", "_check_stand_availability", "occupancy_queries"),
+    ("stand_allocation_engine", "StandAllocationEngine", "_conflicting_intervals", "occupancy_queries"),
+    ("stand_allocation_engine", "StandAllocationEngine", "_allocate_stand_to_flight", "report_building"),
+    ("cp_solver", "StandAllocationCPSolver", "prepare_flights_data", "cp_model_build"),
+    ("cp_solver", "StandAllocationCPSolver", "solve", "cp_model_build"),
+    ("ortools.sat.python.cp_model", "CpSolver", "Solve", "cp_solve"),
+]
+
+
+class PhaseTimer:
+    """
+    Wall-clock and CPU time per phase
+    
+    Phases nest: time spent in an inner phase is only counted for the inner phase, so the
+    phases never overlap and add up to at most the total time. A phase entered again inside
+    itself (e.g. a timed method calling another method of the same phase) is counted once.
+    """
+    
+    def __init__(self):
+        self.phases = {}
+        self._stack = []
+    
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a block of code as a phase
+        
+        Parameters:
+        - name: Name of the phase
+        """
+        if self._stack and self._stack[-1][0] == name:
+            yield
+            return
+        
+        # [name, wall start, CPU start, wall time of inner phases, CPU time of inner phases]
+        frame = [name, time.perf_counter(), time.process_time(), 0.0, 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - frame[1]
+            cpu = time.process_time() - frame[2]
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][3] += wall
+                self._stack[-1][4] += cpu
+            
+            stats = self.phases.setdefault(name, {"wall_time": 0.0, "cpu_time": 0.0, "calls": 0})
+            stats["wall_time"] += wall - frame[3]
+            stats["cpu_time"] += cpu - frame[4]
+            stats["calls"] += 1
+    
+    def timed(self, function, name):
+        """
+        Wrap a function so that every call is timed as a phase
+        
+        Parameters:
+        - function: Function to wrap
+        - name: Name of the phase
+        
+        Returns:
+        - Wrapped function
+        """
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with self.phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+    
+    @contextmanager
+    def instrument(self, targets):
+        """
+        Time methods of classes as phases while the context is active
+        
+        The methods are replaced on the class, so instances created inside the context
+        (e.g. by run_scenario) are timed too. Each call costs about a microsecond extra.
+        
+        Parameters:
+        - targets: List of (class, method name, phase name) tuples
+        """
+        originals = []
+        try:
+            for cls, method_name, phase_name in targets:
+                original = cls.__dict__[method_name]
+                originals.append((cls, method_name, original))
+                setattr(cls, method_name, self.timed(original, phase_name))
+            yield self
+        finally:
+            for cls, method_name, original in reversed(originals):
+                setattr(cls, method_name, original)
+    
+    def instrument_allocation(self):
+        """
+        Time the phases of an allocation run (see ALLOCATION_PHASES)
+        
+        Classes whose module cannot be imported (e.g. without OR-Tools) are skipped.
+        
+        Returns:
+        - Context manager, as instrument()
+        """
+        import importlib
+        
+        targets = []
+        for module_name, class_name, method_name, phase_name in ALLOCATION_PHASES:
+            try:
+                module = importlib.import_module(module_name)
+            except ImportError:
+                continue
+            targets.append((getattr(module, class_name), method_name, phase_name))
+        return self.instrument(targets)
+    
+    def as_dict(self):
+        """
+        Get the phase times
+        
+        Returns:
+        - Dict of phase name -> {"wall_time", "cpu_time", "calls"}
+        """
+        return {name: dict(stats) for name, stats in self.phases.items()}
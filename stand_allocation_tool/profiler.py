@@ -0,0 +1,295 @@
+"""
+Profiling for Stand Allocation Runs
+Runs a function under a deterministic (cProfile) or sampling profiler and reports where the
+time goes as collapsed stacks for flame graphs and a hot-function summary per module
+"""
+
+from dataclasses import dataclass, field
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+
+DETERMINISTIC = "deterministic"
+SAMPLING = "sampling"
+PROFILE_MODES = (DETERMINISTIC, SAMPLING)
+
+# Modules always listed in the summary, in this order
+PROFILE_MODULES = ("stand_allocation_engine", "cp_solver", "data_loader", "intervaltree")
+
+# Default time between samples of the sampling profiler in seconds
+DEFAULT_SAMPLE_INTERVAL = 0.005
+# Deepest stack kept (deeper frames are cut off at the root end)
+MAX_STACK_DEPTH = 128
+# Stacks of the deterministic profile below this share of the total time are dropped
+MIN_STACK_SHARE = 1e-4
+
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def module_group(filename):
+    """
+    Group a source file by module for the summary
+    
+    Parameters:
+    - filename: Source file of a function (cProfile uses "~" for built-in functions)
+    
+    Returns:
+    - Module name for project files, the top-level package for installed packages,
+      "builtins" for built-in functions, "generated" for code without a source file
+      (e.g. dataclass __init__ methods) and "stdlib" for the rest
+    """
+    if filename in ("~", ""):
+        return "builtins"
+    if filename.startswith("<frozen"):
+        return "stdlib"
+    if filename.startswith("<"):
+        return "generated"
+    path = os.path.abspath(filename)
+    if os.path.dirname(path) == _PROJECT_DIR:
+        return os.path.splitext(os.path.basename(path))[0]
+    parts = path.split(os.sep)
+    for marker in ("site-packages", "dist-packages"):
+        if marker in parts:
+            package = parts[parts.index(marker) + 1]
+            return os.path.splitext(package)[0]
+    return "stdlib"
+
+
+def _frame_label(filename, function_name):
+    """Label of a frame in collapsed stacks, as module:function"""
+    label = f"{module_group(filename)}:{function_name}"
+    return label.replace(";", ",").replace(" ", "_")
+
+
+@dataclass
+class ProfileReport:
+    """Functions and stacks of a profiled run"""
+    mode: str
+    total_time: float
+    # Per function: "function", "module", "self_time", "cumulative_time", "calls" (None when sampled)
+    functions: list = field(default_factory=list)
+    # Collapsed stack ("root;...;leaf") -> weight (microseconds for deterministic, samples for sampling)
+    stacks: dict = field(default_factory=dict)
+    samples: int = 0
+    
+    def module_summary(self):
+        """
+        Self time per module
+        
+        Returns:
+        - List of {"module", "self_time", "share"} dicts, PROFILE_MODULES first, then by self time
+        """
+        totals = {module: 0.0 for module in PROFILE_MODULES}
+        for function in self.functions:
+            totals[function["module"]] = totals.get(function["module"], 0.0) + function["self_time"]
+        
+        measured = sum(totals.values()) or 1.0
+        order = list(PROFILE_MODULES) + sorted(
+            (module for module in totals if module not in PROFILE_MODULES), key=lambda m: -totals[m]
+        )
+        return [{"module": module, "self_time": totals[module], "share": totals[module] / measured}
+                for module in order]
+    
+    def top_functions(self, count=20):
+        """
+        Functions with the most self time
+        
+        Parameters:
+        - count: Number of functions
+        
+        Returns:
+        - List of function dicts (see functions)
+        """
+        return sorted(self.functions, key=lambda function: function["self_time"], reverse=True)[:count]
+    
+    def write_collapsed(self, file_path):
+        """
+        Write the stacks in the collapsed format of flamegraph.pl, speedscope and inferno
+        (one "root;...;leaf weight" line per stack)
+        
+        Parameters:
+        - file_path: Output file
+        """
+        with open(file_path, "w") as f:
+            for stack, weight in sorted(self.stacks.items()):
+                f.write(f"{stack} {weight}\n")
+    
+    def print_summary(self, count=20):
+        """
+        Print the self time per module and the hottest functions
+        
+        Parameters:
+        - count: Number of functions to list
+        """
+        detail = f", {self.samples} samples" if self.mode == SAMPLING else ""
+        print(f"\n=== Profile ({self.mode}, {self.total_time:.2f}s{detail}) ===")
+        print(f"{'Module':>26} | {'Self (s)':>9} | {'Share':>6}")
+        for row in self.module_summary():
+            print(f"{row['module']:>26} | {row['self_time']:9.3f} | {row['share']:6.1%}")
+        
+        print(f"\nTop {count} functions by self time:")
+        print(f"{'Self (s)':>9} | {'Cum. (s)':>9} | {'Calls':>9} | Function")
+        for function in self.top_functions(count):
+            calls = function["calls"] if function["calls"] is not None else "-"
+            print(f"{function['self_time']:9.3f} | {function['cumulative_time']:9.3f} | {calls:>9} | "
+                  f"{function['module']}:{function['function']}")
+    
+    def as_dict(self, count=20):
+        """
+        Get the summary as a JSON-serializable dict
+        
+        Parameters:
+        - count: Number of functions to include
+        
+        Returns:
+        - Dict with the mode, total time, module summary and top functions
+        """
+        return {
+            "mode": self.mode,
+            "total_time": self.total_time,
+            "samples": self.samples,
+            "modules": self.module_summary(),
+            "top_functions": self.top_functions(count)
+        }
+
+
+def _deterministic_report(profile, total_time):
+    """
+    Build a report from a cProfile profile
+    
+    cProfile only records caller -> callee edges, not full stacks, so the stacks are
+    reconstructed by splitting the self time of each function over its callers in
+    proportion to the time spent in each call edge, as flameprof does.
+    """
+    stats = pstats.Stats(profile).stats
+    
+    functions = []
+    for (filename, line, name), (_, calls, self_time, cumulative_time, _) in stats.items():
+        functions.append({
+            "function": name if filename == "~" else f"{name} ({os.path.basename(filename)}:{line})",
+            "module": module_group(filename),
+            "self_time": self_time,
+            "cumulative_time": cumulative_time,
+            "calls": calls
+        })
+    
+    min_time = max(total_time, 1e-9) * MIN_STACK_SHARE
+    stacks = {}
+    
+    def expand(key, path, amount):
+        callers = stats[key][4]
+        edges = {caller: edge[3] for caller, edge in callers.items()
+                 if caller in stats and caller != key and caller not in path}
+        edge_total = sum(edges.values())
+        if not edges or len(path) >= MAX_STACK_DEPTH:
+            labels = [_frame_label(func[0], func[2]) for func in [key] + path[::-1]]
+            stack = ";".join(labels)
+            stacks[stack] = stacks.get(stack, 0) + amount
+            return
+        for caller, edge_time in edges.items():
+            share = edge_time / edge_total if edge_total else 1 / len(edges)
+            if amount * share >= min_time:
+                expand(caller, path + [key], amount * share)
+    
+    for key, (_, _, self_time, _, _) in stats.items():
+        if self_time >= min_time:
+            expand(key, [], self_time)
+    
+    stacks = {stack: int(round(seconds * 1e6)) for stack, seconds in stacks.items()}
+    return ProfileReport(DETERMINISTIC, total_time, functions, {s: w for s, w in stacks.items() if w > 0})
+
+
+class _Sampler(threading.Thread):
+    """Thread that records the stack of another thread at a fixed interval"""
+    
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = {}
+        self.samples = 0
+        self._stop_event = threading.Event()
+    
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None or self._stop_event.is_set():
+                continue
+            labels = []
+            # Walk up to the profiled function, leaving out the frames of the caller of profile_call
+            while (frame is not None and frame.f_code is not _PROFILE_CALL_CODE
+                   and len(labels) < MAX_STACK_DEPTH):
+                labels.append(_frame_label(frame.f_code.co_filename, frame.f_code.co_name))
+                frame = frame.f_back
+            stack = ";".join(reversed(labels))
+            self.stacks[stack] = self.stacks.get(stack, 0) + 1
+            self.samples += 1
+    
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _sampling_report(stacks, samples, total_time):
+    """Build a report from sampled stacks, estimating times from the share of samples"""
+    seconds_per_sample = total_time / samples if samples else 0.0
+    functions = {}
+    for stack, count in stacks.items():
+        labels = stack.split(";")
+        for depth, label in enumerate(labels):
+            module, name = label.split(":", 1)
+            function = functions.setdefault(label, {
+                "function": name, "module": module, "self_time": 0.0, "cumulative_time": 0.0, "calls": None
+            })
+            # Count a function once per sample, even if it recurses
+            if label not in labels[:depth]:
+                function["cumulative_time"] += count * seconds_per_sample
+        functions[labels[-1]]["self_time"] += count * seconds_per_sample
+    return ProfileReport(SAMPLING, total_time, list(functions.values()), dict(stacks), samples)
+
+
+def profile_call(function, *args, mode=DETERMINISTIC, interval=DEFAULT_SAMPLE_INTERVAL, **kwargs):
+    """
+    Call a function under a profiler
+    
+    The deterministic profiler (cProfile) records every call, which makes Python code about
+    twice as slow but counts calls exactly. The sampling profiler records the stack of the
+    calling thread every `interval` seconds from a background thread, which costs a few
+    percent, but misses functions that take less time than the interval.
+    
+    Parameters:
+    - function: Function to call
+    - args, kwargs: Arguments of the function
+    - mode: One of PROFILE_MODES
+    - interval: Time between samples of the sampling profiler in seconds
+    
+    Returns:
+    - Tuple of (return value of the function, ProfileReport)
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode '{mode}', expected one of {', '.join(PROFILE_MODES)}")
+    
+    if mode == DETERMINISTIC:
+        profile = cProfile.Profile()
+        start_time = time.perf_counter()
+        profile.enable()
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            profile.disable()
+        return result, _deterministic_report(profile, time.perf_counter() - start_time)
+    
+    sampler = _Sampler(threading.get_ident(), interval)
+    start_time = time.perf_counter()
+    sampler.start()
+    try:
+        result = function(*args, **kwargs)
+    finally:
+        sampler.stop()
+    return result, _sampling_report(sampler.stacks, sampler.samples, time.perf_counter() - start_time)
+
+
+_PROFILE_CALL_CODE = profile_call.__code__
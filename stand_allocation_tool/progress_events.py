@@ -0,0 +1,237 @@
+"""
+Progress Events for Stand Allocation Runs
+Phase start/end events, throttled progress ticks and CP solver incumbents, written as JSON
+lines to a file or pipe and/or shown as progress bars on the console
+"""
+
+import json
+import sys
+import time
+
+try:
+    from tqdm import tqdm
+except ImportError:
+    # Without tqdm the console sink prints plain progress lines
+    tqdm = None
+
+# Least time between two progress ticks of a phase in seconds
+DEFAULT_THROTTLE_SECONDS = 0.5
+
+
+class JsonLinesSink:
+    """
+    Writes each event as one line of JSON, e.g. for the Node backend to read from a pipe
+    
+    Every line is flushed, so a reader sees events as they happen.
+    """
+    
+    def __init__(self, target):
+        """
+        Parameters:
+        - target: File path, "-" for standard output, or an open text file object
+        """
+        if target == "-":
+            self._file, self._owned = sys.stdout, False
+        elif isinstance(target, str):
+            self._file, self._owned = open(target, "w", buffering=1), True
+        else:
+            self._file, self._owned = target, False
+    
+    def write(self, event):
+        """Write an event"""
+        self._file.write(json.dumps(event, default=str) + "\n")
+        self._file.flush()
+    
+    def close(self):
+        """Close the file if this sink opened it"""
+        if self._owned:
+            self._file.close()
+
+
+class ConsoleSink:
+    """
+    Shows phases with a known total as tqdm progress bars (plain lines without tqdm)
+    and CP solver incumbents in the bar of their phase
+    """
+    
+    def __init__(self):
+        self._bars = {}
+    
+    def write(self, event):
+        """Show an event"""
+        kind = event["event"]
+        phase = event.get("phase")
+        if kind == "phase_start" and event.get("total"):
+            description = event.get("description", phase)
+            if tqdm is not None:
+                self._bars[phase] = tqdm(total=event["total"], desc=description, unit=event.get("unit", "it"))
+            else:
+                self._bars[phase] = {"description": description, "total": event["total"]}
+        elif kind in ("progress", "phase_end") and phase in self._bars and event.get("done") is not None:
+            self._update(phase, event["done"])
+        elif kind == "incumbent" and phase in self._bars:
+            postfix = (f"Solution #{event['solution']} - Objective: {event['objective']:.0f} "
+                       f"(bound {event['bound']:.0f}) - Time: {event['solve_time']:.1f}s")
+            if tqdm is not None:
+                self._bars[phase].set_postfix_str(postfix)
+            else:
+                print(f"\r{self._bars[phase]['description']}: {postfix}", end="", flush=True)
+        
+        if kind == "phase_end" and phase in self._bars:
+            bar = self._bars.pop(phase)
+            if tqdm is not None:
+                bar.close()
+            else:
+                print()
+    
+    def _update(self, phase, done):
+        bar = self._bars[phase]
+        if tqdm is not None:
+            bar.update(done - bar.n)
+        else:
+            print(f"\r{bar['description']}: {done}/{bar['total']}", end="", flush=True)
+    
+    def close(self):
+        """Close any open progress bars"""
+        for phase in list(self._bars):
+            self.write({"event": "phase_end", "phase": phase})
+
+
+class ProgressReporter:
+    """
+    Reports the progress of an allocation run to sinks (see JsonLinesSink and ConsoleSink)
+    
+    Events are dicts with "event" ("phase_start", "phase_end", "progress" or "incumbent"),
+    "phase", "time" (Unix time) and "elapsed" (seconds since the reporter was created), plus
+    event-specific fields. Progress ticks of a phase are throttled to one per throttle
+    interval. Without sinks every method returns at once; hot loops check `enabled` once
+    and skip ticking altogether.
+    """
+    
+    def __init__(self, sinks=(), throttle_seconds=DEFAULT_THROTTLE_SECONDS):
+        """
+        Parameters:
+        - sinks: Objects with write(event) and close() methods
+        - throttle_seconds: Least time between two progress ticks of a phase
+        """
+        self.sinks = list(sinks)
+        self.throttle_seconds = throttle_seconds
+        self._start_time = time.perf_counter()
+        self._phase_start_times = {}
+        self._last_tick_times = {}
+    
+    @property
+    def enabled(self):
+        """Whether any sink receives the events"""
+        return bool(self.sinks)
+    
+    def emit(self, event, **fields):
+        """
+        Send an event to every sink
+        
+        Parameters:
+        - event: Event type
+        - fields: Further fields of the event
+        """
+        if not self.sinks:
+            return
+        record = {"event": event, "time": time.time(),
+                  "elapsed": round(time.perf_counter() - self._start_time, 6), **fields}
+        for sink in self.sinks:
+            sink.write(record)
+    
+    def phase_start(self, phase, total=None, **fields):
+        """
+        Report the start of a phase
+        
+        Parameters:
+        - phase: Name of the phase (e.g. "greedy_allocation")
+        - total: Number of items the phase processes, if known
+        - fields: Further fields, e.g. "description" and "unit" for the console
+        """
+        if not self.sinks:
+            return
+        self._phase_start_times[phase] = time.perf_counter()
+        self._last_tick_times[phase] = self._phase_start_times[phase]
+        self.emit("phase_start", phase=phase, total=total, **fields)
+    
+    def phase_end(self, phase, **fields):
+        """
+        Report the end of a phase with its duration
+        
+        Parameters:
+        - phase: Name of the phase
+        - fields: Further fields, e.g. "done" and result counts
+        """
+        if not self.sinks:
+            return
+        start_time = self._phase_start_times.pop(phase, None)
+        duration = time.perf_counter() - start_time if start_time is not None else None
+        self.emit("phase_end", phase=phase, duration=duration, **fields)
+    
+    def due(self, phase, interval=None):
+        """
+        Check whether a progress tick of a phase is due, and if so start a new interval
+        
+        Parameters:
+        - phase: Name of the phase
+        - interval: Throttle interval in seconds (default: throttle_seconds)
+        
+        Returns:
+        - True if the last tick is at least the interval ago
+        """
+        if not self.sinks:
+            return False
+        now = time.perf_counter()
+        if now - self._last_tick_times.get(phase, 0.0) < (self.throttle_seconds if interval is None else interval):
+            return False
+        self._last_tick_times[phase] = now
+        return True
+    
+    def tick(self, phase, done, total=None, **fields):
+        """
+        Report the progress of a phase if a tick is due (see due)
+        
+        Parameters:
+        - phase: Name of the phase
+        - done: Number of items processed so far
+        - total: Number of items in total, if known
+        - fields: Further fields
+        """
+        if self.due(phase):
+            self.emit("progress", phase=phase, done=done, total=total, **fields)
+    
+    def incumbent(self, phase, **fields):
+        """
+        Report an improving solution of the CP solver
+        
+        Parameters:
+        - phase: Name of the solve phase
+        - fields: "solution", "objective", "bound", "gap" and "solve_time" (seconds since the solve started)
+        """
+        self.emit("incumbent", phase=phase, **fields)
+    
+    def close(self):
+        """Close every sink"""
+        for sink in self.sinks:
+            sink.close()
+
+
+def create_progress_reporter(verbose=False, output=None, throttle_seconds=DEFAULT_THROTTLE_SECONDS):
+    """
+    Create a progress reporter for a run
+    
+    Parameters:
+    - verbose: Whether to show progress bars on the console
+    - output: Optional JSON-lines target (file path, "-" for standard output, or a file object)
+    - throttle_seconds: Least time between two progress ticks of a phase
+    
+    Returns:
+    - ProgressReporter object (without sinks if neither is requested)
+    """
+    sinks = []
+    if verbose:
+        sinks.append(ConsoleSink())
+    if output is not None:
+        sinks.append(JsonLinesSink(output))
+    return ProgressReporter(sinks, throttle_seconds)
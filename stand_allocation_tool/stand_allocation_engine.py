@@ -2,12 +2,14 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Tuple, Optional
 from data_structures import Flight, Stand, Airline, Settings, FlightOperationUnit, MaintenanceEntry, TransferWindow, FlightConnectionTracker, calculate_time_difference_minutes
 from intervaltree import IntervalTree, Interval
-try:
-    from tqdm import tqdm
-except ImportError:
-    # Fallback if tqdm is not installed
-    tqdm = lambda x, **kwargs: x
+from model_estimator import estimate_cp_model_size, select_engine, MEMORY_BUDGET_FRACTION
+from interval_partitioning import select_max_intervals, assign_intervals_to_stands
+from allocation_bounds import compute_allocation_bound, flight_weight, allocation_weight
+from stand_selection import FreeGapIndex, select_stand, STAND_SELECTION_POLICIES, FIRST_FIT
+from allocation_metrics import AllocationMetrics
+from progress_events import create_progress_reporter
 import time
+import bisect
 
 class StandAllocationEngine:
     """
@@ -15,7 +17,7 @@ class StandAllocationEngine:
     """
     
     def __init__(self, flights, stands, airlines, settings, maintenance_tracker, ai_support, 
-                 connection_tracker=None, verbose=False):
+                 connection_tracker=None, verbose=False, metrics=None, progress=None):
         """
         Initialize the stand allocation engine
         
@@ -28,6 +30,8 @@ class StandAllocationEngine:
         - ai_support: MockAISupport object
         - connection_tracker: FlightConnectionTracker object (optional)
         - verbose: Whether to print progress information
+        - metrics: Optional AllocationMetrics object to record the run's metrics in (a new one if None)
+        - progress: Optional ProgressReporter for progress events (progress bars if verbose and None)
         """
         self.flights = flights
         self.stands = stands
@@ -37,6 +41,8 @@ class StandAllocationEngine:
         self.ai_support = ai_support
         self.connection_tracker = connection_tracker or FlightConnectionTracker()
         self.verbose = verbose
+        self.metrics = metrics if metrics is not None else AllocationMetrics()
+        self.progress = progress if progress is not None else create_progress_reporter(verbose)
         
         # Dictionary to map airline codes to Airline objects
         self.airline_map = {airline.AirlineCode: airline for airline in airlines}
@@ -44,6 +50,13 @@ class StandAllocationEngine:
         # Dictionary to store stand occupancy using interval trees
         self.stand_occupancy_log = {stand.StandName: IntervalTree() for stand in stands}
         
+        # Policy for choosing among the free candidate stands; all but first-fit use an index of free gaps
+        self.stand_selection_policy = getattr(settings, 'stand_selection_policy', FIRST_FIT)
+        if self.stand_selection_policy not in STAND_SELECTION_POLICIES:
+            print(f"Unknown stand selection policy '{self.stand_selection_policy}'. Using first-fit.")
+            self.stand_selection_policy = FIRST_FIT
+        self.free_gap_index = FreeGapIndex() if self.stand_selection_policy != FIRST_FIT else None
+        
         # Find the earliest and latest flight times to establish a global time reference
         all_times = [flight.parsed_time for flight in flights]
         self.earliest_time = min(all_times) if all_times else datetime(2000, 1, 1)
@@ -67,6 +80,8 @@ class StandAllocationEngine:
                     self.stand_occupancy_log[entry.StandName].add(
                         Interval(start_timestamp, end_timestamp, {'type': 'maintenance', 'entry': entry})
                     )
+                    if self.free_gap_index is not None:
+                        self.free_gap_index.add(entry.StandName, start_timestamp, end_timestamp)
         
         # Reports for allocated and unallocated flights
         self.allocated_flights_report = []
@@ -127,100 +142,920 @@ class StandAllocationEngine:
         """
         Run the stand allocation algorithm
         
+        The engine is chosen with the "engine" solver parameter:
+        - "greedy": the greedy algorithm only
+        - "flow": min-cost flow on each class of interchangeable stands, falling back to greedy if it fails
+        - "cp": the CP solver, falling back to greedy if it fails
+        - "hybrid": the greedy algorithm first, then the CP solver warm-started from its result
+        - "rolling_horizon": the CP solver over overlapping time windows, falling back to greedy if it fails
+        - "adaptive": the greedy algorithm for quiet periods and the CP solver for congested windows
+        - "decomposed": the CP solver on each independent group of flights and stands in parallel processes,
+          falling back to greedy if it fails
+        - "auto": one of the above, chosen from the estimated size of the CP model
+        If "engine" is not set, "use_solver" selects between "cp" and "greedy".
+        
         Returns:
         - Tuple of (allocated_flights_report, unallocated_flights_report)
         """
-        # Check if we should use the CP solver
-        use_solver = self.settings.solver_parameters.get("use_solver", False)
+        engine_mode = self._resolve_engine_mode()
+        self.metrics.set_info("engine", engine_mode)
+        
+        if engine_mode == "hybrid":
+            return self._run_warm_start_allocation()
+        
+        if engine_mode == "flow":
+            solver_result = self._run_flow_allocation()
+            if solver_result:
+                return solver_result
+        elif engine_mode == "cp":
+            solver_result = self._run_cp_allocation()
+            if solver_result:
+                return solver_result
+        elif engine_mode == "decomposed":
+            solver_result = self._run_cp_allocation(decompose=True)
+            if solver_result:
+                return solver_result
+        elif engine_mode == "rolling_horizon":
+            solver_result = self._run_rolling_horizon_allocation()
+            if solver_result:
+                return solver_result
+        elif engine_mode == "adaptive":
+            solver_result = self._run_adaptive_allocation()
+            if solver_result:
+                return solver_result
+        elif self.verbose:
+            print("Using greedy algorithm for allocation...")
+        
+        # Fall back to the greedy algorithm if the CP solver was not used or failed
+        return self._run_greedy_allocation()
+    
+    def _resolve_engine_mode(self):
+        """
+        Decide which allocation engine to run from the solver parameters
+        
+        Returns:
+        - String engine mode ("greedy", "flow", "cp", "hybrid", "rolling_horizon", "adaptive" or "decomposed")
+        """
+        solver_parameters = self.settings.solver_parameters
+        use_solver = solver_parameters.get("use_solver", False)
+        engine_mode = solver_parameters.get("engine", "cp" if use_solver else "greedy")
         
-        # For very large problems (>25k flights), automatically use greedy algorithm
-        # unless explicitly specified to use the solver
-        auto_use_greedy = len(self.flights) > 25000 and not self.settings.solver_parameters.get("force_solver", False)
+        if engine_mode not in ("greedy", "flow", "cp", "hybrid", "rolling_horizon", "adaptive", "decomposed", "auto"):
+            print(f"Unknown allocation engine '{engine_mode}'. Using greedy algorithm.")
+            return "greedy"
         
-        if auto_use_greedy and use_solver:
+        # Neither builds a CP model, so the model size does not matter
+        if engine_mode in ("greedy", "flow"):
+            return engine_mode
+        
+        estimate = self._estimate_model_size()
+        solver_available, available_memory_mb = self._cp_solver_resources()
+        
+        if engine_mode == "auto":
+            engine_mode, reason = select_engine(estimate, available_memory_mb, solver_available)
+            if self.verbose:
+                print(f"Automatically selected '{engine_mode}' engine: {reason}")
+            return engine_mode
+        
+        # The rolling horizon and adaptive engines keep each model to one time window, so
+        # they are not limited by the size of the whole schedule
+        if engine_mode in ("rolling_horizon", "adaptive") or solver_parameters.get("force_solver", False):
+            return engine_mode
+        
+        # Use the greedy algorithm if the full CP model would not fit in memory. If the
+        # available memory is unknown, fall back to a fixed limit of 25k flights.
+        if available_memory_mb is not None:
+            estimated_memory_mb = estimate.memory_mb()
+            too_large = estimated_memory_mb > available_memory_mb * MEMORY_BUDGET_FRACTION
+            size_description = (f"Estimated CP model memory ({estimated_memory_mb:.0f} MB) exceeds "
+                                f"the memory budget ({available_memory_mb * MEMORY_BUDGET_FRACTION:.0f} MB).")
+        else:
+            too_large = len(self.flights) > 25000
+            size_description = f"Problem size ({len(self.flights)} flights) exceeds threshold for CP solver."
+        
+        if too_large:
             if self.verbose:
-                print(f"Problem size ({len(self.flights)} flights) exceeds threshold for CP solver.")
+                print(size_description)
                 print("Automatically using greedy algorithm for better performance.")
                 print("Set 'force_solver' to true in settings to override this behavior.")
-            use_solver = False
+            return "greedy"
+        
+        return engine_mode
+    
+    def _estimate_model_size(self):
+        """
+        Estimate the size of the CP model for this problem without building it
+        
+        Returns:
+        - ModelSizeEstimate object
+        """
+        maintenance_schedules = getattr(self.maintenance_tracker, 'maintenance_schedules', [])
+        return estimate_cp_model_size(self.flights, self.stands, self.airlines, self.settings, maintenance_schedules)
+    
+    def _cp_solver_resources(self):
+        """
+        Check whether the CP solver can be used and how much memory it has
+        
+        Returns:
+        - Tuple of (solver_available, available_memory_mb), where the memory is None if unknown
+        """
+        try:
+            # Import the CP solver at runtime to avoid import errors if OR-Tools is not installed
+            from cp_solver import get_available_memory_mb
+        except ImportError:
+            return False, None
+        
+        return True, get_available_memory_mb()
+    
+    def _run_cp_allocation(self, hint_allocation=None, decompose=False):
+        """
+        Run the CP solver for allocation
+        
+        Parameters:
+        - hint_allocation: Optional dict of FlightID -> StandName to warm-start the solver
+        - decompose: Whether to solve independent components as separate models in parallel
         
-        if use_solver:
+        Returns:
+        - Tuple of (allocated_flights_report, unallocated_flights_report), or None if
+          the solver could not be used or found no solution
+        """
+        try:
+            # Import the CP solver at runtime to avoid import errors if OR-Tools is not installed
+            from cp_solver import StandAllocationCPSolver
+            import logging
+            
+            # Configure logging
+            logging_level = logging.INFO if self.verbose else logging.WARNING
+            logging.basicConfig(level=logging_level, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            logger = logging.getLogger('stand_allocation_engine')
+            
+            # Create and run the CP solver
+            if self.verbose:
+                print("Using CP solver for allocation...")
+            start_time = time.time()
+            
             try:
-                # Import the CP solver at runtime to avoid import errors if OR-Tools is not installed
-                from cp_solver import StandAllocationCPSolver
-                import time
-                import logging
+                cp_solver = StandAllocationCPSolver(
+                    self.flights, self.stands, self.airlines, self.settings, 
+                    self.maintenance_tracker, self.ai_support, verbose=self.verbose, metrics=self.metrics,
+                    progress=self.progress
+                )
+                if decompose:
+                    solver_allocated_report, solver_unallocated_report = cp_solver.solve_decomposed()
+                elif hint_allocation is None and self.settings.solver_parameters.get("presolve_reduction", True):
+                    # Only the contended core of the problem goes into the CP model
+                    solver_allocated_report, solver_unallocated_report = cp_solver.solve_reduced()
+                else:
+                    solver_allocated_report, solver_unallocated_report = cp_solver.solve(hint_allocation=hint_allocation)
                 
-                # Configure logging
-                logging_level = logging.INFO if self.verbose else logging.WARNING
-                logging.basicConfig(level=logging_level, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-                logger = logging.getLogger('stand_allocation_engine')
+                if solver_allocated_report:  # If the solver found a solution
+                    # Return the solution
+                    self.allocated_flights_report = solver_allocated_report
+                    self.unallocated_flights_report = solver_unallocated_report
+                    
+                    if self.verbose:
+                        end_time = time.time()
+                        time_diff = end_time - start_time
+                        print(f"CP solver completed in {time_diff:.2f} seconds")
+                        print(f"Allocated {len(solver_allocated_report)} flights, Unallocated {len(solver_unallocated_report)} flights")
+                    
+                    return solver_allocated_report, solver_unallocated_report
+                else:
+                    if self.verbose:
+                        print("CP solver could not find a solution. Falling back to greedy algorithm.")
+            except Exception as e:
+                import traceback
+                print(f"Error using CP solver: {str(e)}. Falling back to greedy algorithm.")
+                if self.verbose:
+                    print("Detailed error:")
+                    traceback.print_exc()
+        
+        except Exception as e:
+            # Log the error and fall back to the greedy algorithm
+            if self.verbose:
+                print(f"Error using CP solver: {str(e)}. Falling back to greedy algorithm.")
+        
+        return None
+    
+    def _run_warm_start_allocation(self):
+        """
+        Run the greedy algorithm, then improve its result with the CP solver
+        
+        The greedy allocation is passed to the CP solver as a solution hint and its
+        objective as a lower bound, so the solver starts from a good incumbent and
+        spends its time limit improving it. If the solver fails, the greedy result is kept.
+        
+        Returns:
+        - Tuple of (allocated_flights_report, unallocated_flights_report)
+        """
+        if self.verbose:
+            print("Using greedy algorithm to warm-start the CP solver...")
+        
+        greedy_allocated, greedy_unallocated = self._run_greedy_allocation(log_unallocated=False)
+        greedy_allocations = dict(self.flight_allocations)
+        
+        solver_result = self._run_cp_allocation(hint_allocation=greedy_allocations)
+        if solver_result:
+            return solver_result
+        
+        if self.verbose:
+            print("Keeping the greedy allocation.")
+        
+        # The greedy result stands, so report its unallocated flights now
+        self.allocated_flights_report = greedy_allocated
+        self.unallocated_flights_report = greedy_unallocated
+        self._log_unallocated_to_ai_support(greedy_unallocated)
+        
+        return greedy_allocated, greedy_unallocated
+    
+    def _run_rolling_horizon_allocation(self):
+        """
+        Run the CP solver over overlapping time windows, one window after another
+        
+        Each window solves the flights that start in it (linked pairs are kept together and
+        start at their arrival). Flights in the part of a window that overlaps the next one
+        are solved again in the next window; the others are committed, and their stand
+        occupancy is fixed in every later window. The model size is therefore bounded by
+        the window length rather than the length of the schedule.
+        
+        Window settings (solver parameters):
+        - rolling_window_hours: Length of each window (default 36)
+        - rolling_overlap_hours: Overlap between consecutive windows (default 12)
+        - rolling_window_time_limit_seconds: Time limit for each window (default 10)
+        
+        Returns:
+        - Tuple of (allocated_flights_report, unallocated_flights_report), or None if
+          a window could not be solved
+        """
+        try:
+            from cp_solver import StandAllocationCPSolver
+        except ImportError as e:
+            if self.verbose:
+                print(f"Error using CP solver: {str(e)}. Falling back to greedy algorithm.")
+            return None
+        
+        solver_parameters = self.settings.solver_parameters
+        window_length = timedelta(hours=solver_parameters.get("rolling_window_hours", 36))
+        overlap = timedelta(hours=solver_parameters.get("rolling_overlap_hours", 12))
+        window_time_limit = solver_parameters.get("rolling_window_time_limit_seconds", 10)
+        
+        if overlap < timedelta(0) or overlap >= window_length:
+            print("Window overlap must be shorter than the window. Using windows without overlap.")
+            overlap = timedelta(0)
+        commit_length = window_length - overlap
+        
+        units = self._rolling_horizon_units()
+        if not units:
+            return None
+        
+        if self.verbose:
+            print(f"Using rolling-horizon CP solver for {len(units)} flight operations "
+                  f"({window_length} windows, {overlap} overlap)...")
+        start_time = time.time()
+        
+        allocated_report = []
+        unallocated_report = []
+        fixed_occupancy = []
+        gap = timedelta(minutes=self.settings.GapBetweenFlights)
+        
+        position = 0
+        window_start = units[0][0]
+        window_count = 0
+        
+        try:
+            while position < len(units):
+                # Skip stretches of the schedule without flights
+                window_start = max(window_start, units[position][0])
+                window_end = window_start + window_length
+                commit_end = window_start + commit_length
+                
+                window_stop = position
+                while window_stop < len(units) and units[window_stop][0] < window_end:
+                    window_stop += 1
+                commit_stop = position
+                while commit_stop < window_stop and (units[commit_stop][0] < commit_end or window_stop == len(units)):
+                    commit_stop += 1
+                
+                window_flights = [flight for _, unit_flights in units[position:window_stop] for flight in unit_flights]
+                committed_ids = {flight.FlightID for _, unit_flights in units[position:commit_stop] for flight in unit_flights}
+                
+                # Occupancy that ends (gap included) before the window's first day cannot overlap it
+                cutoff = datetime.combine(window_start.date(), datetime.min.time())
+                fixed_occupancy = [entry for entry in fixed_occupancy if entry[2] + gap > cutoff]
+                
+                cp_solver = StandAllocationCPSolver(
+                    window_flights, self.stands, self.airlines, self.settings,
+                    self.maintenance_tracker, self.ai_support, verbose=False,
+                    fixed_occupancy=fixed_occupancy, metrics=self.metrics, progress=self.progress
+                )
+                window_allocated, window_unallocated = cp_solver.solve(
+                    time_limit=window_time_limit, log_unallocated=False
+                )
+                window_count += 1
+                
+                if not window_allocated and not window_unallocated:
+                    print(f"CP solver could not solve the window starting {window_start}. Falling back to greedy algorithm.")
+                    return None
+                
+                # Commit the flights outside the overlap and fix their stand occupancy
+                for allocation in window_allocated:
+                    if allocation['flight'].FlightID in committed_ids:
+                        allocated_report.append(allocation)
+                        fixed_occupancy.append(cp_solver.solution_occupancy[allocation['flight'].FlightID])
+                for unallocation in window_unallocated:
+                    if unallocation['flight'].FlightID in committed_ids:
+                        unallocated_report.append(unallocation)
                 
-                # Create and run the CP solver
                 if self.verbose:
-                    print("Using CP solver for allocation...")
-                start_time = time.time()
+                    print(f"Window {window_count} ({window_start:%Y-%m-%d %H:%M}): {len(window_flights)} flights solved, "
+                          f"{len(committed_ids)} committed")
                 
-                try:
-                    cp_solver = StandAllocationCPSolver(
-                        self.flights, self.stands, self.airlines, self.settings, 
-                        self.maintenance_tracker, self.ai_support, verbose=self.verbose
-                    )
-                    solver_allocated_report, solver_unallocated_report = cp_solver.solve()
-                    
-                    if solver_allocated_report:  # If the solver found a solution
-                        # Return the solution
-                        self.allocated_flights_report = solver_allocated_report
-                        self.unallocated_flights_report = solver_unallocated_report
-                        
-                        if self.verbose:
-                            end_time = time.time()
-                            time_diff = end_time - start_time
-                            print(f"CP solver completed in {time_diff:.2f} seconds")
-                            print(f"Allocated {len(solver_allocated_report)} flights, Unallocated {len(solver_unallocated_report)} flights")
-                        
-                        return solver_allocated_report, solver_unallocated_report
-                    else:
-                        if self.verbose:
-                            print("CP solver could not find a solution. Falling back to greedy algorithm.")
-                except Exception as e:
-                    import traceback
-                    print(f"Error using CP solver: {str(e)}. Falling back to greedy algorithm.")
-                    if self.verbose:
-                        print("Detailed error:")
-                        traceback.print_exc()
+                position = commit_stop
+                window_start = commit_end
+        except Exception as e:
+            import traceback
+            print(f"Error using rolling-horizon CP solver: {str(e)}. Falling back to greedy algorithm.")
+            if self.verbose:
+                print("Detailed error:")
+                traceback.print_exc()
+            return None
+        
+        self.allocated_flights_report = allocated_report
+        self.unallocated_flights_report = unallocated_report
+        self._log_unallocated_to_ai_support(unallocated_report)
+        
+        if self.verbose:
+            print(f"Rolling-horizon CP solver completed {window_count} windows in {time.time() - start_time:.2f} seconds")
+            print(f"Allocated {len(allocated_report)} flights, Unallocated {len(unallocated_report)} flights")
+        
+        return allocated_report, unallocated_report
+    
+    def _run_adaptive_allocation(self):
+        """
+        Run the greedy algorithm for quiet periods and the CP solver for congested windows
+        
+        A sweep line over the demand for each class of candidate stands marks the periods where
+        demand reaches "congestion_threshold" times the class's stands; these periods, padded by
+        "congestion_padding_minutes", are the congested windows (see _find_congested_windows).
+        The period around each flight the greedy algorithm cannot allocate is a window too.
+        
+        The greedy algorithm allocates all flights first. Each window in which it left flights
+        unallocated is then solved again with the CP solver: the flights that overlap the window
+        and can use one of its stands are released, and the CP solver allocates them with the
+        stand occupancy of all other flights fixed and their greedy allocation as a lower bound.
+        If the CP solver cannot solve a window, or allocates fewer flights or less weight than
+        the greedy algorithm did, the greedy allocation of the window is kept. So the result is
+        never worse than the greedy algorithm's.
+        
+        Window settings (solver parameters):
+        - congestion_threshold: Share of a class's stands in use that counts as congested (default 0.85)
+        - congestion_padding_minutes: Time added on both sides of a congested period (default 60)
+        - adaptive_window_time_limit_seconds: Time limit for each congested window (default 10)
+        
+        Returns:
+        - Tuple of (allocated_flights_report, unallocated_flights_report), or None if
+          the CP solver is not available
+        """
+        try:
+            from cp_solver import StandAllocationCPSolver
+        except ImportError as e:
+            if self.verbose:
+                print(f"Error using CP solver: {str(e)}. Falling back to greedy algorithm.")
+            return None
+        
+        solver_parameters = self.settings.solver_parameters
+        window_time_limit = solver_parameters.get("adaptive_window_time_limit_seconds", 10)
+        padding = timedelta(minutes=solver_parameters.get("congestion_padding_minutes", 60))
+        start_time = time.time()
+        
+        flight_units = self._prepare_flight_processing_order()
+        unit_occupancy = [self._calculate_stand_occupancy_duration(unit) for unit in flight_units]
+        unit_candidates = self._unit_candidate_sets(flight_units)
+        congested_windows = self._find_congested_windows(flight_units, unit_occupancy, unit_candidates)
+        
+        if self.verbose:
+            print(f"Found {len(congested_windows)} congested windows")
+            print(f"Allocating {len(flight_units)} flight operations with the greedy algorithm...")
+        self._run_greedy_allocation(log_unallocated=False, flight_units=flight_units)
+        
+        # Periods in which the greedy algorithm leaves flights unallocated are windows too
+        failed_windows = [
+            (candidates, unit_start - padding, unit_end + padding)
+            for unit, (unit_start, unit_end), candidates in zip(flight_units, unit_occupancy, unit_candidates)
+            if candidates and (unit.arrival or unit.departure).FlightID not in self.flight_allocations
+        ]
+        windows = self._merge_windows(congested_windows + failed_windows)
+        window_units, _ = self._assign_units_to_windows(windows, flight_units, unit_occupancy, unit_candidates)
+        
+        # Stand occupancy of every allocated flight, to fix it while another window is solved
+        occupancy_by_flight = {}
+        for unit in flight_units:
+            for entry in self._allocated_unit_occupancy([unit]):
+                occupancy_by_flight[(unit.arrival or unit.departure).FlightID] = entry
+        
+        solved_windows = 0
+        cp_allocated = []
+        cp_unallocated = []
+        for (window_stands, window_start, window_end), units in zip(windows, window_units):
+            window_flights = [flight for unit in units for flight in (unit.arrival, unit.departure) if flight]
+            window_ids = {flight.FlightID for flight in window_flights}
+            greedy_allocated = [allocation for allocation in self.allocated_flights_report
+                                if allocation['flight'].FlightID in window_ids]
+            if len(greedy_allocated) == len(window_flights):
+                continue  # Nothing to gain
+            greedy_unallocated = [unallocation for unallocation in self.unallocated_flights_report
+                                  if unallocation['flight'].FlightID in window_ids]
             
+            hint_allocation = self._release_units(units)
+            fixed_occupancy = [entry for flight_id, entry in occupancy_by_flight.items() if flight_id not in window_ids]
+            try:
+                cp_solver = StandAllocationCPSolver(
+                    window_flights, self.stands, self.airlines, self.settings,
+                    self.maintenance_tracker, self.ai_support, verbose=False,
+                    fixed_occupancy=fixed_occupancy, metrics=self.metrics, progress=self.progress
+                )
+                window_allocated, window_unallocated = cp_solver.solve(
+                    hint_allocation=hint_allocation or None, time_limit=window_time_limit, log_unallocated=False
+                )
             except Exception as e:
-                # Log the error and fall back to the greedy algorithm
+                print(f"Error using CP solver for the window starting {window_start}: {str(e)}")
+                window_allocated, window_unallocated = [], []
+            
+            improved = (window_allocated or window_unallocated) and (
+                len(window_allocated) >= len(greedy_allocated)
+                and allocation_weight(window_allocated) >= allocation_weight(greedy_allocated)
+            )
+            if improved:
+                solved_windows += 1
+                cp_allocated.extend(window_allocated)
+                cp_unallocated.extend(window_unallocated)
+                
+                # Keep the interval trees up to date with the CP solution
+                for flight_id in window_ids:
+                    occupancy_by_flight.pop(flight_id, None)
+                for flight_id, (stand_name, occupancy_start, occupancy_end) in cp_solver.solution_occupancy.items():
+                    start_timestamp, end_timestamp = self._occupancy_timestamps(occupancy_start, occupancy_end)
+                    self.stand_occupancy_log[stand_name].add(
+                        Interval(start_timestamp, end_timestamp, {'type': 'flight'})
+                    )
+                    if self.free_gap_index is not None:
+                        self.free_gap_index.add(stand_name, start_timestamp, end_timestamp)
+                    occupancy_by_flight[flight_id] = (stand_name, occupancy_start, occupancy_end)
+            else:
                 if self.verbose:
-                    print(f"Error using CP solver: {str(e)}. Falling back to greedy algorithm.")
-        elif self.verbose:
-            print("Using greedy algorithm for allocation...")
+                    print(f"CP solver did not improve the window starting {window_start}. Keeping the greedy allocation.")
+                self._restore_units(units, hint_allocation, greedy_unallocated)
+            
+            if self.verbose:
+                print(f"Window of {len(window_stands)} stands {window_start:%Y-%m-%d %H:%M} - {window_end:%H:%M}: "
+                      f"{len(window_flights)} flights, {len(window_allocated)} allocated by the CP solver "
+                      f"({len(greedy_allocated)} by the greedy algorithm)")
         
-        # Fall back to the greedy algorithm if the CP solver was not used or failed
-        return self._run_greedy_allocation()
+        allocated_report = self.allocated_flights_report + cp_allocated
+        unallocated_report = self.unallocated_flights_report + cp_unallocated
+        self.allocated_flights_report = allocated_report
+        self.unallocated_flights_report = unallocated_report
+        self._log_unallocated_to_ai_support(unallocated_report)
+        
+        if self.verbose:
+            print(f"Adaptive allocation completed in {time.time() - start_time:.2f} seconds "
+                  f"({solved_windows} of {len(windows)} windows improved by the CP solver)")
+            print(f"Allocated {len(allocated_report)} flights, Unallocated {len(unallocated_report)} flights")
+        
+        return allocated_report, unallocated_report
+    
+    def _find_congested_windows(self, flight_units, unit_occupancy, unit_candidates):
+        """
+        Find the periods in which a class of candidate stands is close to fully used
         
-    def _run_greedy_allocation(self):
+        Candidate sets nest (e.g. the stands of a narrow-body flight include those of a wide-body
+        flight of the same terminal), so the demand for a class is every flight whose candidate
+        stands all belong to the class: those flights can use no other stands. The gap between
+        flights is part of each flight's occupancy, as in the availability checks.
+        
+        Parameters:
+        - flight_units: List of FlightOperationUnit objects
+        - unit_occupancy: List of (start_time, end_time) stand occupancy, one per unit
+        - unit_candidates: List of frozensets of candidate stand names, one per unit
+        
+        Returns:
+        - List of (stand_names, window_start, window_end) tuples sorted by start time, with
+          windows that overlap and share a stand merged (see _merge_windows)
+        """
+        solver_parameters = self.settings.solver_parameters
+        threshold = solver_parameters.get("congestion_threshold", 0.85)
+        padding = timedelta(minutes=solver_parameters.get("congestion_padding_minutes", 60))
+        gap = timedelta(minutes=self.settings.GapBetweenFlights)
+        
+        units_by_set = {}
+        for unit_idx, candidates in enumerate(unit_candidates):
+            if candidates:
+                units_by_set.setdefault(candidates, []).append(unit_idx)
+        
+        windows = []
+        for stand_class in units_by_set:
+            # Demand changes: +1 when a stand is taken, -1 when it is free again (gap included)
+            events = []
+            for candidates, unit_indices in units_by_set.items():
+                if candidates <= stand_class:
+                    for unit_idx in unit_indices:
+                        unit_start, unit_end = unit_occupancy[unit_idx]
+                        events.extend([(unit_start, 1), (unit_end + gap, -1)])
+            
+            # Stands freed at a time can be taken again at the same time
+            events.sort(key=lambda event: (event[0], event[1]))
+            demand = 0
+            congested_start = None
+            for event_time, change in events:
+                demand += change
+                if congested_start is None and demand >= threshold * len(stand_class):
+                    congested_start = event_time
+                elif congested_start is not None and demand < threshold * len(stand_class):
+                    windows.append((stand_class, congested_start - padding, event_time + padding))
+                    congested_start = None
+        
+        return self._merge_windows(windows)
+    
+    def _merge_windows(self, windows):
+        """
+        Merge windows that overlap in time and share a stand
+        
+        Parameters:
+        - windows: List of (stand_names, window_start, window_end) tuples
+        
+        Returns:
+        - List of (stand_names, window_start, window_end) tuples sorted by start time; windows
+          that share a stand do not overlap
+        """
+        merged = []
+        open_windows = []  # Merged windows that may still overlap later windows
+        for stand_names, window_start, window_end in sorted(windows, key=lambda window: window[1]):
+            # Windows are taken by start time, so a window that ended cannot overlap any later one,
+            # and all open windows overlap this one in time
+            open_windows = [window for window in open_windows if window[2] >= window_start]
+            while True:
+                overlapping = [window for window in open_windows if window[0] & stand_names]
+                if not overlapping:
+                    break
+                # Merging adds stands, which may be shared with another open window
+                for window in overlapping:
+                    stand_names = stand_names | window[0]
+                    window_start = min(window_start, window[1])
+                    window_end = max(window_end, window[2])
+                open_windows = [window for window in open_windows if window not in overlapping]
+                merged = [window for window in merged if window not in overlapping]
+            open_windows.append((stand_names, window_start, window_end))
+            merged.append(open_windows[-1])
+        
+        merged.sort(key=lambda window: window[1])
+        return merged
+    
+    def _assign_units_to_windows(self, windows, flight_units, unit_occupancy, unit_candidates):
+        """
+        Assign each flight unit that overlaps a window and can use one of its stands to the first such window
+        
+        Parameters:
+        - windows: List of (stand_names, window_start, window_end) tuples from _merge_windows
+        - flight_units: List of FlightOperationUnit objects
+        - unit_occupancy: List of (start_time, end_time) stand occupancy, one per unit
+        - unit_candidates: List of frozensets of candidate stand names, one per unit
+        
+        Returns:
+        - Tuple of (list of unit lists, one per window, list of units in no window)
+        """
+        # The windows of a stand do not overlap, so they are sorted by both start and end
+        stand_windows = {}
+        for window_idx, (stand_names, _, window_end) in enumerate(windows):
+            for stand_name in stand_names:
+                stand_windows.setdefault(stand_name, ([], []))
+                stand_windows[stand_name][0].append(window_end)
+                stand_windows[stand_name][1].append(window_idx)
+        
+        window_units = [[] for _ in windows]
+        quiet_units = []
+        for unit, (unit_start, unit_end), candidates in zip(flight_units, unit_occupancy, unit_candidates):
+            first_window = None
+            for stand_name in candidates:
+                window_ends, window_indices = stand_windows.get(stand_name, ([], []))
+                position = bisect.bisect_right(window_ends, unit_start)
+                if position < len(window_ends) and windows[window_indices[position]][1] < unit_end:
+                    if first_window is None or window_indices[position] < first_window:
+                        first_window = window_indices[position]
+            if first_window is None:
+                quiet_units.append(unit)
+            else:
+                window_units[first_window].append(unit)
+        
+        return window_units, quiet_units
+    
+    def _release_units(self, flight_units):
+        """
+        Undo the allocation of flight units, so they can be allocated again
+        
+        Parameters:
+        - flight_units: List of FlightOperationUnit objects
+        
+        Returns:
+        - Dict of FlightID -> StandName of the released flights that were allocated
+        """
+        released = {}
+        for unit in flight_units:
+            stand_name = self.flight_allocations.get((unit.arrival or unit.departure).FlightID)
+            if stand_name is None:
+                continue
+            for interval in list(self.stand_occupancy_log[stand_name]):
+                if interval.data['type'] == 'flight' and interval.data.get('flight') in (unit.arrival, unit.departure):
+                    self.stand_occupancy_log[stand_name].remove(interval)
+                    if self.free_gap_index is not None:
+                        self.free_gap_index.remove(stand_name, interval.begin, interval.end)
+            for flight in (unit.arrival, unit.departure):
+                if flight:
+                    released[flight.FlightID] = self.flight_allocations.pop(flight.FlightID)
+                    self.flight_terminals.pop(flight.FlightID, None)
+        
+        released_ids = {flight.FlightID for unit in flight_units for flight in (unit.arrival, unit.departure) if flight}
+        self.allocated_flights_report = [
+            allocation for allocation in self.allocated_flights_report
+            if allocation['flight'].FlightID not in released_ids
+        ]
+        self.unallocated_flights_report = [
+            unallocation for unallocation in self.unallocated_flights_report
+            if unallocation['flight'].FlightID not in released_ids
+        ]
+        return released
+    
+    def _restore_units(self, flight_units, released, unallocated_report):
+        """
+        Allocate released flight units again as they were before _release_units
+        
+        Parameters:
+        - flight_units: List of FlightOperationUnit objects
+        - released: Dict of FlightID -> StandName returned by _release_units
+        - unallocated_report: Unallocated flight reports of the units before they were released
+        """
+        stand_map = {stand.StandName: stand for stand in self.stands}
+        for unit in flight_units:
+            stand_name = released.get((unit.arrival or unit.departure).FlightID)
+            if stand_name is not None:
+                start_time, end_time = self._calculate_stand_occupancy_duration(unit)
+                self._allocate_stand_to_flight(stand_map[stand_name], unit.arrival, unit.departure, start_time, end_time)
+        self.unallocated_flights_report.extend(unallocated_report)
+    
+    def _allocated_unit_occupancy(self, flight_units):
+        """
+        Get the stand occupancy of the allocated flight units as fixed occupancy for the CP solver
+        
+        Parameters:
+        - flight_units: List of FlightOperationUnit objects
+        
+        Returns:
+        - List of (StandName, start_datetime, end_datetime) tuples
+        """
+        occupancy = []
+        for unit in flight_units:
+            stand_name = self.flight_allocations.get((unit.arrival or unit.departure).FlightID)
+            if stand_name:
+                unit_start, unit_end = self._calculate_stand_occupancy_duration(unit)
+                occupancy.append((stand_name, unit_start, unit_end))
+        return occupancy
+    
+    def _rolling_horizon_units(self):
+        """
+        Group flights into the units the rolling horizon assigns to windows
+        
+        Returns:
+        - List of (start_time, flights) tuples sorted by start time, where a linked
+          arrival/departure pair is one unit starting at its arrival
+        """
+        linked_flights = {}
+        for flight in self.flights:
+            if flight.LinkID:
+                linked_flights.setdefault(flight.LinkID, []).append(flight)
+        
+        units = []
+        seen_link_ids = set()
+        for flight in self.flights:
+            pair = linked_flights.get(flight.LinkID, []) if flight.LinkID else []
+            arrival = next((f for f in pair if f.IsArrival), None)
+            departure = next((f for f in pair if not f.IsArrival), None)
+            
+            if len(pair) == 2 and arrival and departure:
+                if flight.LinkID in seen_link_ids:
+                    continue
+                seen_link_ids.add(flight.LinkID)
+                units.append((arrival.parsed_time, [arrival, departure]))
+            else:
+                units.append((flight.parsed_time, [flight]))
+        
+        units.sort(key=lambda unit: unit[0])
+        return units
+    
+    def _run_flow_allocation(self):
+        """
+        Run the min-cost-flow allocation
+        
+        Stands with the same terminal, size limit, contact status and maintenance are
+        interchangeable, so allocating flights to one such class is weighted interval scheduling
+        on identical stands, which min-cost flow solves exactly for the criticality scores.
+        Classes are solved from the least to the most capable stands (narrow before wide before
+        super, remote before contact), and a flight not selected in one class is offered to the
+        next class it fits. Linked pairs occupy a stand from arrival to departure, as in the
+        greedy algorithm.
+        
+        Returns:
+        - Tuple of (allocated_flights_report, unallocated_flights_report), or None if
+          OR-Tools is not available
+        """
+        try:
+            # Import at runtime to avoid import errors if OR-Tools is not installed
+            from flow_allocator import max_weight_interval_selection
+        except ImportError:
+            if self.verbose:
+                print("OR-Tools not available. Falling back to greedy algorithm.")
+            return None
+        
+        start_time = time.time()
+        gap = self.settings.GapBetweenFlights
+        size_rank = {"Narrow": 0, "Wide": 1, "Super": 2}
+        
+        # Group interchangeable stands into classes
+        stand_classes = {}
+        for stand in self.stands:
+            if not self._passes_adjacency_rules(stand):
+                continue
+            blocked = tuple(sorted(
+                (interval.begin, interval.end) for interval in self.stand_occupancy_log[stand.StandName]
+                if interval.data['type'] == 'maintenance'
+            ))
+            key = (size_rank.get(stand.SizeLimit, len(size_rank)), stand.IsContactStand, stand.Terminal, blocked)
+            stand_classes.setdefault(key, []).append(stand)
+        
+        # Stands with maintenance are less capable than the same stands without it
+        class_order = sorted(stand_classes, key=lambda key: (
+            key[0], key[1], -sum(end - begin for begin, end in key[3]), str(key[2])
+        ))
+        
+        flight_units = self._prepare_flight_processing_order()
+        unit_intervals = []
+        unit_classes = []
+        classes_by_signature = {}
+        for unit in flight_units:
+            flight = unit.arrival if unit.arrival else unit.departure
+            unit_start, unit_end = self._calculate_stand_occupancy_duration(unit)
+            unit_intervals.append(self._occupancy_timestamps(unit_start, unit_end))
+            
+            # Compatibility only depends on the airline and aircraft type
+            signature = (flight.AirlineCode, flight.AircraftType)
+            if signature not in classes_by_signature:
+                airline = self._get_airline(flight.AirlineCode)
+                classes_by_signature[signature] = {
+                    key for key in class_order if self._is_stand_compatible(flight, airline, stand_classes[key][0])
+                }
+            unit_classes.append(classes_by_signature[signature])
+        
+        if self.verbose:
+            print(f"Solving {len(class_order)} stand classes with min-cost flow...")
+        progress = self.progress
+        progress.phase_start("flow_allocation", total=len(class_order),
+                             description="Allocating stand classes", unit="classes")
+        
+        remaining = list(range(len(flight_units)))
+        for class_idx, key in enumerate(class_order):
+            progress.tick("flow_allocation", class_idx, len(class_order))
+            blocked = key[3]
+            members = [
+                unit_idx for unit_idx in remaining
+                if key in unit_classes[unit_idx] and not any(
+                    unit_intervals[unit_idx][0] < block_end + gap and block_start < unit_intervals[unit_idx][1] + gap
+                    for block_start, block_end in blocked
+                )
+            ]
+            if not members:
+                continue
+            
+            # The gap between flights is part of each flight's interval
+            intervals = [(unit_intervals[unit_idx][0], unit_intervals[unit_idx][1] + gap) for unit_idx in members]
+            weights = [
+                sum(flight_weight(flight) for flight in (flight_units[unit_idx].arrival,
+                                                         flight_units[unit_idx].departure) if flight)
+                for unit_idx in members
+            ]
+            stands = stand_classes[key]
+            selected = max_weight_interval_selection(intervals, weights, len(stands))
+            assignment = assign_intervals_to_stands(intervals, selected, len(stands))
+            
+            for idx, stand_idx in assignment.items():
+                unit = flight_units[members[idx]]
+                unit_start, unit_end = self._calculate_stand_occupancy_duration(unit)
+                self._allocate_stand_to_flight(stands[stand_idx], unit.arrival, unit.departure, unit_start, unit_end)
+            
+            allocated_units = {members[idx] for idx in assignment}
+            remaining = [unit_idx for unit_idx in remaining if unit_idx not in allocated_units]
+        
+        progress.phase_end("flow_allocation", done=len(class_order), unallocated_units=len(remaining))
+        
+        for unit_idx in remaining:
+            unit = flight_units[unit_idx]
+            if unit.is_linked_pair:
+                reason = "No suitable stand available for linked pair"
+                self.unallocated_flights_report.append({'flight': unit.arrival, 'reason': reason})
+                self.ai_support.log_unallocated_flight(unit.arrival, reason)
+                self.unallocated_flights_report.append({'flight': unit.departure, 'reason': reason})
+            else:
+                flight = unit.arrival if unit.arrival else unit.departure
+                reason = "No suitable stand available"
+                self.unallocated_flights_report.append({'flight': flight, 'reason': reason})
+                self.ai_support.log_unallocated_flight(flight, reason)
+        
+        if self.verbose:
+            print(f"Min-cost-flow allocation completed in {time.time() - start_time:.2f} seconds")
+            print(f"Allocation complete: {len(self.allocated_flights_report)} allocated, {len(self.unallocated_flights_report)} unallocated")
+        
+        return self.allocated_flights_report, self.unallocated_flights_report
+    
+    def _occupancy_timestamps(self, start_time, end_time):
+        """
+        Convert a stand occupancy period to interval tree timestamps
+        
+        Parameters:
+        - start_time: Start time of the occupancy (datetime)
+        - end_time: End time of the occupancy (datetime)
+        
+        Returns:
+        - Tuple of (start_timestamp, end_timestamp) with end_timestamp > start_timestamp
+        """
+        start_timestamp = self._datetime_to_timestamp(start_time)
+        end_timestamp = self._datetime_to_timestamp(end_time)
+        
+        if end_timestamp <= start_timestamp:
+            if start_time.year != 1900 or end_time.year != 1900:
+                end_timestamp = start_timestamp + calculate_time_difference_minutes(start_time, end_time)
+            else:
+                # Legacy format: the period ends on the next day
+                end_timestamp = start_timestamp + (24 * 60)
+        
+        return start_timestamp, max(end_timestamp, start_timestamp + 1)
+    
+    def _log_unallocated_to_ai_support(self, unallocated_report):
+        """
+        Pass unallocated flights to the AI support module
+        
+        Linked pairs are logged once, by their arrival, as in the greedy algorithm.
+        
+        Parameters:
+        - unallocated_report: List of unallocated flight reports
+        """
+        for unallocation in unallocated_report:
+            flight = unallocation['flight']
+            if flight.LinkID and not flight.IsArrival and unallocation['reason'].endswith("linked pair"):
+                continue
+            self.ai_support.log_unallocated_flight(flight, unallocation['reason'])
+        
+    def _run_greedy_allocation(self, log_unallocated=True, flight_units=None):
         """
         Run the greedy stand allocation algorithm (original algorithm)
         
+        Parameters:
+        - log_unallocated: Whether to pass unallocated flights to the AI support module
+        - flight_units: Optional list of FlightOperationUnit objects in processing order to
+          allocate (all flights if None)
+        
         Returns:
         - Tuple of (allocated_flights_report, unallocated_flights_report)
         """
         # Step 1: Prepare flight processing order
-        if self.verbose:
-            print("Preparing flight processing order...")
-        flight_units = self._prepare_flight_processing_order()
+        if flight_units is None:
+            if self.verbose:
+                print("Preparing flight processing order...")
+            flight_units = self._prepare_flight_processing_order()
+        
+        # Groups of flights with their own stands are allocated optimally by interval partitioning.
+        # Off by default: candidate sets usually nest (every stand that takes a wide-body also
+        # takes a narrow-body), and then no group has stands of its own.
+        if self.settings.solver_parameters.get("interval_partitioning", False):
+            flight_units = self._allocate_partitionable_groups(flight_units, log_unallocated)
+        
+        # With local search, unallocated flights are logged once it is known they stay unallocated
+        local_search = self.settings.solver_parameters.get("local_search", False)
+        log_now = log_unallocated and not local_search
+        unallocated_units = []
         
         if self.verbose:
             print(f"Processing {len(flight_units)} flight operations...")
-            # Use tqdm for progress bar
-            flight_units_iter = tqdm(flight_units, desc="Allocating flights", unit="flights")
-        else:
-            flight_units_iter = flight_units
+        
+        metrics = self.metrics
+        progress = self.progress
+        # Checked once, so the loop costs nothing extra without a progress sink
+        report_progress = progress.enabled
+        progress.phase_start("greedy_allocation", total=len(flight_units),
+                             description="Allocating flights", unit="flights")
         
         # Step 2: Process each flight unit
-        for unit in flight_units_iter:
+        for unit_idx, unit in enumerate(flight_units):
+            if report_progress:
+                progress.tick("greedy_allocation", unit_idx, len(flight_units))
+            unit_start_time = time.perf_counter()
+            
             # If this is a linked arrival/departure pair
             if unit.is_linked_pair:
                 flight = unit.arrival  # Start with the arrival
@@ -232,29 +1067,27 @@ class StandAllocationEngine:
                 # Identify candidate stands
                 candidate_stands = self._identify_candidate_stands(flight, airline)
                 
-                # Check each candidate stand for availability
-                stand_found = False
-                for stand in candidate_stands:
-                    if self._check_stand_availability(stand.StandName, start_time, end_time):
-                        # Allocate the stand to both flights in the linked pair
-                        self._allocate_stand_to_flight(stand, unit.arrival, unit.departure, start_time, end_time)
-                        stand_found = True
-                        break
-                
-                if not stand_found:
+                # Choose one of the available candidate stands
+                stand = self._select_stand(candidate_stands, start_time, end_time)
+                if stand:
+                    # Allocate the stand to both flights in the linked pair
+                    self._allocate_stand_to_flight(stand, unit.arrival, unit.departure, start_time, end_time)
+                else:
                     # Could not allocate the linked pair
                     reason = "No suitable stand available for linked pair"
                     self.unallocated_flights_report.append({
                         'flight': unit.arrival,
                         'reason': reason
                     })
-                    self.ai_support.log_unallocated_flight(unit.arrival, reason)
+                    if log_now:
+                        self.ai_support.log_unallocated_flight(unit.arrival, reason)
                     
                     # Also log the departure as unallocated
                     self.unallocated_flights_report.append({
                         'flight': unit.departure,
                         'reason': reason
                     })
+                    unallocated_units.append(unit)
             
             # If this is a single flight (arrival or departure)
             else:
@@ -267,29 +1100,353 @@ class StandAllocationEngine:
                 # Identify candidate stands
                 candidate_stands = self._identify_candidate_stands(flight, airline)
                 
-                # Check each candidate stand for availability
-                stand_found = False
-                for stand in candidate_stands:
-                    if self._check_stand_availability(stand.StandName, start_time, end_time):
-                        # Allocate the stand to the flight
-                        self._allocate_stand_to_flight(stand, flight, None, start_time, end_time)
-                        stand_found = True
-                        break
-                
-                if not stand_found:
+                # Choose one of the available candidate stands
+                stand = self._select_stand(candidate_stands, start_time, end_time)
+                if stand:
+                    # Allocate the stand to the flight
+                    self._allocate_stand_to_flight(stand, flight, None, start_time, end_time)
+                else:
                     # Could not allocate the flight
                     reason = "No suitable stand available"
                     self.unallocated_flights_report.append({
                         'flight': flight,
                         'reason': reason
                     })
-                    self.ai_support.log_unallocated_flight(flight, reason)
+                    if log_now:
+                        self.ai_support.log_unallocated_flight(flight, reason)
+                    unallocated_units.append(unit)
+            
+            metrics.observe("unit_decision_seconds", time.perf_counter() - unit_start_time)
+            metrics.observe("candidates_per_unit", len(candidate_stands))
+            metrics.increment("units_allocated" if stand else "units_unallocated")
+        
+        metrics.increment("units_processed", len(flight_units))
+        progress.phase_end("greedy_allocation", done=len(flight_units), unallocated_units=len(unallocated_units))
+        
+        # Step 3: Try to place the unallocated flights by moving allocated ones
+        if local_search and unallocated_units:
+            still_unallocated = self._improve_by_local_search(unallocated_units)
+            if log_unallocated:
+                unallocated_ids = {flight.FlightID for unit in still_unallocated
+                                   for flight in (unit.arrival, unit.departure) if flight}
+                self._log_unallocated_to_ai_support([
+                    unallocation for unallocation in self.unallocated_flights_report
+                    if unallocation['flight'].FlightID in unallocated_ids
+                ])
         
         if self.verbose:
             print(f"Allocation complete: {len(self.allocated_flights_report)} allocated, {len(self.unallocated_flights_report)} unallocated")
         
         return self.allocated_flights_report, self.unallocated_flights_report
     
+    def _improve_by_local_search(self, unallocated_units):
+        """
+        Place unallocated flights by moving allocated flights to other free candidate stands
+        
+        The greedy algorithm never revisits a decision, so a flight can stay unallocated while
+        moving a single allocated flight would free a stand for it. For each unallocated flight
+        unit, in processing order, this searches for an ejection chain: place the unit on a
+        candidate stand where it conflicts with exactly one allocated flight, which is moved in
+        turn to one of its own candidate stands, and so on until a flight fits on a free stand.
+        Chains that return to a stand cover swaps. Conflicts are looked up in the stands' interval
+        trees, so each move is evaluated in O(log n). Maintenance and flights without a flight
+        object (fixed by the CP solver) are never moved.
+        
+        Solver parameters:
+        - "local_search_time_limit_seconds": Time limit of the search (default 5)
+        - "local_search_max_depth": Most allocated flights moved to place one unit (default 3)
+        
+        Parameters:
+        - unallocated_units: List of unallocated FlightOperationUnit objects in processing order
+        
+        Returns:
+        - List of the FlightOperationUnit objects that are still unallocated
+        """
+        solver_parameters = self.settings.solver_parameters
+        deadline = time.time() + solver_parameters.get("local_search_time_limit_seconds", 5)
+        max_depth = solver_parameters.get("local_search_max_depth", 3)
+        stand_map = {stand.StandName: stand for stand in self.stands}
+        
+        candidates_by_signature = {}
+        
+        def candidate_stands(flight):
+            signature = (flight.AirlineCode, flight.AircraftType)
+            if signature not in candidates_by_signature:
+                airline = self._get_airline(flight.AirlineCode)
+                candidates_by_signature[signature] = [
+                    stand.StandName for stand in self.stands if self._is_stand_compatible(flight, airline, stand)
+                ]
+            return candidates_by_signature[signature]
+        
+        def find_chain(flight, start_timestamp, end_timestamp, current_stand, depth, chain_flights):
+            # Returns the moves [(stand_name, ejected interval or None), ...] placing the flight, or None
+            stand_names = [stand_name for stand_name in candidate_stands(flight) if stand_name != current_stand]
+            for stand_name in stand_names:
+                if not self._conflicting_intervals(stand_name, start_timestamp, end_timestamp):
+                    return [(stand_name, None)]
+            
+            if depth == 0:
+                return None
+            
+            for stand_name in stand_names:
+                if time.time() > deadline:
+                    return None
+                conflicts = self._conflicting_intervals(stand_name, start_timestamp, end_timestamp)
+                if len(conflicts) != 1:
+                    continue
+                blocker = next(iter(conflicts))
+                blocker_flight = blocker.data.get('flight')
+                if blocker.data['type'] != 'flight' or blocker_flight is None or blocker_flight.FlightID in chain_flights:
+                    continue
+                
+                # Tentatively eject the blocker and move it in turn
+                tree = self.stand_occupancy_log[stand_name]
+                placeholder = Interval(start_timestamp, end_timestamp, {'type': 'local_search'})
+                tree.remove(blocker)
+                tree.add(placeholder)
+                moves = find_chain(blocker_flight, blocker.begin, blocker.end, stand_name,
+                                   depth - 1, chain_flights | {blocker_flight.FlightID})
+                tree.remove(placeholder)
+                tree.add(blocker)
+                
+                if moves is not None:
+                    return [(stand_name, blocker)] + moves
+            
+            return None
+        
+        allocations_by_flight = {allocation['flight'].FlightID: allocation for allocation in self.allocated_flights_report}
+        still_unallocated = []
+        placed_flight_ids = set()
+        
+        for unit in unallocated_units:
+            if time.time() > deadline:
+                still_unallocated.append(unit)
+                continue
+            
+            flight = unit.arrival if unit.arrival else unit.departure
+            start_time, end_time = self._calculate_stand_occupancy_duration(unit)
+            start_timestamp, end_timestamp = self._occupancy_timestamps(start_time, end_time)
+            moves = find_chain(flight, start_timestamp, end_timestamp, None, max_depth, {flight.FlightID})
+            if moves is None:
+                still_unallocated.append(unit)
+                continue
+            
+            # Move each ejected flight to the stand of the next move, then place the unit
+            for (stand_name, blocker), (next_stand_name, _) in zip(moves, moves[1:]):
+                next_stand = stand_map[next_stand_name]
+                self.stand_occupancy_log[stand_name].remove(blocker)
+                self.stand_occupancy_log[next_stand_name].add(blocker)
+                if self.free_gap_index is not None:
+                    self.free_gap_index.remove(stand_name, blocker.begin, blocker.end)
+                    self.free_gap_index.add(next_stand_name, blocker.begin, blocker.end)
+                for moved_flight in (blocker.data['arrival'], blocker.data['departure']):
+                    if moved_flight:
+                        self.flight_allocations[moved_flight.FlightID] = next_stand_name
+                        self.flight_terminals[moved_flight.FlightID] = next_stand.Terminal
+                        if moved_flight.FlightID in allocations_by_flight:
+                            allocations_by_flight[moved_flight.FlightID]['stand'] = next_stand
+            
+            report_size = len(self.allocated_flights_report)
+            self._allocate_stand_to_flight(stand_map[moves[0][0]], unit.arrival, unit.departure, start_time, end_time)
+            for allocation in self.allocated_flights_report[report_size:]:
+                allocations_by_flight[allocation['flight'].FlightID] = allocation
+            placed_flight_ids.update(placed.FlightID for placed in (unit.arrival, unit.departure) if placed)
+        
+        if placed_flight_ids:
+            self.unallocated_flights_report = [
+                unallocation for unallocation in self.unallocated_flights_report
+                if unallocation['flight'].FlightID not in placed_flight_ids
+            ]
+        
+        self.metrics.increment("units_placed_by_local_search", len(unallocated_units) - len(still_unallocated))
+        if self.verbose:
+            print(f"Local search placed {len(unallocated_units) - len(still_unallocated)} of "
+                  f"{len(unallocated_units)} unallocated flight operations")
+        
+        return still_unallocated
+    
+    def _allocate_partitionable_groups(self, flight_units, log_unallocated=True):
+        """
+        Allocate groups of flights that share the same candidate stands, used by no other flight
+        
+        Within such a group the stands are interchangeable. If all units of the group have the
+        same weight (flights times criticality, as in the flow engine), allocating as many of
+        them as possible is interval partitioning: a sweep in order of start time that drops the
+        unit ending last whenever more units overlap than there are stands, which is optimal
+        and takes O(n log n). A group mixing linked pairs with single flights or different
+        criticality scores is solved as weighted interval scheduling with min-cost flow instead,
+        so a pair is not dropped for a single flight of lower weight (without OR-Tools such
+        groups are left to the greedy algorithm). Each selected unit is then assigned to the
+        stand that became free the earliest. Stands with maintenance are not interchangeable
+        and are left to the greedy algorithm. So are all flights whose candidate sets nest in
+        or overlap another flight's, which in realistic schedules is nearly all of them.
+        
+        Parameters:
+        - flight_units: List of FlightOperationUnit objects in processing order
+        - log_unallocated: Whether to pass unallocated flights to the AI support module
+        
+        Returns:
+        - List of the FlightOperationUnit objects that still need the greedy algorithm
+        """
+        unit_candidates = self._unit_candidate_sets(flight_units)
+        
+        # A candidate set qualifies if no other candidate set shares a stand with it
+        candidate_sets_by_stand = {}
+        for candidates in set(unit_candidates):
+            for stand_name in candidates:
+                candidate_sets_by_stand.setdefault(stand_name, set()).add(candidates)
+        
+        partitionable = set()
+        for candidates in set(unit_candidates):
+            if candidates and all(
+                len(candidate_sets_by_stand[stand_name]) == 1 and not self.stand_occupancy_log[stand_name]
+                for stand_name in candidates
+            ):
+                partitionable.add(candidates)
+        
+        if not partitionable:
+            return flight_units
+        
+        try:
+            # Import at runtime to avoid import errors if OR-Tools is not installed
+            from flow_allocator import max_weight_interval_selection
+        except ImportError:
+            max_weight_interval_selection = None
+        
+        groups = {}
+        remaining_units = []
+        for unit, candidates in zip(flight_units, unit_candidates):
+            if candidates in partitionable:
+                groups.setdefault(candidates, []).append(unit)
+            else:
+                remaining_units.append(unit)
+        
+        # Weight of a unit: the flight weights of its flights, as in the flow engine
+        group_weights = {
+            candidates: [
+                sum(flight_weight(flight) for flight in (unit.arrival, unit.departure) if flight)
+                for unit in units
+            ]
+            for candidates, units in groups.items()
+        }
+        if max_weight_interval_selection is None:
+            for candidates in [candidates for candidates, weights in group_weights.items() if len(set(weights)) > 1]:
+                del group_weights[candidates]
+                remaining_units.extend(groups.pop(candidates))
+            # Keep the processing order of the units left to the greedy algorithm
+            unit_order = {id(unit): idx for idx, unit in enumerate(flight_units)}
+            remaining_units.sort(key=lambda unit: unit_order[id(unit)])
+        
+        if self.verbose:
+            print(f"Allocating {len(flight_units) - len(remaining_units)} flight operations in "
+                  f"{len(groups)} groups by interval partitioning...")
+        self.metrics.increment("units_partitioned", len(flight_units) - len(remaining_units))
+        
+        stand_map = {stand.StandName: stand for stand in self.stands}
+        gap = self.settings.GapBetweenFlights
+        
+        for candidates, units in groups.items():
+            group_stands = [stand_map[stand_name] for stand_name in sorted(candidates)]
+            occupancy = [self._calculate_stand_occupancy_duration(unit) for unit in units]
+            intervals = []
+            for start_time, end_time in occupancy:
+                start_timestamp, end_timestamp = self._occupancy_timestamps(start_time, end_time)
+                intervals.append((start_timestamp, end_timestamp + gap))
+            weights = group_weights[candidates]
+            
+            if len(set(weights)) > 1:
+                selected = max_weight_interval_selection(intervals, weights, len(group_stands))
+            else:
+                selected = select_max_intervals(intervals, len(group_stands))
+            assignment = assign_intervals_to_stands(intervals, selected, len(group_stands))
+            
+            for idx, unit in enumerate(units):
+                start_time, end_time = occupancy[idx]
+                if idx in assignment:
+                    self._allocate_stand_to_flight(
+                        group_stands[assignment[idx]], unit.arrival, unit.departure, start_time, end_time
+                    )
+                elif unit.is_linked_pair:
+                    reason = "No suitable stand available for linked pair"
+                    self.unallocated_flights_report.append({'flight': unit.arrival, 'reason': reason})
+                    if log_unallocated:
+                        self.ai_support.log_unallocated_flight(unit.arrival, reason)
+                    self.unallocated_flights_report.append({'flight': unit.departure, 'reason': reason})
+                else:
+                    flight = unit.arrival if unit.arrival else unit.departure
+                    reason = "No suitable stand available"
+                    self.unallocated_flights_report.append({'flight': flight, 'reason': reason})
+                    if log_unallocated:
+                        self.ai_support.log_unallocated_flight(flight, reason)
+        
+        return remaining_units
+    
+    def _unit_candidate_sets(self, flight_units):
+        """
+        Get the names of the compatible stands of each flight unit
+        
+        Compatibility only depends on the airline and aircraft type, so the stands are
+        checked once per combination and the same frozenset is shared between units.
+        
+        Parameters:
+        - flight_units: List of FlightOperationUnit objects
+        
+        Returns:
+        - List of frozensets of stand names, one per unit
+        """
+        candidates_by_signature = {}
+        unit_candidates = []
+        for unit in flight_units:
+            flight = unit.arrival if unit.arrival else unit.departure
+            signature = (flight.AirlineCode, flight.AircraftType)
+            if signature not in candidates_by_signature:
+                airline = self._get_airline(flight.AirlineCode)
+                candidates_by_signature[signature] = frozenset(
+                    stand.StandName for stand in self.stands if self._is_stand_compatible(flight, airline, stand)
+                )
+            unit_candidates.append(candidates_by_signature[signature])
+        return unit_candidates
+    
+    def compute_allocation_bound(self, use_flow=True):
+        """
+        Compute an upper bound on the flights and criticality weight any allocation can achieve
+        
+        Linked pairs occupy a stand from arrival to departure and single flights for their
+        turnaround time, as in the greedy algorithm, with the same GapBetweenFlights (in minutes)
+        between flights that _conflicting_intervals enforces, so the bound holds for every engine.
+        Maintenance is ignored. See allocation_bounds.compute_allocation_bound.
+        
+        Parameters:
+        - use_flow: Whether to use the min-cost-flow relaxation (needs OR-Tools) or only a sweep line
+        
+        Returns:
+        - AllocationBound object; use its gap() method to grade an allocation
+        """
+        flight_units = self._prepare_flight_processing_order()
+        # Timestamps are in minutes, as is the gap
+        gap = self.settings.GapBetweenFlights
+        
+        intervals = []
+        flight_counts = []
+        weights = []
+        for unit in flight_units:
+            start_timestamp, end_timestamp = self._occupancy_timestamps(*self._calculate_stand_occupancy_duration(unit))
+            intervals.append((start_timestamp, end_timestamp + gap))
+            unit_flights = [flight for flight in (unit.arrival, unit.departure) if flight]
+            flight_counts.append(len(unit_flights))
+            weights.append(sum(flight_weight(flight) for flight in unit_flights))
+        
+        bound = compute_allocation_bound(
+            intervals, flight_counts, weights, self._unit_candidate_sets(flight_units), use_flow=use_flow
+        )
+        
+        if self.verbose:
+            print(f"Upper bound ({bound.method}, {bound.compute_time:.2f} seconds): at most "
+                  f"{bound.max_allocated_flights} of {bound.total_flights} flights, "
+                  f"weight {bound.max_weight} of {bound.total_weight}")
+        
+        return bound
+    
     def _calculate_criticality_score(self, flight_unit):
         """
         Calculate a comprehensive criticality score for a flight operation unit
@@ -526,27 +1683,7 @@ class StandAllocationEngine:
         Returns:
         - List of Stand objects that are candidates for the flight
         """
-        candidates = []
-        
-        # Basic compatibility checks
-        for stand in self.stands:
-            # Check terminal compatibility (airline base terminal)
-            if airline and airline.BaseTerminal != stand.Terminal:
-                continue
-            
-            # Check aircraft size compatibility
-            if not self._is_aircraft_compatible(flight.AircraftType, stand.SizeLimit):
-                continue
-            
-            # Check contact stand requirement
-            if airline and airline.RequiresContactStand and not stand.IsContactStand:
-                continue
-            
-            # Check adjacency rules
-            if not self._passes_adjacency_rules(stand):
-                continue
-            
-            candidates.append(stand)
+        candidates = [stand for stand in self.stands if self._is_stand_compatible(flight, airline, stand)]
         
         # Check for any connecting flights and their terminal allocations
         connecting_flight_terminals = self._get_connecting_flight_terminals(flight)
@@ -568,6 +1705,33 @@ class StandAllocationEngine:
         
         return candidates
     
+    def _is_stand_compatible(self, flight, airline, stand):
+        """
+        Check if a stand can be used by a flight
+        
+        Parameters:
+        - flight: Flight object
+        - airline: Airline object (or None)
+        - stand: Stand object
+        
+        Returns:
+        - Boolean indicating if the stand is compatible with the flight
+        """
+        # Check terminal compatibility (airline base terminal)
+        if airline and airline.BaseTerminal != stand.Terminal:
+            return False
+        
+        # Check aircraft size compatibility
+        if not self._is_aircraft_compatible(flight.AircraftType, stand.SizeLimit):
+            return False
+        
+        # Check contact stand requirement
+        if airline and airline.RequiresContactStand and not stand.IsContactStand:
+            return False
+        
+        # Check adjacency rules
+        return self._passes_adjacency_rules(stand)
+    
     def _get_connecting_flight_terminals(self, flight):
         """
         Find terminals of flights that connect with this flight
@@ -637,6 +1801,36 @@ class StandAllocationEngine:
         # In a real system, this would check for conflicting adjacency rules
         return True
     
+    def _select_stand(self, candidate_stands, start_time, end_time):
+        """
+        Choose an available stand for a flight with the stand selection policy
+        
+        First-fit takes the first available candidate stand. The other policies check every
+        candidate stand for availability and rank the available ones by the free gaps around
+        the flight (see stand_selection.select_stand).
+        
+        Parameters:
+        - candidate_stands: List of candidate Stand objects, in candidate order
+        - start_time: Start time of the stand occupancy
+        - end_time: End time of the stand occupancy
+        
+        Returns:
+        - The chosen Stand object, or None if no candidate stand is available
+        """
+        if self.free_gap_index is None:
+            for stand in candidate_stands:
+                if self._check_stand_availability(stand.StandName, start_time, end_time):
+                    return stand
+            return None
+        
+        start_timestamp, end_timestamp = self._occupancy_timestamps(start_time, end_time)
+        free_stands = [
+            stand for stand in candidate_stands
+            if not self._conflicting_intervals(stand.StandName, start_timestamp, end_timestamp)
+        ]
+        return select_stand(self.stand_selection_policy, free_stands, self.free_gap_index,
+                            start_timestamp, end_timestamp)
+    
     def _check_stand_availability(self, stand_name, query_start_time, query_end_time):
         """
         Check if a stand is available during the specified time period using interval tree
@@ -664,19 +1858,29 @@ class StandAllocationEngine:
                 # Add 24 hours (in minutes) to end time for legacy format
                 end_timestamp = start_timestamp + (24 * 60)
         
-        # Calculate gap in seconds
-        gap_seconds = self.settings.GapBetweenFlights * 60
+        return not self._conflicting_intervals(stand_name, start_timestamp, end_timestamp)
+    
+    def _conflicting_intervals(self, stand_name, start_timestamp, end_timestamp):
+        """
+        Find the occupancy intervals of a stand that conflict with a period, including the required gap
         
-        # Expand the query interval to include required gap between flights
-        expanded_start = start_timestamp - gap_seconds
-        expanded_end = end_timestamp + gap_seconds
+        Parameters:
+        - stand_name: Name of the stand to check
+        - start_timestamp: Start of the period (interval tree timestamp)
+        - end_timestamp: End of the period (interval tree timestamp)
         
-        # Check for any overlapping intervals in the stand's interval tree
-        if stand_name in self.stand_occupancy_log:
-            overlaps = self.stand_occupancy_log[stand_name].overlap(expanded_start, expanded_end)
-            return len(list(overlaps)) == 0
+        Returns:
+        - Set of conflicting Interval objects (empty if the stand is available)
+        """
+        self.metrics.increment("availability_queries")
+        if stand_name not in self.stand_occupancy_log:
+            return set()
         
-        return True
+        # Timestamps are in minutes, as is the gap
+        gap = self.settings.GapBetweenFlights
+        
+        # Expand the query interval to include required gap between flights
+        return self.stand_occupancy_log[stand_name].overlap(start_timestamp - gap, end_timestamp + gap)
     
     def _allocate_stand_to_flight(self, stand, arrival_flight, departure_flight, start_time, end_time):
         """
@@ -716,6 +1920,8 @@ class StandAllocationEngine:
                 'departure': departure_flight
             })
         )
+        if self.free_gap_index is not None:
+            self.free_gap_index.add(stand.StandName, start_timestamp, end_timestamp)
         
         # Track the allocation decision for each flight
         if arrival_flight:
@@ -0,0 +1,118 @@
+"""
+Stand Selection Policies for Stand Allocation
+Chooses among the free candidate stands of a flight using an index of the free gaps on each stand
+"""
+
+import bisect
+
+# Take the first free candidate stand, in candidate order (terminal proximity for connecting flights)
+FIRST_FIT = "first_fit"
+# Take the stand with the smallest idle time around the flight, packing stands tightly
+BEST_FIT = "best_fit"
+# Take the stand with the largest buffer before and after the flight, to absorb delays
+ROBUST_FIT = "robust_fit"
+# Take a free contact stand if there is one, then a remote stand
+CONTACT_FIRST = "contact_first"
+
+STAND_SELECTION_POLICIES = (FIRST_FIT, BEST_FIT, ROBUST_FIT, CONTACT_FIRST)
+
+
+class FreeGapIndex:
+    """
+    Sorted start and end times of the occupancy of each stand
+    
+    The free gap around a period on a stand is bounded by the latest occupancy ending before
+    it and the earliest occupancy starting after it, which are found by binary search in
+    O(log n). Start and end times are kept in separate lists, so overlapping occupancy
+    (e.g. maintenance entries) is handled as well.
+    """
+    
+    def __init__(self):
+        self._starts = {}
+        self._ends = {}
+    
+    def add(self, stand_name, start, end):
+        """
+        Record an occupancy period of a stand
+        
+        Parameters:
+        - stand_name: Name of the stand
+        - start: Start of the period (interval tree timestamp)
+        - end: End of the period (interval tree timestamp)
+        """
+        bisect.insort(self._starts.setdefault(stand_name, []), start)
+        bisect.insort(self._ends.setdefault(stand_name, []), end)
+    
+    def remove(self, stand_name, start, end):
+        """
+        Remove an occupancy period recorded with add()
+        
+        Parameters:
+        - stand_name: Name of the stand
+        - start: Start of the period
+        - end: End of the period
+        """
+        starts = self._starts[stand_name]
+        del starts[bisect.bisect_left(starts, start)]
+        ends = self._ends[stand_name]
+        del ends[bisect.bisect_left(ends, end)]
+    
+    def idle_gaps(self, stand_name, start, end):
+        """
+        Get the idle time on a stand before and after a free period
+        
+        Parameters:
+        - stand_name: Name of the stand
+        - start: Start of the period
+        - end: End of the period
+        
+        Returns:
+        - Tuple of (gap_before, gap_after); a gap is None if the stand is not occupied on that side
+        """
+        ends = self._ends.get(stand_name, [])
+        idx = bisect.bisect_right(ends, start)
+        gap_before = start - ends[idx - 1] if idx > 0 else None
+        
+        starts = self._starts.get(stand_name, [])
+        idx = bisect.bisect_left(starts, end)
+        gap_after = starts[idx] - end if idx < len(starts) else None
+        
+        return gap_before, gap_after
+
+
+def select_stand(policy, free_stands, index, start, end):
+    """
+    Choose a stand for a flight from its free candidate stands
+    
+    Ties are broken by candidate order.
+    
+    Parameters:
+    - policy: One of STAND_SELECTION_POLICIES
+    - free_stands: List of free candidate Stand objects, in candidate order
+    - index: FreeGapIndex with the occupancy of the stands (not used by first_fit and contact_first)
+    - start: Start of the flight's occupancy (interval tree timestamp)
+    - end: End of the flight's occupancy (interval tree timestamp)
+    
+    Returns:
+    - The chosen Stand object, or None if there is no free stand
+    """
+    if not free_stands:
+        return None
+    
+    if policy == CONTACT_FIRST:
+        return next((stand for stand in free_stands if stand.IsContactStand), free_stands[0])
+    
+    if policy == BEST_FIT:
+        # An unoccupied side counts as an unbounded gap, so stands that are already in use come first
+        def idle_time(stand):
+            gap_before, gap_after = index.idle_gaps(stand.StandName, start, end)
+            return (gap_before is None) + (gap_after is None), (gap_before or 0) + (gap_after or 0)
+        return min(free_stands, key=idle_time)
+    
+    if policy == ROBUST_FIT:
+        def buffer(stand):
+            gaps = [gap for gap in index.idle_gaps(stand.StandName, start, end) if gap is not None]
+            return min(gaps) if gaps else float('inf')
+        return max(free_stands, key=buffer)
+    
+    return free_stands[0]
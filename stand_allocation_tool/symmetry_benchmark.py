@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark the symmetry breaking for interchangeable stands in the CP model.
+Solves the same scenario with and without symmetry breaking and reports the time to
+the first solution and the time to prove optimality.
+"""
+
+import os
+import json
+import argparse
+
+from data_loader import load_flights, load_stands, load_airlines, load_settings, load_maintenance_schedules
+from maintenance_tracker import MockMaintenanceTracker
+from ai_support import MockAISupport
+from cp_solver import StandAllocationCPSolver
+
+def load_scenario(scenario_dir, max_flights=None, max_stands=None):
+    """
+    Load a scenario, optionally keeping only its earliest flights and first stands
+    
+    Parameters:
+    - scenario_dir: Path to the scenario directory
+    - max_flights: Maximum number of flights to keep (all if None)
+    - max_stands: Maximum number of stands to keep (all if None), to make the scenario congested
+    
+    Returns:
+    - Tuple of (flights, stands, airlines, settings, maintenance_schedules)
+    """
+    flights = load_flights(os.path.join(scenario_dir, "flights.json"))
+    stands = load_stands(os.path.join(scenario_dir, "stands.json"))
+    airlines = load_airlines(os.path.join(scenario_dir, "airlines.json"))
+    settings = load_settings(os.path.join(scenario_dir, "settings.json"))
+    maintenance_schedules = load_maintenance_schedules(os.path.join(scenario_dir, "maintenance_schedule.json"))
+    
+    if max_flights:
+        flights = sorted(flights, key=lambda flight: flight.parsed_time)[:max_flights]
+    if max_stands:
+        stands = stands[:max_stands]
+    
+    return flights, stands, airlines, settings, maintenance_schedules
+
+def run_symmetry_benchmark(scenario_dir, max_flights=None, max_stands=None, time_limit=60, symmetry_breaking=True):
+    """
+    Solve a scenario with the CP solver and collect its solve statistics
+    
+    Parameters:
+    - scenario_dir: Path to the scenario directory
+    - max_flights: Maximum number of flights to solve (all if None)
+    - max_stands: Maximum number of stands to use (all if None)
+    - time_limit: Solver time limit in seconds
+    - symmetry_breaking: Whether to break the symmetry between interchangeable stands
+    
+    Returns:
+    - Dict of solve statistics
+    """
+    flights, stands, airlines, settings, maintenance_schedules = load_scenario(scenario_dir, max_flights, max_stands)
+    settings.solver_parameters["symmetry_breaking"] = symmetry_breaking
+    
+    solver = StandAllocationCPSolver(
+        flights, stands, airlines, settings,
+        MockMaintenanceTracker(maintenance_schedules), MockAISupport()
+    )
+    solver.solve(time_limit=time_limit, log_unallocated=False)
+    
+    return {
+        "scenario": os.path.basename(os.path.normpath(scenario_dir)),
+        "flights": len(flights),
+        "stands": len(stands),
+        "symmetry_breaking": symmetry_breaking,
+        "interchangeable_stands": sum(len(stand_class) for stand_class in solver.interchangeable_stand_classes),
+        **solver.solve_stats
+    }
+
+def print_results(results):
+    """
+    Print a comparison table of benchmark results
+    
+    Parameters:
+    - results: List of result dicts from run_symmetry_benchmark
+    """
+    print(f"\n{'Scenario':<32} {'Flights':>7} {'Symmetry':>9} {'Status':>9} {'First sol.':>11} "
+          f"{'Total':>8} {'Objective':>10} {'Bound':>8} {'Branches':>10}")
+    print("-" * 112)
+    for result in results:
+        first_solution = result["first_solution_time"]
+        first_solution_str = f"{first_solution:.2f}s" if first_solution is not None else "-"
+        objective_str = f"{result['objective']:.0f}" if result["objective"] is not None else "-"
+        print(f"{result['scenario']:<32} {result['flights']:>7} {'on' if result['symmetry_breaking'] else 'off':>9} "
+              f"{result['status']:>9} {first_solution_str:>11} {result['solve_time']:>7.2f}s "
+              f"{objective_str:>10} {result['best_bound']:>8.0f} {result['num_branches']:>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark symmetry breaking for interchangeable stands")
+    parser.add_argument("--scenarios", type=str, nargs="+",
+                        default=["test_scenarios/scenario_07_large_scale_test"],
+                        help="Scenario directories to benchmark")
+    parser.add_argument("--max-flights", type=int, default=None,
+                        help="Only solve the earliest N flights of each scenario")
+    parser.add_argument("--max-stands", type=int, default=None,
+                        help="Only use the first N stands of each scenario")
+    parser.add_argument("--time-limit", type=float, default=60,
+                        help="Solver time limit in seconds")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Write the results to this JSON file")
+    args = parser.parse_args()
+    
+    results = []
+    for scenario_dir in args.scenarios:
+        for symmetry_breaking in (False, True):
+            results.append(run_symmetry_benchmark(
+                scenario_dir, args.max_flights, args.max_stands, args.time_limit, symmetry_breaking
+            ))
+    
+    print_results(results)
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
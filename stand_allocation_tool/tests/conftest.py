@@ -0,0 +1,8 @@
+"""
+Test configuration: the tool's modules are imported by name, as main.py does
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
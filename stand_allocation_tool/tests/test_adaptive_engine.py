@@ -0,0 +1,56 @@
+"""
+Tests for the adaptive engine, which solves congested windows with the CP solver
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("ortools")
+
+from main import run_scenario, _load_scenario
+from maintenance_tracker import MockMaintenanceTracker
+from ai_support import MockAISupport
+from stand_allocation_engine import StandAllocationEngine
+from allocation_bounds import allocation_weight
+
+SCENARIO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "test_scenarios", "scenario_07_large_scale_test")
+
+
+def run_engine(engine):
+    allocated, unallocated = run_scenario(SCENARIO, verbose=False, solver_parameters={
+        "engine": engine, "use_solver": engine != "greedy", "adaptive_window_time_limit_seconds": 10
+    })
+    return allocated, unallocated
+
+
+def test_adaptive_is_no_worse_than_greedy():
+    greedy_allocated, _ = run_engine("greedy")
+    adaptive_allocated, adaptive_unallocated = run_engine("adaptive")
+    
+    assert len(adaptive_allocated) >= len(greedy_allocated)
+    assert allocation_weight(adaptive_allocated) >= allocation_weight(greedy_allocated)
+    # Every flight is reported once
+    reported = [entry['flight'].FlightID for entry in adaptive_allocated + adaptive_unallocated]
+    assert len(reported) == len(set(reported))
+
+
+def test_adaptive_finds_congested_windows():
+    # Demand is counted per class of candidate stands, so the busy classes are found
+    flights, stands, airlines, settings, maintenance_schedules, connection_tracker = _load_scenario(SCENARIO, False)
+    engine = StandAllocationEngine(flights, stands, airlines, settings, MockMaintenanceTracker(maintenance_schedules),
+                                   MockAISupport(), connection_tracker)
+    flight_units = engine._prepare_flight_processing_order()
+    unit_occupancy = [engine._calculate_stand_occupancy_duration(unit) for unit in flight_units]
+    unit_candidates = engine._unit_candidate_sets(flight_units)
+    
+    windows = engine._find_congested_windows(flight_units, unit_occupancy, unit_candidates)
+    
+    assert windows
+    for stand_names, window_start, window_end in windows:
+        assert window_start < window_end
+    # Windows that share a stand do not overlap
+    for idx, (stand_names, window_start, window_end) in enumerate(windows):
+        for other_names, other_start, other_end in windows[idx + 1:]:
+            assert not (stand_names & other_names) or other_start > window_end or window_start > other_end
@@ -0,0 +1,88 @@
+"""
+Tests that the allocation bound is never below the best allocation
+"""
+
+import itertools
+import os
+import random
+
+import pytest
+
+from allocation_bounds import compute_allocation_bound, allocation_weight
+from main import _load_scenario
+from maintenance_tracker import MockMaintenanceTracker
+from ai_support import MockAISupport
+from stand_allocation_engine import StandAllocationEngine
+
+SCENARIO_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test_scenarios")
+
+
+def best_allocation(intervals, flight_counts, weights, candidate_sets):
+    """Most flights and most weight of any allocation, by trying every assignment"""
+    best_flights, best_weight = 0, 0
+    options = [[None] + sorted(candidates) for candidates in candidate_sets]
+    for assignment in itertools.product(*options):
+        stand_intervals = {}
+        for unit_idx, stand_name in enumerate(assignment):
+            if stand_name is not None:
+                stand_intervals.setdefault(stand_name, []).append(intervals[unit_idx])
+        feasible = all(
+            first[1] <= second[0]
+            for stand_list in stand_intervals.values()
+            for first, second in zip(sorted(stand_list), sorted(stand_list)[1:])
+        )
+        if feasible:
+            allocated = [unit_idx for unit_idx, stand_name in enumerate(assignment) if stand_name is not None]
+            best_flights = max(best_flights, sum(flight_counts[unit_idx] for unit_idx in allocated))
+            best_weight = max(best_weight, sum(weights[unit_idx] for unit_idx in allocated))
+    return best_flights, best_weight
+
+
+@pytest.mark.parametrize("use_flow", [True, False])
+@pytest.mark.parametrize("seed", range(15))
+def test_bound_is_at_least_the_optimum(seed, use_flow):
+    if use_flow:
+        pytest.importorskip("ortools")
+    rng = random.Random(seed)
+    # Nested classes, as narrow, wide and super stands of one terminal
+    stand_classes = [frozenset({"S1"}), frozenset({"S1", "W1"}), frozenset({"S1", "W1", "N1"}), frozenset({"N2"})]
+    intervals, flight_counts, weights, candidate_sets = [], [], [], []
+    for _ in range(rng.randint(1, 6)):
+        start = rng.randint(0, 40)
+        intervals.append((start, start + rng.randint(5, 30)))
+        flight_counts.append(rng.choice([1, 2]))
+        weights.append(rng.randint(1, 300))
+        candidate_sets.append(rng.choice(stand_classes))
+    
+    bound = compute_allocation_bound(intervals, flight_counts, weights, candidate_sets, use_flow=use_flow)
+    best_flights, best_weight = best_allocation(intervals, flight_counts, weights, candidate_sets)
+    
+    assert bound.max_allocated_flights >= best_flights
+    assert bound.max_weight >= best_weight
+    assert bound.max_allocated_flights <= sum(flight_counts)
+
+
+@pytest.mark.parametrize("scenario", [
+    "scenario_01_simple_linked_pair",
+    "scenario_02_conflicting_demands",
+    "scenario_05_missing_linkid_partner",
+    "scenario_06_connecting_flights",
+    "scenario_07_large_scale_test",
+])
+@pytest.mark.parametrize("engine", ["greedy", "flow", "cp"])
+def test_bound_is_at_least_the_engine_result(scenario, engine):
+    if engine != "greedy":
+        pytest.importorskip("ortools")
+    flights, stands, airlines, settings, maintenance_schedules, connection_tracker = _load_scenario(
+        os.path.join(SCENARIO_DIR, scenario), False
+    )
+    settings.solver_parameters.update({"engine": engine, "use_solver": engine != "greedy"})
+    engine_object = StandAllocationEngine(flights, stands, airlines, settings,
+                                          MockMaintenanceTracker(maintenance_schedules), MockAISupport(),
+                                          connection_tracker)
+    allocated, _ = engine_object.run_allocation()
+    
+    bound = engine_object.compute_allocation_bound()
+    
+    assert bound.max_allocated_flights >= len(allocated)
+    assert bound.max_weight >= allocation_weight(allocated)
@@ -0,0 +1,60 @@
+"""
+Tests for solving in a background thread with solve_anytime
+"""
+
+import os
+import time
+
+import pytest
+
+pytest.importorskip("ortools")
+
+from main import _load_scenario
+from maintenance_tracker import MockMaintenanceTracker
+from ai_support import MockAISupport
+from cp_solver import StandAllocationCPSolver
+
+SCENARIO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "test_scenarios", "scenario_01_simple_linked_pair")
+
+
+def make_solver():
+    flights, stands, airlines, settings, maintenance_schedules, _ = _load_scenario(SCENARIO, False)
+    return StandAllocationCPSolver(flights, stands, airlines, settings,
+                                   MockMaintenanceTracker(maintenance_schedules), MockAISupport())
+
+
+def test_yields_incumbents_and_keeps_result():
+    solver = make_solver()
+    
+    incumbents = list(solver.solve_anytime(time_limit=10, log_unallocated=False))
+    
+    assert incumbents
+    allocated, _ = solver.last_result
+    assert set(incumbents[-1]["allocation"]) == {entry['flight'].FlightID for entry in allocated}
+
+
+def test_raises_solve_errors():
+    solver = make_solver()
+    
+    with pytest.raises(TypeError):
+        list(solver.solve_anytime(time_limit=10, unknown_argument=True))
+
+
+def test_stopping_early_cancels_the_search():
+    solver = make_solver()
+    cancelled = []
+    
+    def slow_solve(time_limit=None, on_incumbent=None, cancel_event=None, **solve_kwargs):
+        # Report one solution, then search until the time limit unless cancelled
+        on_incumbent({"objective": 1})
+        cancelled.append(cancel_event.wait(time_limit))
+        return [], []
+    
+    solver.solve = slow_solve
+    start_time = time.time()
+    for incumbent in solver.solve_anytime(time_limit=30):
+        break
+    
+    assert cancelled == [True]
+    assert time.time() - start_time < 10
@@ -0,0 +1,44 @@
+"""
+Tests for repairing a CP allocation around a disrupted time window
+"""
+
+import os
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("ortools")
+
+from main import _load_scenario
+from maintenance_tracker import MockMaintenanceTracker
+from ai_support import MockAISupport
+from cp_solver import StandAllocationCPSolver
+
+SCENARIO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "test_scenarios", "scenario_07_large_scale_test")
+
+
+def make_solver():
+    flights, stands, airlines, settings, maintenance_schedules, _ = _load_scenario(SCENARIO, False)
+    # The optimality gap would let a repair stop at a worse allocation
+    settings.solver_parameters["optimality_gap"] = 0.05
+    return StandAllocationCPSolver(flights, stands, airlines, settings,
+                                   MockMaintenanceTracker(maintenance_schedules), MockAISupport())
+
+
+@pytest.mark.parametrize("window_position", [0.25, 0.5, 0.75])
+def test_repair_without_disruption_keeps_allocation(window_position):
+    solver = make_solver()
+    # An optimal allocation, so the repair cannot allocate more
+    allocated, _ = solver.solve(time_limit=20, log_unallocated=False, stop_at_optimality_gap=False)
+    assert solver.solve_stats["status"] == "OPTIMAL"
+    current_allocation = {entry['flight'].FlightID: entry['stand'].StandName for entry in allocated}
+    window_middle = solver.earliest_time + (solver.latest_time - solver.earliest_time) * window_position
+    
+    repair_solver = make_solver()
+    repaired, _ = repair_solver.repair(current_allocation, window_middle - timedelta(hours=1),
+                                       window_middle + timedelta(hours=1),
+                                       current_occupancy=solver.solution_occupancy,
+                                       time_limit=20, log_unallocated=False)
+    
+    assert {entry['flight'].FlightID: entry['stand'].StandName for entry in repaired} == current_allocation
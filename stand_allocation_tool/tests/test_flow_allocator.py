@@ -0,0 +1,72 @@
+"""
+Tests for the min-cost-flow selection of weighted intervals on identical stands
+"""
+
+import itertools
+import random
+
+import pytest
+
+pytest.importorskip("ortools")
+
+from flow_allocator import max_weight_interval_selection
+from interval_partitioning import peak_overlap
+
+
+def best_weight(intervals, weights, capacity):
+    """Weight of the best selection, by trying every subset"""
+    best = 0
+    for size in range(len(intervals) + 1):
+        for subset in itertools.combinations(range(len(intervals)), size):
+            if peak_overlap([intervals[idx] for idx in subset]) <= capacity:
+                best = max(best, sum(weights[idx] for idx in subset))
+    return best
+
+
+def test_empty_and_no_capacity():
+    assert max_weight_interval_selection([], [], 2) == []
+    assert max_weight_interval_selection([(0, 10)], [1], 0) == []
+
+
+def test_selects_all_without_congestion():
+    intervals = [(0, 10), (5, 15), (10, 20), (30, 40)]
+    assert max_weight_interval_selection(intervals, [1, 1, 1, 1], 2) == [0, 1, 2, 3]
+
+
+def test_half_open_intervals_do_not_overlap():
+    intervals = [(0, 10), (10, 20), (20, 30)]
+    assert max_weight_interval_selection(intervals, [1, 1, 1], 1) == [0, 1, 2]
+
+
+def test_heavy_interval_beats_overlapping_light_ones():
+    # A linked pair (weight 3) overlapping two single flights (weight 1 each) on one stand
+    intervals = [(0, 100), (10, 40), (50, 90)]
+    assert max_weight_interval_selection(intervals, [3, 1, 1], 1) == [0]
+
+
+def test_light_intervals_beat_heavy_one_when_heavier_together():
+    intervals = [(0, 100), (10, 40), (50, 90)]
+    assert max_weight_interval_selection(intervals, [3, 2, 2], 1) == [1, 2]
+
+
+def test_identical_stands_share_the_load():
+    # Three overlapping intervals on two stands: the lightest one is dropped
+    intervals = [(0, 10), (0, 10), (0, 10), (20, 30)]
+    selected = max_weight_interval_selection(intervals, [5, 1, 3, 1], 2)
+    assert selected == [0, 2, 3]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    intervals = []
+    for _ in range(rng.randint(1, 9)):
+        start = rng.randint(0, 50)
+        intervals.append((start, start + rng.randint(1, 25)))
+    weights = [rng.randint(1, 5) for _ in intervals]
+    capacity = rng.randint(1, 3)
+    
+    selected = max_weight_interval_selection(intervals, weights, capacity)
+    
+    assert peak_overlap([intervals[idx] for idx in selected]) <= capacity
+    assert sum(weights[idx] for idx in selected) == best_weight(intervals, weights, capacity)
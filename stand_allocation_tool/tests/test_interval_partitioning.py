@@ -0,0 +1,86 @@
+"""
+Tests for interval partitioning on identical stands
+"""
+
+import itertools
+import random
+
+import pytest
+
+from interval_partitioning import select_max_intervals, assign_intervals_to_stands, peak_overlap
+
+
+def most_intervals(intervals, capacity):
+    """Size of the largest selection, by trying every subset"""
+    for size in range(len(intervals), 0, -1):
+        for subset in itertools.combinations(range(len(intervals)), size):
+            if peak_overlap([intervals[idx] for idx in subset]) <= capacity:
+                return size
+    return 0
+
+
+def assert_valid_assignment(intervals, assignment, num_stands):
+    stand_intervals = {}
+    for idx, stand_idx in assignment.items():
+        assert 0 <= stand_idx < num_stands
+        stand_intervals.setdefault(stand_idx, []).append(intervals[idx])
+    for stand_list in stand_intervals.values():
+        stand_list.sort()
+        for (_, end), (next_start, _) in zip(stand_list, stand_list[1:]):
+            assert end <= next_start
+
+
+def test_select_without_capacity():
+    assert select_max_intervals([(0, 10), (5, 15)], 0) == []
+
+
+def test_select_drops_the_interval_ending_last():
+    # The long interval blocks both short ones on a single stand
+    intervals = [(0, 100), (10, 40), (50, 90)]
+    assert select_max_intervals(intervals, 1) == [1, 2]
+
+
+def test_select_half_open_intervals():
+    intervals = [(0, 10), (10, 20), (20, 30)]
+    assert select_max_intervals(intervals, 1) == [0, 1, 2]
+
+
+def test_select_breaks_ties_by_weight():
+    # Both end at the same time, so the lighter one is dropped
+    intervals = [(0, 10), (5, 10)]
+    assert select_max_intervals(intervals, 1, weights=[1, 5]) == [1]
+    assert select_max_intervals(intervals, 1, weights=[5, 1]) == [0]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_select_matches_brute_force(seed):
+    rng = random.Random(seed)
+    intervals = []
+    for _ in range(rng.randint(1, 9)):
+        start = rng.randint(0, 50)
+        intervals.append((start, start + rng.randint(1, 25)))
+    capacity = rng.randint(1, 3)
+    
+    selected = select_max_intervals(intervals, capacity)
+    
+    assert peak_overlap([intervals[idx] for idx in selected]) <= capacity
+    assert len(selected) == most_intervals(intervals, capacity)
+    assert_valid_assignment(intervals, assign_intervals_to_stands(intervals, selected, capacity), capacity)
+
+
+def test_assign_reuses_stands():
+    intervals = [(0, 10), (5, 15), (10, 20), (15, 25)]
+    assignment = assign_intervals_to_stands(intervals, [0, 1, 2, 3], 2)
+    
+    assert sorted(assignment) == [0, 1, 2, 3]
+    assert_valid_assignment(intervals, assignment, 2)
+
+
+def test_assign_only_selected_intervals():
+    intervals = [(0, 10), (0, 10), (0, 10)]
+    assert set(assign_intervals_to_stands(intervals, [0, 2], 2)) == {0, 2}
+
+
+def test_assign_raises_if_stands_run_out():
+    with pytest.raises(ValueError):
+        assign_intervals_to_stands([(0, 10), (5, 15), (8, 12)], [0, 1, 2], 2)
@@ -11,10 +11,10 @@ import numpy as np
 from matplotlib.ticker import FuncFormatter
 
 def load_benchmark_results(file_path):
-    """Load benchmark results from a JSON file"""
+    """Load benchmark results from a JSON file, leaving out failed runs"""
     with open(file_path, 'r') as f:
         results = json.load(f)
-    return results
+    return [result for result in results if "error" not in result]
 
 def format_time(seconds):
     """Format time in a human-readable way"""
@@ -220,6 +220,127 @@ def plot_allocation_rate(results, output_file=None):
     else:
         plt.show()
 
+def plot_phase_breakdown(results, output_file=None):
+    """Plot the wall-clock time per phase of each benchmark run as stacked bars"""
+    results = [r for r in results if r.get("phases")]
+    if not results:
+        print("No phase timings in the results (run benchmark.py to record them)")
+        return
+    
+    # Sort results by number of flights
+    results.sort(key=lambda x: (x["total_flights"], x.get("engine", "")))
+    
+    labels = [f"{r['scenario']}\n{r.get('engine', '')}" for r in results]
+    phase_names = sorted({name for r in results for name in r["phases"]},
+                         key=lambda name: -sum(r["phases"].get(name, {}).get("wall_time", 0) for r in results))
+    
+    # Create the plot
+    plt.figure(figsize=(max(12, len(results) * 1.2), 8))
+    
+    bottom = np.zeros(len(results))
+    for name in phase_names:
+        times = np.array([r["phases"].get(name, {}).get("wall_time", 0) for r in results])
+        plt.bar(range(len(results)), times, bottom=bottom, label=name)
+        bottom += times
+    
+    plt.title("Stand Allocation Performance: Time per Phase", fontsize=16)
+    plt.xticks(range(len(results)), labels, rotation=45, ha="right")
+    plt.ylabel("Wall-Clock Time (seconds)", fontsize=14)
+    plt.grid(True, axis="y", linestyle='--', alpha=0.7)
+    plt.legend(fontsize=12)
+    
+    plt.tight_layout()
+    
+    if output_file:
+        plt.savefig(output_file)
+    else:
+        plt.show()
+
+def plot_scaling(results, output_file=None):
+    """Plot time and memory vs number of flights per engine on a log-log scale with fitted power laws"""
+    engines = sorted({r.get("engine", "cp" if r["using_solver"] else "greedy") for r in results})
+    
+    # Create the plot
+    fig, axes = plt.subplots(1, 2, figsize=(16, 7))
+    
+    for metric, axis, ylabel in (("wall_time", axes[0], "Time (seconds)"),
+                                 ("memory_used", axes[1], "Memory Used (MB)")):
+        for engine in engines:
+            runs = [r for r in results if r.get("engine", "cp" if r["using_solver"] else "greedy") == engine
+                    and r["total_flights"] > 0 and (r.get(metric) or 0) > 0]
+            if not runs:
+                continue
+            flights = np.array([r["total_flights"] for r in runs], dtype=float)
+            values = np.array([r[metric] for r in runs], dtype=float)
+            points = axis.scatter(flights, values, s=60, label=engine)
+            
+            # Fit values = c * flights^k as a line on the log-log scale
+            if len(set(flights)) > 1:
+                exponent, log_coefficient = np.polyfit(np.log(flights), np.log(values), 1)
+                x_range = np.logspace(np.log10(flights.min()), np.log10(flights.max()), 100)
+                axis.plot(x_range, np.exp(log_coefficient) * x_range ** exponent, "--",
+                          color=points.get_facecolor()[0], alpha=0.7, label=f"{engine}: ~ flights^{exponent:.2f}")
+        
+        axis.set_xscale('log', base=10)
+        axis.set_yscale('log', base=10)
+        axis.set_xlabel("Number of Flights", fontsize=14)
+        axis.set_ylabel(ylabel, fontsize=14)
+        axis.grid(True, which="both", linestyle='--', alpha=0.5)
+        axis.legend(fontsize=10)
+    
+    fig.suptitle("Stand Allocation Scaling: Fitted Empirical Complexity", fontsize=16)
+    plt.tight_layout()
+    
+    if output_file:
+        plt.savefig(output_file)
+    else:
+        plt.show()
+
+def plot_pareto(results, output_file=None):
+    """Plot criticality-weighted objective vs runtime per scenario, with the Pareto front of each scenario"""
+    scenarios = sorted({r["scenario"] for r in results if "objective" in r})
+    if not scenarios:
+        return
+    
+    # Create the plot, one panel per scenario
+    fig, axes = plt.subplots(1, len(scenarios), figsize=(8 * len(scenarios), 7), squeeze=False)
+    
+    for scenario, axis in zip(scenarios, axes[0]):
+        runs = sorted((r for r in results if r["scenario"] == scenario and "objective" in r),
+                      key=lambda r: r["wall_time"])
+        times = [max(r["wall_time"], 1e-3) for r in runs]
+        objectives = [r["objective"] for r in runs]
+        optimal = [r.get("pareto_optimal", False) for r in runs]
+        
+        axis.scatter([t for t, o in zip(times, optimal) if not o], [v for v, o in zip(objectives, optimal) if not o],
+                     s=60, color="gray", alpha=0.6, label="Dominated")
+        axis.scatter([t for t, o in zip(times, optimal) if o], [v for v, o in zip(objectives, optimal) if o],
+                     s=80, color="tab:red", label="Pareto-optimal")
+        
+        # Draw the front as a staircase: each point is the best objective reachable in that time
+        front = [(t, v) for t, v, o in zip(times, objectives, optimal) if o]
+        if front:
+            axis.step([t for t, _ in front], [v for _, v in front], where="post", color="tab:red", alpha=0.7)
+        
+        for r, t, v in zip(runs, times, objectives):
+            axis.annotate(r.get("configuration") or r.get("engine"), (t, v),
+                          textcoords="offset points", xytext=(5, 5), fontsize=9)
+        
+        axis.set_xscale('log', base=10)
+        axis.set_title(scenario, fontsize=14)
+        axis.set_xlabel("Time (seconds)", fontsize=14)
+        axis.set_ylabel("Criticality-Weighted Objective", fontsize=14)
+        axis.grid(True, which="both", linestyle='--', alpha=0.5)
+        axis.legend(fontsize=10)
+    
+    fig.suptitle("Stand Allocation Quality vs. Speed", fontsize=16)
+    plt.tight_layout()
+    
+    if output_file:
+        plt.savefig(output_file)
+    else:
+        plt.show()
+
 def create_summary_table(results):
     """Create a summary table of the benchmark results"""
     # Sort results by number of flights
@@ -231,9 +352,9 @@ def create_summary_table(results):
     
     for result in results:
         flights = result["total_flights"]
-        algorithm = "CP Solver" if result["using_solver"] else "Greedy"
+        algorithm = result.get("engine") or ("CP Solver" if result["using_solver"] else "Greedy")
         alloc_time = format_time(result["allocation_time"])
-        memory = f"{result['memory_used']:.1f}"
+        memory = f"{result['memory_used']:.1f}" if result.get("memory_used") is not None else "n/a"
         success = f"{result['allocation_rate']:.1f}%"
         
         print(f"{flights:>10} | {algorithm:>12} | {alloc_time:>16} | {memory:>12} | {success:>12}")
@@ -248,6 +369,12 @@ def main():
                       help="Output file for memory plot (if not specified, plot is displayed)")
     parser.add_argument("--rate-plot", type=str, 
                       help="Output file for allocation rate plot (if not specified, plot is displayed)")
+    parser.add_argument("--phase-plot", type=str, 
+                      help="Output file for time per phase plot (if not specified, plot is displayed)")
+    parser.add_argument("--scaling-plot", type=str, 
+                      help="Output file for the log-log scaling plot (if not specified, plot is displayed)")
+    parser.add_argument("--pareto-plot", type=str, 
+                      help="Output file for the quality vs speed plot (if not specified, plot is displayed)")
     parser.add_argument("--no-plots", action="store_true",
                       help="Don't display any plots, just print the summary table")
     
@@ -268,6 +395,15 @@ def main():
         
         # Plot allocation rate
         plot_allocation_rate(results, args.rate_plot)
+        
+        # Plot time per phase
+        plot_phase_breakdown(results, args.phase_plot)
+        
+        # Plot fitted scaling curves
+        plot_scaling(results, args.scaling_plot)
+        
+        # Plot the quality vs speed Pareto fronts
+        plot_pareto(results, args.pareto_plot)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file